@@ -2,7 +2,9 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_restful import Api
 
-db = SQLAlchemy()
+from app.replicas import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 def create_app(config_class=None):
@@ -15,27 +17,88 @@ def create_app(config_class=None):
         from app.config import Config
         app.config.from_object(Config)
     
-    # Initialize extensions
+    # Initialize extensions (read replicas are extra binds of db)
+    from app.replicas import configure_replicas, init_replicas
+    replica_keys = configure_replicas(app)
     db.init_app(app)
+    init_replicas(app, replica_keys)
+    
+    if app.config.get('SQL_INSTRUMENTATION', True):
+        from app.instrumentation import init_instrumentation
+        with app.app_context():
+            init_instrumentation(app, db.engines.values())
+    
+    if app.config.get('METRICS_ENABLED', True):
+        from app.metrics import init_metrics
+        init_metrics(app)
+    
+    from app.cache import init_cache
+    init_cache(app)
     
     # Create API instance for this app
     api = Api(app)
     
+    # JSON encoding through orjson when available (stdlib fallback)
+    from app.serializers import output_json
+    api.representation('application/json')(output_json)
+    
     # Import and register resources
-    from app.resources.dieta_resource import DietaResource, DietaListResource
-    from app.resources.refeicao_resource import RefeicaoResource, RefeicaoListResource
-    from app.resources.exercicio_resource import ExercicioResource, ExercicioListResource
+    from app.resources.dieta_resource import (
+        DietaResource, DietaListResource, DietaResumoResource, DietaResumoListResource,
+        DietaRefeicoesAttachResource, DietaExerciciosAttachResource
+    )
+    from app.resources.refeicao_resource import (
+        RefeicaoResource, RefeicaoListResource, RefeicaoBulkResource, RefeicaoExportResource,
+        RefeicaoAlimentosAttachResource, RefeicaoAlimentosDetachResource
+    )
+    from app.resources.exercicio_resource import (
+        ExercicioResource, ExercicioListResource, ExercicioBulkResource, ExercicioExportResource
+    )
+    from app.resources.alimento_resource import AlimentoListResource
+    from app.resources.cache_resource import CacheStatsResource
+    from app.resources.pool_resource import PoolStatsResource
     
     # Register endpoints
     api.add_resource(DietaListResource, '/api/dietas')
     api.add_resource(DietaResource, '/api/dietas/<int:id>')
+    api.add_resource(DietaResumoResource, '/api/dietas/<int:id>/resumo')
+    api.add_resource(DietaResumoListResource, '/api/dietas/resumo')
+    api.add_resource(DietaRefeicoesAttachResource, '/api/dietas/<int:id>/refeicoes:attach')
+    api.add_resource(DietaExerciciosAttachResource, '/api/dietas/<int:id>/exercicios:attach')
     api.add_resource(RefeicaoListResource, '/api/refeicoes')
     api.add_resource(RefeicaoResource, '/api/refeicoes/<int:id>')
+    api.add_resource(RefeicaoBulkResource, '/api/refeicoes/bulk')
+    api.add_resource(RefeicaoExportResource, '/api/refeicoes/export')
+    api.add_resource(RefeicaoAlimentosAttachResource, '/api/refeicoes/alimentos:attach')
+    api.add_resource(RefeicaoAlimentosDetachResource, '/api/refeicoes/alimentos:detach')
     api.add_resource(ExercicioListResource, '/api/exercicios')
     api.add_resource(ExercicioResource, '/api/exercicios/<int:id>')
+    api.add_resource(ExercicioBulkResource, '/api/exercicios/bulk')
+    api.add_resource(ExercicioExportResource, '/api/exercicios/export')
+    api.add_resource(AlimentoListResource, '/api/alimentos')
+    api.add_resource(CacheStatsResource, '/api/cache/stats')
+    api.add_resource(PoolStatsResource, '/api/pool/stats')
+    
+    if app.config.get('WRITE_BEHIND_ENABLED'):
+        from app.write_behind import init_write_behind
+        init_write_behind(app)
+    
+    # Apply pending schema migrations
+    from app.migrations import upgrade
+    
+    @app.cli.command('migrate')
+    def migrate_command():
+        """Apply pending schema migrations."""
+        applied = upgrade(db.engine)
+        print(f"Migrações aplicadas: {', '.join(applied) if applied else 'nenhuma'}")
     
-    # Create database tables
     with app.app_context():
-        db.create_all()
+        if app.config.get('AUTO_MIGRATE', True):
+            upgrade(db.engine)
+        
+        # Resync denormalized counters that may have drifted while disabled
+        if app.config.get('DIETA_DENORMALIZED_COUNTS'):
+            from app.models.dieta_contador import DietaContador
+            DietaContador.rebuild()
     
     return app
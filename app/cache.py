@@ -0,0 +1,288 @@
+"""
+Cache Module
+Contains the read cache used by the controllers.
+
+Backends:
+    - memory: in-process LRU (default)
+    - redis: shared between processes (needs the optional 'redis' package,
+      or any client object with get/set/delete, e.g. a stand-in in tests)
+    - none: caching disabled
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from app.replicas import use_primary
+
+
+class CacheBackend:
+    """
+    Base class for cache backends.
+    Values are JSON-compatible dictionaries and lists.
+    """
+
+    def get(self, key):
+        """Return the cached value or None."""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Store a value."""
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        """Remove the given keys (missing keys are ignored)."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every key."""
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU backend with an optional TTL.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None):
+        """
+        Constructor for LRUCache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            ttl: Seconds before an entry expires (None: never)
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self._ttl is not None and time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared backend storing JSON values in Redis (or a compatible client).
+    """
+
+    def __init__(self, client=None, url=None, ttl=None, prefix='diet_app:'):
+        """
+        Constructor for RedisCache.
+
+        Args:
+            client: Object with get/set/delete (e.g. redis.Redis or a test stand-in)
+            url: Redis URL, used when no client is given
+            ttl: Seconds before an entry expires (None: never)
+            prefix: Namespace prepended to every key
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND='redis' requer o pacote 'redis' (pip install redis)")
+            client = redis.Redis.from_url(url or 'redis://localhost:6379/0')
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def get(self, key):
+        raw = self._client.get(self._prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        raw = json.dumps(value)
+        if self._ttl:
+            self._client.set(self._prefix + key, raw, ex=int(self._ttl))
+        else:
+            self._client.set(self._prefix + key, raw)
+
+    def delete(self, *keys):
+        if keys:
+            self._client.delete(*[self._prefix + key for key in keys])
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self._prefix + '*'))
+        if keys:
+            self._client.delete(*keys)
+
+
+class ControllerCache:
+    """
+    Read-through cache used by the controllers, with hit/miss counters.
+
+    Writers invalidate keys explicitly after their transaction commits.
+    """
+
+    def __init__(self, backend=None):
+        """
+        Constructor for ControllerCache.
+
+        Args:
+            backend: CacheBackend instance (default: LRUCache)
+        """
+        self._backend = backend if backend is not None else LRUCache()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def backend(self):
+        """Get the cache backend."""
+        return self._backend
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for key, or call loader() and cache its result.
+
+        Loaders whose result gets stored read from the primary: a value
+        loaded from a lagging replica would otherwise stay cached until the
+        next invalidation.
+
+        Args:
+            key: Cache key
+            loader: Function returning the value; None results are not cached
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        value = self._backend.get(key)
+        if value is not None:
+            with self._lock:
+                self._hits += 1
+            return value
+
+        with self._lock:
+            self._misses += 1
+        if isinstance(self._backend, NullCache):
+            return loader()
+        with use_primary():
+            value = loader()
+        if value is not None:
+            self._backend.set(key, value)
+        return value
+
+    def invalidate(self, *keys):
+        """Remove the given keys from the cache."""
+        self._backend.delete(*keys)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        self._backend.clear()
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        """Return the hit/miss counters."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        total = hits + misses
+        return {
+            'backend': type(self._backend).__name__,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0
+        }
+
+
+# Cache keys
+def dieta_key(id):
+    return f'dieta:{id}'
+
+
+def refeicao_key(id):
+    return f'refeicao:{id}'
+
+
+def exercicio_key(id):
+    return f'exercicio:{id}'
+
+
+DIETAS_LIST_KEY = 'dietas:list'
+
+
+def create_backend(config):
+    """Build the backend selected by CACHE_BACKEND."""
+    name = config.get('CACHE_BACKEND', 'memory')
+    ttl = config.get('CACHE_TTL')
+    if name == 'none':
+        return NullCache()
+    if name == 'redis':
+        return RedisCache(url=config.get('CACHE_REDIS_URL'), ttl=ttl)
+    if name == 'memory':
+        return LRUCache(config.get('CACHE_MAX_ENTRIES', 1024), ttl)
+    raise ValueError(f'CACHE_BACKEND inválido: {name}')
+
+
+def init_cache(app, backend=None):
+    """
+    Attach a ControllerCache to the application.
+
+    Args:
+        app: Flask application
+        backend: CacheBackend overriding the configured one (e.g. in tests)
+    """
+    cache = ControllerCache(backend if backend is not None else create_backend(app.config))
+    app.extensions['controller_cache'] = cache
+    return cache
+
+
+_null_cache = ControllerCache(NullCache())
+
+
+def get_cache():
+    """Return the cache of the current application (a no-op cache outside one)."""
+    if has_app_context():
+        cache = current_app.extensions.get('controller_cache')
+        if cache is not None:
+            return cache
+    return _null_cache
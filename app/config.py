@@ -4,6 +4,34 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+
+def pool_options(pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for the connection pool.
+    
+    The arguments are the defaults of each profile; the DB_POOL_* env vars
+    override them. Limits are per process: with N server workers the
+    database sees up to N x (pool_size + max_overflow) connections.
+    
+    Env vars:
+        - DB_POOL_SIZE: Connections kept open
+        - DB_MAX_OVERFLOW: Extra connections opened under burst load
+        - DB_POOL_TIMEOUT: Seconds a request waits for a free connection
+        - DB_POOL_RECYCLE: Seconds before a connection is replaced
+        - DB_POOL_PRE_PING: Test connections on checkout (default True)
+    """
+    from app.pool import InstrumentedQueuePool
+    
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    }
+
+
 class Config:
     
     # Flask settings
@@ -17,9 +45,56 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', 'False').lower() == 'true'
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options()
+    
+    # Read replicas (comma-separated URLs): GET/HEAD requests read from them,
+    # writes go to the primary; a client reads from the primary for
+    # REPLICA_STICKY_SECONDS after its own write
+    SQLALCHEMY_REPLICA_URIS = os.environ.get('DATABASE_REPLICA_URLS', '')
+    REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    
+    # Per-request SQL statistics (Server-Timing header and JSON logs on the
+    # 'app.sql' logger); statements slower than SLOW_QUERY_MS are logged
+    # with their parameters and origin
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', 'True').lower() == 'true'
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    SQL_LOG_REQUESTS = os.environ.get('SQL_LOG_REQUESTS', 'True').lower() == 'true'
+    SQL_LOG_LEVEL = os.environ.get('SQL_LOG_LEVEL', 'INFO')
+    
+    # Group commit of meal creates (POST /api/refeicoes): requests wait on a
+    # background flusher that writes up to WRITE_BEHIND_MAX_BATCH meals per
+    # transaction, every WRITE_BEHIND_MAX_DELAY_MS; a full queue answers 503
+    WRITE_BEHIND_ENABLED = os.environ.get('WRITE_BEHIND_ENABLED', 'False').lower() == 'true'
+    WRITE_BEHIND_MAX_BATCH = int(os.environ.get('WRITE_BEHIND_MAX_BATCH', 500))
+    WRITE_BEHIND_MAX_DELAY_MS = float(os.environ.get('WRITE_BEHIND_MAX_DELAY_MS', 10))
+    WRITE_BEHIND_QUEUE_SIZE = int(os.environ.get('WRITE_BEHIND_QUEUE_SIZE', 10000))
+    WRITE_BEHIND_TIMEOUT = float(os.environ.get('WRITE_BEHIND_TIMEOUT', 30))
+    
+    # Prometheus-style metrics at /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    
+    # Apply pending migrations (app/migrations) on startup; when disabled,
+    # run them explicitly with 'flask --app run_api migrate'
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'True').lower() == 'true'
+    
+    # Serve diet child counts from the dieta_contadores table instead of
+    # aggregating refeicoes/exercicios on every list request
+    DIETA_DENORMALIZED_COUNTS = os.environ.get('DIETA_DENORMALIZED_COUNTS', 'False').lower() == 'true'
+    
+    # Controller read cache: 'memory' (per process), 'redis' (shared) or 'none'
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    CACHE_TTL = float(os.environ['CACHE_TTL']) if os.environ.get('CACHE_TTL') else None
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
     
     # API settings
+    PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE_DEFAULT', 100))
+    PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX', 1000))
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 5000))
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
     JSON_SORT_KEYS = False
+    # Encode responses with orjson when it is installed
+    FAST_JSON = os.environ.get('FAST_JSON', 'True').lower() == 'true'
     RESTFUL_JSON = {'ensure_ascii': False}
 
 
@@ -33,12 +108,19 @@ class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    # Bounded per worker: a short wait and little overflow instead of
+    # opening a connection storm against the database under bursts
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options(pool_size=10, max_overflow=5, pool_timeout=10)
 
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # In-memory SQLite uses a single shared connection (StaticPool)
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_REPLICA_URIS = ''
+    SQL_LOG_REQUESTS = False
     DEBUG = True
 
 
@@ -1,5 +1,6 @@
 from app.controllers.dieta_controller import DietaController
 from app.controllers.refeicao_controller import RefeicaoController
 from app.controllers.exercicio_controller import ExercicioController
+from app.controllers.alimento_controller import AlimentoController
 
-__all__ = ['DietaController', 'RefeicaoController', 'ExercicioController']
+__all__ = ['DietaController', 'RefeicaoController', 'ExercicioController', 'AlimentoController']
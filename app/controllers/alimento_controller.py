@@ -0,0 +1,40 @@
+from sqlalchemy import func
+from app import db
+from app.models.alimento import Alimento
+from app.models.refeicao_alimento import RefeicaoAlimento
+class AlimentoController:
+    def get_all(self, alimento=None, busca=None):
+        """
+        List the food catalog with the number of meals using each food.
+        
+        The counts come from one GROUP BY over the refeicao_alimentos
+        (alimento_id, refeicao_id) index; a food repeated in a meal counts once.
+        
+        Args:
+            alimento: Filter by name (optional)
+            busca: 'exata', 'prefixo' or 'aproximada' (default 'prefixo')
+            
+        Returns:
+            tuple: (list of food dictionaries or None, error message or None)
+        """
+        usage = (
+            db.select(RefeicaoAlimento.alimento_id, func.count(RefeicaoAlimento.refeicao_id.distinct()).label('refeicoes_count'))
+            .group_by(RefeicaoAlimento.alimento_id)
+            .subquery()
+        )
+        stmt = (
+            db.select(Alimento.id, Alimento.nome, func.coalesce(usage.c.refeicoes_count, 0))
+            .outerjoin(usage, usage.c.alimento_id == Alimento.id)
+            .order_by(Alimento.nome_normalizado)
+        )
+        
+        if alimento is not None:
+            busca = busca or Alimento.BUSCA_PREFIXO
+            if busca not in Alimento.MODOS_BUSCA:
+                return None, f"busca deve ser um dos valores: {', '.join(Alimento.MODOS_BUSCA)}"
+            stmt = stmt.where(Alimento.id.in_(Alimento.matching(alimento, busca)))
+        
+        return [
+            {'id': id, 'nome': nome, 'refeicoes_count': count}
+            for id, nome, count in db.session.execute(stmt)
+        ], None
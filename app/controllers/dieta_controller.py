@@ -1,7 +1,13 @@
 
 
+from flask import current_app
 from app import db
+from app.cache import get_cache, dieta_key, refeicao_key, exercicio_key, DIETAS_LIST_KEY
 from app.models.dieta import Dieta
+from app.models.refeicao import Refeicao
+from app.models.exercicio import Exercicio
+from app.models.dieta_contador import DietaContador
+from app.serializers import dieta_list_serializer
 from app.validators.validators import DietaValidator, ValidationError
 
 
@@ -23,6 +29,7 @@ class DietaController:
             
             # Save to database
             dieta.save()
+            get_cache().invalidate(DIETAS_LIST_KEY)
             
             return dieta, None
             
@@ -33,14 +40,67 @@ class DietaController:
             return None, str(e)
     
     def get_all(self):
-        dietas = Dieta.get_all()
-        return [d.to_dict() for d in dietas]
+        return get_cache().get_or_load(
+            DIETAS_LIST_KEY,
+            lambda: dieta_list_serializer.from_rows(Dieta.get_all_with_counts())
+        )
+    
+    def get_page(self, limit, cursor=None, with_count=False):
+        try:
+            rows, next_cursor = Dieta.get_page(limit, cursor, query=Dieta.query_with_counts())
+        except ValueError as e:
+            return None, str(e)
+        
+        result = {
+            'data': dieta_list_serializer.from_rows(rows),
+            'next_cursor': next_cursor
+        }
+        if with_count:
+            result['total'] = Dieta.count_all()
+        return result, None
     
     def get_by_id(self, id):
-        dieta = Dieta.get_by_id(id)
-        if not dieta:
+        data = get_cache().get_or_load(dieta_key(id), lambda: Dieta.get_detail(id))
+        if data is None:
+            return None, f'Dieta com ID {id} não encontrada'
+        return data, None
+    
+    def get_summary(self, id):
+        """
+        Get the aggregated totals of a diet.
+        
+        Args:
+            id: Diet ID
+            
+        Returns:
+            tuple: (summary dictionary or None, error message or None)
+        """
+        summary = Dieta.get_summaries([id]).get(id)
+        if summary is None:
             return None, f'Dieta com ID {id} não encontrada'
-        return dieta.to_dict(include_relations=True), None
+        return summary, None
+    
+    def get_summaries(self, ids):
+        """
+        Get the aggregated totals of many diets in one batch.
+        
+        Args:
+            ids: List of diet IDs
+            
+        Returns:
+            tuple: (dict with the summaries and the missing IDs or None, error message or None)
+        """
+        max_ids = current_app.config.get('PAGE_SIZE_MAX', 1000)
+        if not ids:
+            return None, 'ids não pode estar vazio'
+        if len(ids) > max_ids:
+            return None, f'Máximo de {max_ids} IDs por consulta'
+        
+        summaries = Dieta.get_summaries(set(ids))
+        return {
+            'data': list(summaries.values()),
+            'missing_ids': sorted(set(ids) - set(summaries))
+        }, None
     
     def update(self, id, data):
         try:
@@ -62,6 +122,7 @@ class DietaController:
             
             # Apply updates
             dieta.update(**update_data)
+            get_cache().invalidate(dieta_key(id), DIETAS_LIST_KEY)
             
             return dieta.to_dict(), None
             
@@ -73,57 +134,156 @@ class DietaController:
     
     def delete(self, id):
         try:
-            dieta = Dieta.get_by_id(id)
-            if not dieta:
+            deleted = Dieta.delete_many([id])
+            if not deleted['dieta_ids']:
                 return False, f'Dieta com ID {id} não encontrada'
             
-            dieta.delete()
+            self._invalidate_deleted(deleted)
             return True, None
             
         except Exception as e:
             db.session.rollback()
             return False, str(e)
     
-    def add_refeicao(self, dieta_id, refeicao_id):
-        try:
-            # Get diet
-            dieta = Dieta.get_by_id(dieta_id)
-            if not dieta:
-                return False, f'Dieta com ID {dieta_id} não encontrada'
+    def delete_many(self, ids):
+        """
+        Delete many diets, with their children, in one transaction.
+        
+        Args:
+            ids: List of diet IDs
             
-            # Validate and get meal
-            refeicao = self._validator.validate_refeicao_exists(refeicao_id, db.session)
-            
-            # Associate meal with diet
-            refeicao.dieta_id = dieta_id
-            db.session.commit()
-            
-            return True, None
-            
-        except ValidationError as e:
-            return False, e.message
+        Returns:
+            tuple: (dict with the deleted and missing IDs or None, error message or None)
+        """
+        max_ids = current_app.config.get('PAGE_SIZE_MAX', 1000)
+        if not ids:
+            return None, 'ids não pode estar vazio'
+        if len(ids) > max_ids:
+            return None, f'Máximo de {max_ids} IDs por exclusão'
+        
+        try:
+            deleted = Dieta.delete_many(ids)
         except Exception as e:
             db.session.rollback()
-            return False, str(e)
+            return None, str(e)
+        
+        self._invalidate_deleted(deleted)
+        return {
+            'deleted_ids': deleted['dieta_ids'],
+            'missing_ids': sorted(set(ids) - set(deleted['dieta_ids'])),
+            'refeicoes_excluidas': len(deleted['refeicao_ids']),
+            'exercicios_excluidos': len(deleted['exercicio_ids'])
+        }, None
+    
+    def _invalidate_deleted(self, deleted):
+        """Drop the cached details of deleted diets and of their children."""
+        keys = [DIETAS_LIST_KEY]
+        keys += [dieta_key(i) for i in deleted['dieta_ids']]
+        keys += [refeicao_key(i) for i in deleted['refeicao_ids']]
+        keys += [exercicio_key(i) for i in deleted['exercicio_ids']]
+        get_cache().invalidate(*keys)
+    
+    def add_refeicao(self, dieta_id, refeicao_id):
+        result, error = self.attach_refeicoes(dieta_id, {'refeicao_ids': [refeicao_id]})
+        if error:
+            return False, error
+        if result['missing_ids']:
+            return False, f'Refeição com ID {refeicao_id} não existe'
+        return True, None
     
     def add_exercicio(self, dieta_id, exercicio_id):
-        try:
-            # Get diet
-            dieta = Dieta.get_by_id(dieta_id)
-            if not dieta:
-                return False, f'Dieta com ID {dieta_id} não encontrada'
+        result, error = self.attach_exercicios(dieta_id, {'exercicio_ids': [exercicio_id]})
+        if error:
+            return False, error
+        if result['missing_ids']:
+            return False, f'Exercício com ID {exercicio_id} não existe'
+        return True, None
+    
+    def attach_refeicoes(self, dieta_id, data):
+        """
+        Move many meals to a diet with one set-based UPDATE.
+        
+        Args:
+            dieta_id: Target diet ID
+            data: Dictionary with the 'refeicao_ids' list
             
-            # Validate and get exercise
-            exercicio = self._validator.validate_exercicio_exists(exercicio_id, db.session)
+        Returns:
+            tuple: (dict with the moved count and the missing IDs or None, error message or None)
+        """
+        return self._attach_children(dieta_id, data, Refeicao, 'refeicao_ids', 'refeicoes', refeicao_key)
+    
+    def attach_exercicios(self, dieta_id, data):
+        """
+        Move many exercises to a diet with one set-based UPDATE.
+        
+        Args:
+            dieta_id: Target diet ID
+            data: Dictionary with the 'exercicio_ids' list
             
-            # Associate exercise with diet
-            exercicio.dieta_id = dieta_id
-            db.session.commit()
+        Returns:
+            tuple: (dict with the moved count and the missing IDs or None, error message or None)
+        """
+        return self._attach_children(dieta_id, data, Exercicio, 'exercicio_ids', 'exercicios', exercicio_key)
+    
+    def _attach_children(self, dieta_id, data, model, ids_field, counter_field, cache_key):
+        """
+        Re-parent meals or exercises in a single transaction.
+        
+        One query checks the diet and the children together (the diet LEFT
+        JOIN the requested children, so it also returns their current diet),
+        then one UPDATE ... WHERE id IN (...) moves the children that are in
+        another diet, bumping their version.
+        """
+        try:
+            ids = data.get(ids_field) if isinstance(data, dict) else None
+            self._validator.validate_list_not_empty(ids, ids_field)
+            if not all(isinstance(id, int) and not isinstance(id, bool) for id in ids):
+                raise ValidationError(f'{ids_field} deve conter apenas números inteiros', ids_field)
+            max_items = current_app.config.get('BULK_MAX_ITEMS', 5000)
+            if len(ids) > max_items:
+                raise ValidationError(f'Máximo de {max_items} itens por lote', ids_field)
             
-            return True, None
+            rows = db.session.execute(
+                db.select(Dieta.id, model.id, model.dieta_id)
+                .select_from(Dieta)
+                .outerjoin(model, model.id.in_(set(ids)))
+                .where(Dieta.id == dieta_id)
+            ).all()
+            if not rows:
+                return None, f'Dieta com ID {dieta_id} não encontrada'
+            
+            found = {child_id: old_dieta_id for _, child_id, old_dieta_id in rows if child_id is not None}
+            moving = {child_id: old for child_id, old in found.items() if old != dieta_id}
             
+            if moving:
+                table = model.__table__
+                db.session.execute(
+                    db.update(table)
+                    .where(table.c.id.in_(moving))
+                    .values(dieta_id=dieta_id, version=table.c.version + 1)
+                )
+                if DietaContador.enabled():
+                    connection = db.session.connection()
+                    deltas = {}
+                    for old in moving.values():
+                        deltas[old] = deltas.get(old, 0) - 1
+                    deltas[dieta_id] = deltas.get(dieta_id, 0) + len(moving)
+                    for id, delta in deltas.items():
+                        DietaContador.adjust(connection, id, **{counter_field: delta})
+            db.session.commit()
         except ValidationError as e:
-            return False, e.message
+            return None, e.message
         except Exception as e:
             db.session.rollback()
-            return False, str(e)
+            return None, str(e)
+        
+        if moving:
+            keys = [cache_key(id) for id in moving]
+            keys += [dieta_key(id) for id in {dieta_id, *moving.values()} if id is not None]
+            get_cache().invalidate(DIETAS_LIST_KEY, *keys)
+        
+        return {
+            'moved': len(moving),
+            'already_attached': len(found) - len(moving),
+            'missing_ids': sorted(set(ids) - set(found))
+        }, None
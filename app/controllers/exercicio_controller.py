@@ -1,6 +1,12 @@
+from flask import current_app
+from sqlalchemy import insert
 from app import db
+from app.cache import get_cache, dieta_key, exercicio_key, DIETAS_LIST_KEY
 from app.models.exercicio import Exercicio
+from app.models.dieta_contador import DietaContador
+from app.serializers import exercicio_serializer
 from app.validators.validators import ExercicioValidator, ValidationError
+from app.controllers.patch import patch_child
 class ExercicioController:
     
     def __init__(self):
@@ -23,6 +29,7 @@ class ExercicioController:
             
             # Save to database
             exercicio.save()
+            self._invalidate_dietas(data.get('dieta_id'))
             
             return exercicio, None
             
@@ -32,19 +39,124 @@ class ExercicioController:
             db.session.rollback()
             return None, str(e)
     
+    def create_bulk(self, items):
+        """
+        Create many exercícios in a single transaction.
+        
+        Items are checked by the batch validator (every referenced diet in
+        one IN query) and the valid rows are inserted in one bulk INSERT.
+        Invalid items are reported without blocking the valid ones.
+        
+        Args:
+            items: List of exercicio data dictionaries
+            
+        Returns:
+            tuple: (dict with created ids and per-item errors or None, error message or None)
+        """
+        if not isinstance(items, list) or not items:
+            return None, 'Lista de exercícios não pode estar vazia'
+        
+        max_items = current_app.config.get('BULK_MAX_ITEMS', 5000)
+        if len(items) > max_items:
+            return None, f'Máximo de {max_items} itens por lote'
+        
+        # Field rules and diet existence checked for the whole batch at once
+        checked, errors = self._validator.validate_many(items)
+        
+        valid = []
+        for index, data in checked:
+            valid.append((index, {
+                'tipo_exercicio': data.get('tipo_exercicio'),
+                'quantidade_repeticoes': data.get('quantidade_repeticoes'),
+                'ciclos': data.get('ciclos'),
+                'pausa_entre_ciclos': data.get('pausa_entre_ciclos'),
+                'dieta_id': data.get('dieta_id')
+            }))
+        
+        try:
+            ids = []
+            if valid:
+                rows = [row for _, row in valid]
+                ids = db.session.scalars(
+                    insert(Exercicio).returning(Exercicio.id, sort_by_parameter_order=True),
+                    rows
+                ).all()
+                
+                # Bulk inserts bypass the mapper events
+                if DietaContador.enabled():
+                    DietaContador.adjust_many(
+                        db.session.connection(), (row['dieta_id'] for row in rows), 'exercicios'
+                    )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+        
+        self._invalidate_dietas(*(row['dieta_id'] for _, row in valid))
+        
+        created = [{'index': index, 'id': id} for (index, _), id in zip(valid, ids)]
+        return {'created': created, 'errors': errors}, None
+    
     def get_all(self):
-        exercicios = Exercicio.get_all()
-        return [e.to_dict() for e in exercicios]
+        return exercicio_serializer.from_rows(exercicio_serializer.query())
     
     def get_by_id(self, id):
-        exercicio = Exercicio.get_by_id(id)
-        if not exercicio:
+        def load():
+            exercicio = Exercicio.get_by_id(id)
+            return exercicio.to_dict() if exercicio else None
+        
+        data = get_cache().get_or_load(exercicio_key(id), load)
+        if data is None:
             return None, f'Exercício com ID {id} não encontrado'
-        return exercicio.to_dict(), None
+        return data, None
     
     def get_by_dieta(self, dieta_id):
-        exercicios = Exercicio.get_by_dieta(dieta_id)
-        return [e.to_dict() for e in exercicios]
+        return exercicio_serializer.from_rows(exercicio_serializer.query().filter(Exercicio.dieta_id == dieta_id))
+    
+    def get_page(self, limit, cursor=None, dieta_id=None, with_count=False):
+        query = exercicio_serializer.query()
+        if dieta_id:
+            query = query.filter(Exercicio.dieta_id == dieta_id)
+        
+        try:
+            rows, next_cursor = Exercicio.get_page(limit, cursor, query=query)
+        except ValueError as e:
+            return None, str(e)
+        
+        result = {
+            'data': exercicio_serializer.from_rows(rows),
+            'next_cursor': next_cursor
+        }
+        if with_count:
+            result['total'] = Exercicio.count_all(query)
+        return result, None
+    
+    def export(self, dieta_id=None, created_from=None, created_to=None):
+        """
+        Stream every exercise matching the filters as dictionaries.
+        
+        Rows are fetched with yield_per (a server-side cursor where the
+        driver supports it), so memory stays constant whatever the table size.
+        
+        Args:
+            dieta_id: Filter by diet ID (optional)
+            created_from: Only rows created at or after this datetime (optional)
+            created_to: Only rows created before this datetime (optional)
+            
+        Returns:
+            tuple: (field names, iterator of dictionaries)
+        """
+        stmt = db.select(*exercicio_serializer.columns).order_by(Exercicio.id)
+        if dieta_id:
+            stmt = stmt.where(Exercicio.dieta_id == dieta_id)
+        if created_from:
+            stmt = stmt.where(Exercicio.created_at >= created_from)
+        if created_to:
+            stmt = stmt.where(Exercicio.created_at < created_to)
+        
+        batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+        rows = db.session.execute(stmt.execution_options(yield_per=batch_size))
+        return exercicio_serializer.names, map(exercicio_serializer.from_row, rows)
     
     def update(self, id, data):
         try:
@@ -81,7 +193,10 @@ class ExercicioController:
                     update_data[field] = data[field]
             
             # Apply updates
+            old_dieta_id = exercicio.dieta_id
             exercicio.update(**update_data)
+            get_cache().invalidate(exercicio_key(id))
+            self._invalidate_dietas(old_dieta_id, update_data.get('dieta_id', old_dieta_id))
             
             return exercicio.to_dict(), None
             
@@ -91,15 +206,56 @@ class ExercicioController:
             db.session.rollback()
             return None, str(e)
     
+    def patch(self, id, data, version=None):
+        """
+        Partially update an exercise with a single UPDATE ... RETURNING.
+        
+        Args:
+            id: Exercise ID
+            data: Dictionary with the fields to change
+            version: Expected version (If-Match), None to skip the check
+            
+        Returns:
+            tuple: (updated exercise or None, error message or None)
+        """
+        try:
+            values = self._validator.validate_partial(data)
+            
+            row, old_dieta_id, error = patch_child(
+                Exercicio, id, values, version, 'exercicios', f'Exercício com ID {id} não encontrado'
+            )
+            if error:
+                db.session.rollback()
+                return None, error
+            db.session.commit()
+        except ValidationError as e:
+            return None, e.message
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+        
+        get_cache().invalidate(exercicio_key(id))
+        self._invalidate_dietas(old_dieta_id, row['dieta_id'])
+        return exercicio_serializer.from_mapping(row), None
+    
     def delete(self, id):
         try:
             exercicio = Exercicio.get_by_id(id)
             if not exercicio:
                 return False, f'Exercício com ID {id} não encontrado'
             
+            dieta_id = exercicio.dieta_id
             exercicio.delete()
+            get_cache().invalidate(exercicio_key(id))
+            self._invalidate_dietas(dieta_id)
             return True, None
             
         except Exception as e:
             db.session.rollback()
             return False, str(e)
+    
+    def _invalidate_dietas(self, *dieta_ids):
+        """Drop the cached diet details (and list counts) affected by a change."""
+        keys = {dieta_key(i) for i in dieta_ids if i is not None}
+        if keys:
+            get_cache().invalidate(DIETAS_LIST_KEY, *keys)
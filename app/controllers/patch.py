@@ -0,0 +1,59 @@
+"""
+Patch Module
+Contains the partial-update (PATCH) path shared by the meal and exercise
+controllers: one UPDATE ... RETURNING per request, with optimistic
+concurrency on the row version.
+"""
+
+from app import db
+from app.models.dieta import Dieta
+from app.models.dieta_contador import DietaContador
+from app.validators.validators import BaseValidator
+
+# Prefix of the error returned when If-Match does not match (HTTP 412)
+VERSION_CONFLICT = 'Conflito de versão'
+
+
+def patch_child(model, id, values, version, counter_field, not_found):
+    """
+    Apply a validated partial update to a meal or exercise (no commit).
+
+    The row is written without being read first. Moving it to another diet
+    is the exception: the previous diet is read first, because its cached
+    detail and counter change too. The new diet's existence is part of the
+    UPDATE's WHERE clause.
+
+    Args:
+        model: Refeicao or Exercicio
+        id: Row ID
+        values: Validated column values
+        version: Expected version (If-Match), None to skip the check
+        counter_field: DietaContador field of the model ('refeicoes'/'exercicios')
+        not_found: Error message when the row does not exist
+
+    Returns:
+        tuple: (updated row mapping or None, previous diet ID, error message or None)
+    """
+    where = []
+    old_dieta_id = None
+    moving = 'dieta_id' in values
+    if moving:
+        old_dieta_id = db.session.scalar(db.select(model.dieta_id).where(model.id == id))
+        if values['dieta_id'] is not None:
+            where.append(db.select(Dieta.id).where(Dieta.id == values['dieta_id']).exists())
+
+    row, current = model.patch(id, values, version, where)
+    if row is None:
+        if current is None:
+            return None, None, not_found
+        if version is not None and current != version:
+            return None, None, f'{VERSION_CONFLICT}: versão atual é {current}'
+        return None, None, BaseValidator.MSG_DIETA_NOT_FOUND.format(id=values.get('dieta_id'))
+
+    if not moving:
+        old_dieta_id = row['dieta_id']
+    elif old_dieta_id != row['dieta_id'] and DietaContador.enabled():
+        connection = db.session.connection()
+        DietaContador.adjust(connection, old_dieta_id, **{counter_field: -1})
+        DietaContador.adjust(connection, row['dieta_id'], **{counter_field: 1})
+    return row, old_dieta_id, None
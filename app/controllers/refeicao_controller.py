@@ -1,6 +1,14 @@
+from flask import current_app
+from sqlalchemy import insert
 from app import db
+from app.cache import get_cache, dieta_key, refeicao_key, DIETAS_LIST_KEY
 from app.models.refeicao import Refeicao
+from app.models.dieta_contador import DietaContador
+from app.models.alimento import Alimento
+from app.models.refeicao_alimento import RefeicaoAlimento
+from app.serializers import refeicao_serializer
 from app.validators.validators import RefeicaoValidator, ValidationError
+from app.controllers.patch import patch_child
 class RefeicaoController:
     def __init__(self):
         """Constructor for RefeicaoController."""
@@ -26,6 +34,7 @@ class RefeicaoController:
             
             # Save to database
             refeicao.save()
+            self._invalidate_dietas(data.get('dieta_id'))
             
             return refeicao, None
             
@@ -35,19 +44,188 @@ class RefeicaoController:
             db.session.rollback()
             return None, str(e)
     
+    def create_bulk(self, items):
+        """
+        Create many refeições in a single transaction.
+        
+        Items are checked by the batch validator (every referenced diet in
+        one IN query) and the valid rows are inserted in one bulk INSERT.
+        Invalid items are reported without blocking the valid ones.
+        
+        Args:
+            items: List of refeicao data dictionaries
+            
+        Returns:
+            tuple: (dict with created ids and per-item errors or None, error message or None)
+        """
+        if not isinstance(items, list) or not items:
+            return None, 'Lista de refeições não pode estar vazia'
+        
+        max_items = current_app.config.get('BULK_MAX_ITEMS', 5000)
+        if len(items) > max_items:
+            return None, f'Máximo de {max_items} itens por lote'
+        
+        # Field rules and diet existence checked for the whole batch at once
+        checked, errors = self._validator.validate_many(items)
+        
+        valid = []
+        for index, data in checked:
+            alimentos = data.get('alimentos', [])
+            if isinstance(alimentos, str):
+                alimentos = [alimentos]
+            
+            valid.append((index, {
+                'tipo_refeicao': data.get('tipo_refeicao'),
+                'quantidade': data.get('quantidade'),
+                'dieta_id': data.get('dieta_id')
+            }, alimentos))
+        
+        try:
+            ids = []
+            if valid:
+                rows = [row for _, row, _ in valid]
+                ids = db.session.scalars(
+                    insert(Refeicao).returning(Refeicao.id, sort_by_parameter_order=True),
+                    rows
+                ).all()
+                
+                # Foods of the whole batch interned and linked set-based
+                RefeicaoAlimento.attach_pairs(zip(ids, (alimentos for _, _, alimentos in valid)))
+                
+                # Bulk inserts bypass the mapper events
+                if DietaContador.enabled():
+                    DietaContador.adjust_many(
+                        db.session.connection(), (row['dieta_id'] for row in rows), 'refeicoes'
+                    )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+        
+        self._invalidate_dietas(*(row['dieta_id'] for _, row, _ in valid))
+        
+        created = [{'index': index, 'id': id} for (index, _, _), id in zip(valid, ids)]
+        return {'created': created, 'errors': errors}, None
+    
+    def create_queued(self, data):
+        """
+        Create a meal through the write-behind queue (WRITE_BEHIND_ENABLED).
+        
+        The payload joins the next group commit; validation, including the
+        diet check, runs there for the whole batch.
+        
+        Args:
+            data: Meal data dictionary
+            
+        Returns:
+            tuple: (created meal dictionary or None, error message or None)
+        """
+        write_queue = current_app.extensions['refeicao_write_behind']
+        future, error = write_queue.submit(data)
+        if error:
+            return None, error
+        return write_queue.wait(future)
+    
+    def create_batch(self, items):
+        """
+        Write one batch of the write-behind queue with create_bulk.
+        
+        Args:
+            items: List of meal data dictionaries
+            
+        Returns:
+            list: (created meal dictionary or None, error message or None) per item, in order
+        """
+        result, error = self.create_bulk(items)
+        if error:
+            return [(None, error)] * len(items)
+        
+        ids = {created['index']: created['id'] for created in result['created']}
+        rows = refeicao_serializer.from_rows(refeicao_serializer.query().filter(Refeicao.id.in_(ids.values())))
+        by_id = {row['id']: row for row in rows}
+        errors = {error['index']: error['error'] for error in result['errors']}
+        return [
+            (by_id[ids[index]], None) if index in ids else (None, errors.get(index, 'Refeição não criada'))
+            for index in range(len(items))
+        ]
+    
     def get_all(self):
-        refeicoes = Refeicao.get_all()
-        return [r.to_dict() for r in refeicoes]
+        return refeicao_serializer.from_rows(refeicao_serializer.query(), all_rows=True)
     
     def get_by_id(self, id):
-        refeicao = Refeicao.get_by_id(id)
-        if not refeicao:
+        def load():
+            refeicao = Refeicao.get_by_id(id)
+            return refeicao.to_dict() if refeicao else None
+        
+        data = get_cache().get_or_load(refeicao_key(id), load)
+        if data is None:
             return None, f'Refeição com ID {id} não encontrada'
-        return refeicao.to_dict(), None
+        return data, None
     
     def get_by_dieta(self, dieta_id):
-        refeicoes = Refeicao.get_by_dieta(dieta_id)
-        return [r.to_dict() for r in refeicoes]
+        return refeicao_serializer.from_rows(refeicao_serializer.query().filter(Refeicao.dieta_id == dieta_id))
+    
+    def search(self, alimento, busca=Alimento.BUSCA_EXATA, dieta_id=None):
+        """
+        Find the meals containing a food, through the food catalog indexes.
+        
+        Args:
+            alimento: Food name (or prefix) to search for
+            busca: 'exata', 'prefixo' or 'aproximada'
+            dieta_id: Filter by diet ID (optional)
+            
+        Returns:
+            tuple: (list of refeicao dictionaries or None, error message or None)
+        """
+        query, error = self._filtered_query(dieta_id, alimento, busca)
+        if error:
+            return None, error
+        return refeicao_serializer.from_rows(query.order_by(Refeicao.id)), None
+    
+    def get_page(self, limit, cursor=None, dieta_id=None, with_count=False, alimento=None, busca=None):
+        query, error = self._filtered_query(dieta_id, alimento, busca)
+        if error:
+            return None, error
+        
+        try:
+            rows, next_cursor = Refeicao.get_page(limit, cursor, query=query)
+        except ValueError as e:
+            return None, str(e)
+        
+        result = {
+            'data': refeicao_serializer.from_rows(rows),
+            'next_cursor': next_cursor
+        }
+        if with_count:
+            result['total'] = Refeicao.count_all(query)
+        return result, None
+    
+    def export(self, dieta_id=None, created_from=None, created_to=None):
+        """
+        Stream every meal matching the filters as dictionaries.
+        
+        Rows are fetched with yield_per (a server-side cursor where the
+        driver supports it), so memory stays constant whatever the table size.
+        
+        Args:
+            dieta_id: Filter by diet ID (optional)
+            created_from: Only rows created at or after this datetime (optional)
+            created_to: Only rows created before this datetime (optional)
+            
+        Returns:
+            tuple: (field names, iterator of dictionaries)
+        """
+        stmt = db.select(*refeicao_serializer.columns).order_by(Refeicao.id)
+        if dieta_id:
+            stmt = stmt.where(Refeicao.dieta_id == dieta_id)
+        if created_from:
+            stmt = stmt.where(Refeicao.created_at >= created_from)
+        if created_to:
+            stmt = stmt.where(Refeicao.created_at < created_to)
+        
+        batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+        rows = db.session.execute(stmt.execution_options(yield_per=batch_size))
+        return refeicao_serializer.names, refeicao_serializer.iter_rows(rows)
     
     def update(self, id, data):
         try:
@@ -81,7 +259,10 @@ class RefeicaoController:
                     update_data[field] = data[field]
             
             # Apply updates
+            old_dieta_id = refeicao.dieta_id
             refeicao.update(**update_data)
+            get_cache().invalidate(refeicao_key(id))
+            self._invalidate_dietas(old_dieta_id, update_data.get('dieta_id', old_dieta_id))
             
             return refeicao.to_dict(), None
             
@@ -91,15 +272,141 @@ class RefeicaoController:
             db.session.rollback()
             return None, str(e)
     
+    def patch(self, id, data, version=None):
+        """
+        Partially update a meal with a single UPDATE ... RETURNING.
+        
+        Args:
+            id: Meal ID
+            data: Dictionary with the fields to change
+            version: Expected version (If-Match), None to skip the check
+            
+        Returns:
+            tuple: (updated meal or None, error message or None)
+        """
+        try:
+            values = self._validator.validate_partial(data)
+            alimentos = values.pop('alimentos', None)
+            
+            row, old_dieta_id, error = patch_child(
+                Refeicao, id, values, version, 'refeicoes', f'Refeição com ID {id} não encontrada'
+            )
+            if error:
+                db.session.rollback()
+                return None, error
+            
+            if alimentos is not None:
+                alimentos = RefeicaoAlimento.replace(id, alimentos)
+            else:
+                # Same representation as GET: the unchanged names, with one query
+                alimentos = RefeicaoAlimento.nomes_por_refeicao([id]).get(id, [])
+            db.session.commit()
+        except ValidationError as e:
+            return None, e.message
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+        
+        get_cache().invalidate(refeicao_key(id))
+        self._invalidate_dietas(old_dieta_id, row['dieta_id'])
+        return refeicao_serializer.from_mapping(row, alimentos), None
+    
     def delete(self, id):
         try:
             refeicao = Refeicao.get_by_id(id)
             if not refeicao:
                 return False, f'Refeição com ID {id} não encontrada'
             
+            dieta_id = refeicao.dieta_id
             refeicao.delete()
+            get_cache().invalidate(refeicao_key(id))
+            self._invalidate_dietas(dieta_id)
             return True, None
             
         except Exception as e:
             db.session.rollback()
             return False, str(e)
+    
+    def attach_alimentos(self, data):
+        """
+        Add foods to many meals with set-based statements.
+        
+        Args:
+            data: Dictionary with 'refeicao_ids' and 'alimentos' lists
+            
+        Returns:
+            tuple: (dict with the number of links added and the missing meal IDs or None, error message or None)
+        """
+        return self._change_alimentos(data, RefeicaoAlimento.attach)
+    
+    def detach_alimentos(self, data):
+        """
+        Remove foods from many meals with one DELETE.
+        
+        Args:
+            data: Dictionary with 'refeicao_ids' and 'alimentos' lists
+            
+        Returns:
+            tuple: (dict with the number of links removed and the missing meal IDs or None, error message or None)
+        """
+        return self._change_alimentos(data, RefeicaoAlimento.detach)
+    
+    def _change_alimentos(self, data, operation):
+        """Validate a bulk food change, run it on the existing meals and invalidate the cache."""
+        try:
+            if not isinstance(data, dict):
+                raise ValidationError("Dados devem ser um objeto com 'refeicao_ids' e 'alimentos'")
+            refeicao_ids = data.get('refeicao_ids')
+            alimentos = data.get('alimentos')
+            self._validator.validate_list_not_empty(refeicao_ids, 'refeicao_ids')
+            self._validator.validate_list_not_empty(alimentos, 'alimentos')
+            if not all(isinstance(id, int) and not isinstance(id, bool) for id in refeicao_ids):
+                raise ValidationError('refeicao_ids deve conter apenas números inteiros')
+            
+            # Existence check and affected diets in one query
+            found = dict(db.session.execute(
+                db.select(Refeicao.id, Refeicao.dieta_id).where(Refeicao.id.in_(set(refeicao_ids)))
+            ).all())
+            
+            count = operation(list(found), alimentos) if found else 0
+            if count:
+                # The foods are part of the meal: concurrent If-Match writers must see a new version
+                db.session.execute(
+                    db.update(Refeicao.__table__)
+                    .where(Refeicao.__table__.c.id.in_(found))
+                    .values(version=Refeicao.__table__.c.version + 1)
+                )
+            db.session.commit()
+        except ValidationError as e:
+            return None, e.message
+        except Exception as e:
+            db.session.rollback()
+            return None, str(e)
+        
+        get_cache().invalidate(*(refeicao_key(id) for id in found))
+        self._invalidate_dietas(*found.values())
+        
+        missing = sorted(set(refeicao_ids) - set(found))
+        return {'affected': count, 'missing_ids': missing}, None
+    
+    def _filtered_query(self, dieta_id=None, alimento=None, busca=None):
+        """Build the row query for the diet and food filters."""
+        query = refeicao_serializer.query()
+        if dieta_id:
+            query = query.filter(Refeicao.dieta_id == dieta_id)
+        
+        if alimento is not None:
+            busca = busca or Alimento.BUSCA_EXATA
+            if busca not in Alimento.MODOS_BUSCA:
+                return None, f"busca deve ser um dos valores: {', '.join(Alimento.MODOS_BUSCA)}"
+            if not alimento.strip():
+                return None, 'alimento não pode estar vazio'
+            query = query.filter(Refeicao.id.in_(RefeicaoAlimento.refeicao_ids_matching(alimento, busca)))
+        
+        return query, None
+    
+    def _invalidate_dietas(self, *dieta_ids):
+        """Drop the cached diet details (and list counts) affected by a change."""
+        keys = {dieta_key(i) for i in dieta_ids if i is not None}
+        if keys:
+            get_cache().invalidate(DIETAS_LIST_KEY, *keys)
@@ -0,0 +1,209 @@
+"""
+Instrumentation Module
+Contains the request-scoped SQL instrumentation.
+
+Engine execute events count the statements each request runs and the
+time spent in them. Every response carries a Server-Timing header
+(db/app durations) and every request is logged as one JSON line on the
+'app.sql' logger. Statements slower than SLOW_QUERY_MS are logged with
+their parameters and the controller method that issued them, so N+1
+patterns and slow queries show up in production logs.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger('app.sql')
+
+# Frames searched (in order) for the origin of a slow statement
+ORIGIN_PACKAGES = ('controllers', 'resources', 'models')
+MAX_PARAMS_LENGTH = 500
+
+
+class RequestQueryStats:
+    """
+    Statement count and time of one request.
+    """
+
+    __slots__ = ('count', 'seconds', 'slow')
+
+    def __init__(self):
+        """Constructor for RequestQueryStats."""
+        self.count = 0
+        self.seconds = 0.0
+        self.slow = 0
+
+    def record(self, seconds, slow=False):
+        """Record one executed statement."""
+        self.count += 1
+        self.seconds += seconds
+        self.slow += slow
+
+
+def current_stats():
+    """Return the query stats of the current request (None outside one)."""
+    if not has_request_context():
+        return None
+    return g.get('sql_stats')
+
+
+def statement_origin():
+    """
+    Describe the application code that issued the current statement.
+
+    Returns the innermost controller method on the stack (falling back to
+    resources, then models), as 'Class.method (file:line)'. Only called
+    for slow statements: walking the stack is not free.
+    """
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+
+    for package in ORIGIN_PACKAGES:
+        marker = f'{os.sep}app{os.sep}{package}{os.sep}'
+        matches = [frame for frame in frames if marker in frame.f_code.co_filename]
+        if not matches:
+            continue
+        # Prefer a method frame over helpers/lambdas defined inside it
+        frame = next((f for f in matches if 'self' in f.f_locals or 'cls' in f.f_locals), matches[0])
+        name = frame.f_code.co_name
+        owner = frame.f_locals.get('self', frame.f_locals.get('cls'))
+        if owner is not None:
+            owner = owner if isinstance(owner, type) else type(owner)
+            name = f'{owner.__name__}.{name}'
+        return f'{name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})'
+    return None
+
+
+def format_params(parameters, executemany):
+    """Render statement parameters for the log, truncated."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        text = f'{len(parameters)} linhas, primeiras: {list(parameters[:3])!r}'
+    else:
+        text = repr(parameters)
+    if len(text) > MAX_PARAMS_LENGTH:
+        text = text[:MAX_PARAMS_LENGTH] + '...'
+    return text
+
+
+class QueryInstrumentation:
+    """
+    Engine and request hooks collecting per-request SQL statistics.
+    """
+
+    def __init__(self, slow_query_seconds=0.1, log_requests=True):
+        """
+        Constructor for QueryInstrumentation.
+
+        Args:
+            slow_query_seconds: Statements at or above this duration are logged
+                (None disables the slow-query log)
+            log_requests: Log one structured line per request
+        """
+        self.slow_query_seconds = slow_query_seconds
+        self.log_requests = log_requests
+
+    def attach(self, engine):
+        """Listen to the execute events of an engine."""
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # The start time lives on the statement's execution context, so a
+        # failing statement (no after event) leaves nothing behind on the
+        # pooled connection
+        if context is not None:
+            context.query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, 'query_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        slow = self.slow_query_seconds is not None and elapsed >= self.slow_query_seconds
+
+        stats = current_stats()
+        if stats is not None:
+            stats.record(elapsed, slow)
+
+        if slow:
+            logger.warning(json.dumps({
+                'event': 'slow_query',
+                'duration_ms': round(elapsed * 1000, 3),
+                'statement': ' '.join(statement.split()),
+                'params': format_params(parameters, executemany),
+                'origin': statement_origin(),
+                'path': request.path if has_request_context() else None
+            }, ensure_ascii=False))
+
+    def before_request(self):
+        """Start the request's counters."""
+        g.sql_stats = RequestQueryStats()
+        g.request_start = time.perf_counter()
+
+    def after_request(self, response):
+        """Add the Server-Timing header (statements run so far)."""
+        stats = current_stats()
+        if stats is None:
+            return response
+        total = (time.perf_counter() - g.request_start) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={stats.seconds * 1000:.3f};desc="{stats.count} consultas", app;dur={total:.3f}'
+        )
+        g.response_status = response.status_code
+        return response
+
+    def teardown_request(self, exc=None):
+        """Log the request (after streamed bodies finish)."""
+        stats = current_stats()
+        if stats is None or not self.log_requests or not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(json.dumps({
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': g.get('response_status', 500),
+            'duration_ms': round((time.perf_counter() - g.request_start) * 1000, 3),
+            'sql_count': stats.count,
+            'sql_ms': round(stats.seconds * 1000, 3),
+            'slow_queries': stats.slow
+        }, ensure_ascii=False))
+
+
+def init_instrumentation(app, engines):
+    """
+    Attach the SQL instrumentation to the application and its engines.
+
+    Args:
+        app: Flask application
+        engines: Engines to instrument (primary and replicas)
+    """
+    slow_ms = app.config.get('SLOW_QUERY_MS', 100)
+    instrumentation = QueryInstrumentation(
+        slow_query_seconds=slow_ms / 1000 if slow_ms is not None else None,
+        log_requests=app.config.get('SQL_LOG_REQUESTS', True)
+    )
+    for engine in engines:
+        instrumentation.attach(engine)
+
+    app.before_request(instrumentation.before_request)
+    app.after_request(instrumentation.after_request)
+    app.teardown_request(instrumentation.teardown_request)
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(app.config.get('SQL_LOG_LEVEL', 'INFO'))
+    app.extensions['query_instrumentation'] = instrumentation
+    return instrumentation
@@ -0,0 +1,275 @@
+"""
+Metrics Module
+Contains the Prometheus-style metrics of the API, served at /metrics in
+the text exposition format.
+
+Per-request counters are kept in per-thread shards, so the request path
+only touches its own thread's dictionaries and never takes a lock;
+a scrape merges the shards. Shards of finished threads are folded into a
+retired total when a new thread registers. Pool and cache figures are
+read at scrape time.
+
+Requests are labelled with the Flask-RESTful resource class name
+(DietaListResource, RefeicaoResource, ...), never the raw path, and
+with a fixed set of methods (any other verb counts as 'other'), so the
+number of series stays bounded. Metrics are per process: with several
+server workers each scrape reflects the worker that answered it.
+"""
+
+import threading
+import time
+
+from flask import Response, current_app, g, request
+
+from app import db
+from app.cache import get_cache
+from app.pool import pool_stats
+
+PREFIX = 'diet_app_'
+# Latency buckets in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Method label values; any other request method is labelled 'other'
+METHODS = frozenset(('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'))
+
+
+class _Shard:
+    """
+    Counters written by a single thread.
+    """
+
+    __slots__ = ('requests', 'latency', 'in_flight')
+
+    def __init__(self):
+        # (resource, method, status) -> count
+        self.requests = {}
+        # (resource, method) -> [bucket counts..., +Inf count, sum]
+        self.latency = {}
+        self.in_flight = 0
+
+    def merge(self, other):
+        """Add the counters of another shard to this one."""
+        for key, count in other.requests.copy().items():
+            self.requests[key] = self.requests.get(key, 0) + count
+        for key, values in other.latency.copy().items():
+            mine = self.latency.setdefault(key, [0] * (len(BUCKETS) + 1) + [0.0])
+            for index, value in enumerate(list(values)):
+                mine[index] += value
+        self.in_flight += other.in_flight
+
+
+class MetricsRegistry:
+    """
+    Request counters, latency histograms and the in-flight gauge.
+    """
+
+    def __init__(self):
+        """Constructor for MetricsRegistry."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard()
+
+    def _shard(self):
+        """Return the calling thread's shard, registering it on first use."""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                alive = []
+                for thread, other in self._shards:
+                    if thread.is_alive():
+                        alive.append((thread, other))
+                    else:
+                        self._retired.merge(other)
+                alive.append((threading.current_thread(), shard))
+                self._shards = alive
+        return shard
+
+    def request_started(self):
+        """Count a request in flight."""
+        self._shard().in_flight += 1
+
+    def request_finished(self, resource, method, status, seconds):
+        """Record a finished request."""
+        shard = self._shard()
+        shard.in_flight -= 1
+
+        key = (resource, method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+
+        values = shard.latency.get((resource, method))
+        if values is None:
+            values = shard.latency[(resource, method)] = [0] * (len(BUCKETS) + 1) + [0.0]
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                values[index] += 1
+        values[len(BUCKETS)] += 1
+        values[-1] += seconds
+
+    def collect(self):
+        """Merge every shard into one snapshot."""
+        total = _Shard()
+        with self._lock:
+            total.merge(self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            total.merge(shard)
+        return total
+
+
+def _label_value(value):
+    """Escape a label value for the exposition format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_label_value(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(registry, engines, cache_stats):
+    """
+    Render the metrics in the Prometheus text exposition format.
+
+    Args:
+        registry: MetricsRegistry with the request metrics
+        engines: Dictionary of engine label -> engine
+        cache_stats: Controller cache counters (ControllerCache.stats())
+
+    Returns:
+        str: Exposition text
+    """
+    snapshot = registry.collect()
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {PREFIX}{name} {help_text}')
+        lines.append(f'# TYPE {PREFIX}{name} {kind}')
+
+    def sample(name, value, **labels):
+        lines.append(f'{PREFIX}{name}{_labels(**labels) if labels else ""} {_format_value(value)}')
+
+    family('http_requests_total', 'counter', 'Requests by resource, method and status.')
+    for (resource, method, status), count in sorted(snapshot.requests.items()):
+        sample('http_requests_total', count, resource=resource, method=method, status=status)
+
+    family('http_request_duration_seconds', 'histogram', 'Request latency by resource and method.')
+    for (resource, method), values in sorted(snapshot.latency.items()):
+        # Bucket counts are cumulative already (every bucket >= the latency)
+        for bound, count in zip(BUCKETS, values):
+            sample('http_request_duration_seconds_bucket', count,
+                   resource=resource, method=method, le=_format_value(bound))
+        sample('http_request_duration_seconds_bucket', values[len(BUCKETS)],
+               resource=resource, method=method, le='+Inf')
+        sample('http_request_duration_seconds_sum', values[-1], resource=resource, method=method)
+        sample('http_request_duration_seconds_count', values[len(BUCKETS)], resource=resource, method=method)
+
+    family('http_requests_in_flight', 'gauge', 'Requests being served.')
+    sample('http_requests_in_flight', snapshot.in_flight)
+
+    pools = {label: pool_stats(engine) for label, engine in engines.items()}
+    gauges = (('size', 'db_pool_size', 'Connections kept by the pool.'),
+              ('checked_out', 'db_pool_checked_out', 'Connections in use.'),
+              ('overflow', 'db_pool_overflow', 'Overflow connections open.'))
+    counters = (('checkouts', 'db_pool_checkouts_total', 'Connections handed out.'),
+                ('timeouts', 'db_pool_timeouts_total', 'Checkouts that timed out waiting.'))
+    for key, name, help_text in gauges:
+        family(name, 'gauge', help_text)
+        for label, stats in pools.items():
+            if key in stats:
+                sample(name, stats[key], engine=label)
+    for key, name, help_text in counters:
+        family(name, 'counter', help_text)
+        for label, stats in pools.items():
+            if key in stats:
+                sample(name, stats[key], engine=label)
+    family('db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a connection.')
+    for label, stats in pools.items():
+        if 'wait_ms_total' in stats:
+            sample('db_pool_wait_seconds_total', stats['wait_ms_total'] / 1000, engine=label)
+
+    backend = cache_stats['backend']
+    family('cache_hits_total', 'counter', 'Controller cache hits.')
+    sample('cache_hits_total', cache_stats['hits'], backend=backend)
+    family('cache_misses_total', 'counter', 'Controller cache misses.')
+    sample('cache_misses_total', cache_stats['misses'], backend=backend)
+    family('cache_hit_ratio', 'gauge', 'Controller cache hits / lookups.')
+    sample('cache_hit_ratio', float(cache_stats['hit_ratio']), backend=backend)
+
+    return '\n'.join(lines) + '\n'
+
+
+class RequestMetrics:
+    """
+    Request hooks feeding a MetricsRegistry.
+    """
+
+    def __init__(self, registry):
+        """
+        Constructor for RequestMetrics.
+
+        Args:
+            registry: MetricsRegistry receiving the measurements
+        """
+        self.registry = registry
+        self._resources = {}
+
+    def resource_name(self, endpoint):
+        """Resource class name of an endpoint (the endpoint itself for plain views)."""
+        name = self._resources.get(endpoint)
+        if name is None:
+            view = current_app.view_functions.get(endpoint) if endpoint else None
+            view_class = getattr(view, 'view_class', None)
+            name = view_class.__name__ if view_class is not None else (endpoint or 'unmatched')
+            self._resources[endpoint] = name
+        return name
+
+    def before_request(self):
+        g.metrics_start = time.perf_counter()
+        self.registry.request_started()
+
+    def after_request(self, response):
+        g.metrics_status = response.status_code
+        return response
+
+    def teardown_request(self, exc=None):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return
+        method = request.method
+        self.registry.request_finished(
+            self.resource_name(request.endpoint),
+            method if method in METHODS else 'other',
+            str(g.get('metrics_status', 500)),
+            time.perf_counter() - start
+        )
+
+
+def metrics_view():
+    """GET /metrics - Prometheus text exposition."""
+    engines = {key or 'primary': engine for key, engine in db.engines.items()}
+    text = render(current_app.extensions['metrics_registry'], engines, get_cache().stats())
+    return Response(text, mimetype=None, content_type=CONTENT_TYPE)
+
+
+def init_metrics(app):
+    """
+    Collect request metrics and serve them at /metrics.
+
+    Args:
+        app: Flask application
+    """
+    registry = MetricsRegistry()
+    hooks = RequestMetrics(registry)
+    app.before_request(hooks.before_request)
+    app.after_request(hooks.after_request)
+    app.teardown_request(hooks.teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
+    app.extensions['metrics_registry'] = registry
+    return registry
@@ -0,0 +1,77 @@
+"""
+Migrations Package
+Contains the versioned schema migrations and the runner that applies them.
+
+Each migration module exposes VERSION, DESCRIPTION and upgrade(connection).
+Applied versions are recorded in the schema_migrations table, so every
+migration runs exactly once per database, in order.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select
+
+from app.migrations import (
+    v0001_initial,
+    v0002_indexes,
+    v0003_refeicao_alimentos,
+    v0004_alimentos_catalogo,
+    v0005_versions,
+)
+
+# Ordered list of migration modules
+MIGRATIONS = [
+    v0001_initial,
+    v0002_indexes,
+    v0003_refeicao_alimentos,
+    v0004_alimentos_catalogo,
+    v0005_versions,
+]
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', String(32), primary_key=True),
+    Column('description', String(255)),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+
+def applied_versions(engine):
+    """Return the set of versions already applied to the database."""
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        return set(connection.scalars(select(schema_migrations.c.version)))
+
+
+def upgrade(engine):
+    """
+    Apply every pending migration, each in its own transaction.
+    
+    Args:
+        engine: SQLAlchemy engine of the target database
+        
+    Returns:
+        list: Versions applied by this call
+    """
+    done = applied_versions(engine)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.VERSION in done:
+            continue
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=migration.VERSION,
+                description=migration.DESCRIPTION,
+                applied_at=datetime.utcnow()
+            ))
+        applied.append(migration.VERSION)
+    return applied
+
+
+def pending_versions(engine):
+    """Return the versions not yet applied, in order."""
+    done = applied_versions(engine)
+    return [m.VERSION for m in MIGRATIONS if m.VERSION not in done]
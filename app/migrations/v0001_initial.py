@@ -0,0 +1,55 @@
+"""
+Initial schema: diets, meals, exercises and the denormalized diet counters.
+
+Tables are created only if missing, so databases created earlier by
+db.create_all() adopt the migration history without changes.
+The definitions are frozen here on purpose; later schema changes go in
+new migrations, not in this file.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+
+VERSION = '0001'
+DESCRIPTION = 'Esquema inicial'
+
+metadata = MetaData()
+
+Table(
+    'dietas', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('created_at', DateTime),
+    Column('meta', String(255), nullable=False),
+    Column('descricao', Text),
+)
+
+Table(
+    'refeicoes', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('created_at', DateTime),
+    Column('tipo_refeicao', String(100), nullable=False),
+    Column('quantidade', Integer, nullable=False),
+    Column('alimentos', JSON, nullable=False),
+    Column('dieta_id', Integer, ForeignKey('dietas.id', ondelete='CASCADE')),
+)
+
+Table(
+    'exercicios', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('created_at', DateTime),
+    Column('tipo_exercicio', String(100), nullable=False),
+    Column('quantidade_repeticoes', Integer, nullable=False),
+    Column('ciclos', Integer, nullable=False),
+    Column('pausa_entre_ciclos', Integer, nullable=False),
+    Column('dieta_id', Integer, ForeignKey('dietas.id', ondelete='CASCADE')),
+)
+
+Table(
+    'dieta_contadores', metadata,
+    Column('dieta_id', Integer, ForeignKey('dietas.id', ondelete='CASCADE'), primary_key=True),
+    Column('refeicoes_count', Integer, nullable=False, default=0),
+    Column('exercicios_count', Integer, nullable=False, default=0),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
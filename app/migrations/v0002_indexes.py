@@ -0,0 +1,44 @@
+"""
+Indexes for the foreign-key and filter columns.
+
+Covers the child lookups by diet (get_by_dieta, child counts, detail,
+exports and keyset pages filtered by dieta_id), the created_at export
+range and the filters by meal/exercise type.
+"""
+
+from sqlalchemy import Column, Index, Integer, MetaData, Table, DateTime, String
+
+VERSION = '0002'
+DESCRIPTION = 'Índices de dieta_id, created_at e tipo'
+
+metadata = MetaData()
+
+refeicoes = Table(
+    'refeicoes', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('created_at', DateTime),
+    Column('tipo_refeicao', String(100)),
+    Column('dieta_id', Integer),
+)
+
+exercicios = Table(
+    'exercicios', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('created_at', DateTime),
+    Column('tipo_exercicio', String(100)),
+    Column('dieta_id', Integer),
+)
+
+INDEXES = [
+    Index('ix_refeicoes_dieta_id', refeicoes.c.dieta_id),
+    Index('ix_refeicoes_created_at', refeicoes.c.created_at),
+    Index('ix_refeicoes_tipo_refeicao', refeicoes.c.tipo_refeicao),
+    Index('ix_exercicios_dieta_id', exercicios.c.dieta_id),
+    Index('ix_exercicios_created_at', exercicios.c.created_at),
+    Index('ix_exercicios_tipo_exercicio', exercicios.c.tipo_exercicio),
+]
+
+
+def upgrade(connection):
+    for index in INDEXES:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,93 @@
+"""
+Food catalog and meal/food links.
+
+Copies the food names of the refeicoes.alimentos JSON column into an
+interned catalog (alimentos, one row per distinct name, used by search)
+and a link table (refeicao_alimentos, one row per name of each meal: its
+position, catalog entry and the spelling given for that meal, repeated
+names included). The JSON column is dropped by 0004.
+"""
+
+from sqlalchemy import JSON, Column, ForeignKey, Index, Integer, MetaData, String, Table, insert, select
+
+VERSION = '0003'
+DESCRIPTION = 'Catálogo de alimentos e tabela refeicao_alimentos'
+
+BATCH_SIZE = 1000
+
+metadata = MetaData()
+
+refeicoes = Table(
+    'refeicoes', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('alimentos', JSON),
+)
+
+alimentos = Table(
+    'alimentos', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('nome', String(255), nullable=False),
+    Column('nome_normalizado', String(255), nullable=False),
+    Index('ux_alimentos_nome_normalizado', 'nome_normalizado', unique=True,
+          postgresql_ops={'nome_normalizado': 'varchar_pattern_ops'}),
+)
+
+refeicao_alimentos = Table(
+    'refeicao_alimentos', metadata,
+    Column('refeicao_id', Integer, ForeignKey('refeicoes.id', ondelete='CASCADE'), primary_key=True),
+    Column('posicao', Integer, primary_key=True),
+    Column('alimento_id', Integer, ForeignKey('alimentos.id'), nullable=False),
+    Column('nome', String(255), nullable=False),
+    Index('ix_refeicao_alimentos_alimento_id', 'alimento_id', 'refeicao_id'),
+)
+
+
+def _clean(nome):
+    # Frozen copy of Alimento.clean
+    return ' '.join(str(nome).split())
+
+
+def upgrade(connection):
+    alimentos.create(connection)
+    refeicao_alimentos.create(connection)
+    
+    ids = dict(connection.execute(select(alimentos.c.nome_normalizado, alimentos.c.id)).all())
+    
+    result = connection.execution_options(yield_per=BATCH_SIZE).execute(
+        select(refeicoes.c.id, refeicoes.c.alimentos)
+    )
+    for batch in result.partitions():
+        links = []
+        for refeicao_id, nomes in batch:
+            if isinstance(nomes, str):
+                nomes = [nomes]
+            entries = []
+            for nome in nomes or []:
+                nome = nome if isinstance(nome, str) else str(nome)
+                key = _clean(nome).lower()
+                if key:
+                    entries.append((key, nome))
+            links.append((refeicao_id, entries))
+        
+        new = {}
+        for _, entries in links:
+            for key, nome in entries:
+                if key not in ids:
+                    new.setdefault(key, _clean(nome))
+        if new:
+            connection.execute(
+                insert(alimentos),
+                [{'nome': nome, 'nome_normalizado': key} for key, nome in new.items()]
+            )
+            ids.update(connection.execute(
+                select(alimentos.c.nome_normalizado, alimentos.c.id)
+                .where(alimentos.c.nome_normalizado.in_(list(new)))
+            ).all())
+        
+        rows = [
+            {'refeicao_id': refeicao_id, 'posicao': posicao, 'alimento_id': ids[key], 'nome': nome}
+            for refeicao_id, entries in links
+            for posicao, (key, nome) in enumerate(entries)
+        ]
+        if rows:
+            connection.execute(insert(refeicao_alimentos), rows)
@@ -0,0 +1,15 @@
+"""
+Drop the refeicoes.alimentos JSON column.
+
+The food names live in the alimentos and refeicao_alimentos tables built
+by 0003.
+"""
+
+from sqlalchemy import text
+
+VERSION = '0004'
+DESCRIPTION = 'Remove a coluna JSON refeicoes.alimentos'
+
+
+def upgrade(connection):
+    connection.execute(text('ALTER TABLE refeicoes DROP COLUMN alimentos'))
@@ -0,0 +1,19 @@
+"""
+Row versions for optimistic concurrency.
+
+Adds a version column to refeicoes and exercicios, starting at 1. Every
+update increments it, and PATCH requests with If-Match only apply when
+the stored version still matches.
+"""
+
+from sqlalchemy import text
+
+VERSION = '0005'
+DESCRIPTION = 'Coluna version em refeicoes e exercicios'
+
+TABLES = ('refeicoes', 'exercicios')
+
+
+def upgrade(connection):
+    for table in TABLES:
+        connection.execute(text(f'ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
@@ -2,5 +2,10 @@ from app.models.base_model import BaseModel
 from app.models.dieta import Dieta
 from app.models.refeicao import Refeicao
 from app.models.exercicio import Exercicio
+from app.models.dieta_contador import DietaContador, register_counter_events
+from app.models.alimento import Alimento
+from app.models.refeicao_alimento import RefeicaoAlimento
 
-__all__ = ['BaseModel', 'Dieta', 'Refeicao', 'Exercicio']
+register_counter_events()
+
+__all__ = ['BaseModel', 'Dieta', 'Refeicao', 'Exercicio', 'DietaContador', 'Alimento', 'RefeicaoAlimento']
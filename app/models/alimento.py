@@ -0,0 +1,165 @@
+import difflib
+
+from sqlalchemy import insert
+from app import db
+
+
+class Alimento(db.Model):
+    __tablename__ = 'alimentos'
+    __table_args__ = (
+        # Interning key; pattern ops so prefix searches (LIKE 'x%') use it on PostgreSQL
+        db.Index('ux_alimentos_nome_normalizado', 'nome_normalizado', unique=True,
+                 postgresql_ops={'nome_normalizado': 'varchar_pattern_ops'}),
+    )
+
+    # Catalog of distinct food names, referenced by refeicao_alimentos
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # Name as first written (the meals keep their own spelling in refeicao_alimentos)
+    nome = db.Column(db.String(255), nullable=False)
+    # Lower-case, whitespace-collapsed name: one catalog row per key
+    nome_normalizado = db.Column(db.String(255), nullable=False)
+
+    # Search modes accepted by matching()
+    BUSCA_EXATA = 'exata'
+    BUSCA_PREFIXO = 'prefixo'
+    BUSCA_APROXIMADA = 'aproximada'
+    MODOS_BUSCA = (BUSCA_EXATA, BUSCA_PREFIXO, BUSCA_APROXIMADA)
+
+    # Fuzzy matching: maximum candidates and minimum similarity (0..1)
+    FUZZY_MAX_MATCHES = 10
+    FUZZY_CUTOFF = 0.75
+
+    @staticmethod
+    def clean(nome):
+        """Collapse the whitespace of a food name."""
+        return ' '.join(str(nome).split())
+
+    @classmethod
+    def normalize(cls, nome):
+        """Build the interning key of a food name."""
+        return cls.clean(nome).lower()
+
+    @classmethod
+    def entries(cls, nomes):
+        """
+        Pair each submitted name with its interning key, dropping blanks.
+
+        Spelling, order and repeated names are kept as given.
+
+        Returns:
+            list: (interning key, name as submitted) pairs
+        """
+        if isinstance(nomes, str):
+            nomes = [nomes]
+        entries = []
+        for nome in nomes or []:
+            if not isinstance(nome, str):
+                nome = str(nome)
+            key = cls.normalize(nome)
+            if key:
+                entries.append((key, nome))
+        return entries
+
+    @classmethod
+    def unique_names(cls, nomes):
+        """
+        Clean a list of names, dropping blanks and repeated keys (first one wins).
+
+        Returns:
+            dict: Interning key -> cleaned name, in input order
+        """
+        unique = {}
+        for key, nome in cls.entries(nomes):
+            unique.setdefault(key, cls.clean(nome))
+        return unique
+
+    @classmethod
+    def intern_ids(cls, nomes):
+        """
+        Return the catalog ids of the given names, adding the missing ones.
+
+        Runs at most three statements whatever the number of names: one
+        lookup, one insert of the new names (ignoring rows a concurrent
+        writer added first) and one lookup of the new ids.
+
+        Args:
+            nomes: Iterable of food names
+
+        Returns:
+            dict: Interning key -> catalog id, in input order
+        """
+        unique = cls.unique_names(list(nomes))
+        if not unique:
+            return {}
+
+        ids = cls._lookup(unique)
+        missing = [key for key in unique if key not in ids]
+        if missing:
+            db.session.execute(
+                cls._insert_ignore(),
+                [{'nome': unique[key], 'nome_normalizado': key} for key in missing]
+            )
+            ids.update(cls._lookup(missing))
+        return {key: ids[key] for key in unique}
+
+    @classmethod
+    def _lookup(cls, keys):
+        """Map interning keys to ids with a single IN query."""
+        return dict(db.session.execute(
+            db.select(cls.nome_normalizado, cls.id).where(cls.nome_normalizado.in_(list(keys)))
+        ).all())
+
+    @classmethod
+    def _insert_ignore(cls):
+        """INSERT that skips names already present (where the dialect supports it)."""
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return insert(cls)
+        return dialect_insert(cls).on_conflict_do_nothing(index_elements=['nome_normalizado'])
+
+    @classmethod
+    def matching(cls, termo, modo=BUSCA_EXATA):
+        """
+        Build a SELECT of the catalog ids matching a search term.
+
+        Args:
+            termo: Food name (or prefix) to search for
+            modo: 'exata', 'prefixo' or 'aproximada'
+
+        Returns:
+            Select of alimento ids, usable in an IN clause
+        """
+        termo = cls.normalize(termo)
+        stmt = db.select(cls.id)
+
+        if modo == cls.BUSCA_PREFIXO:
+            if db.session.get_bind().dialect.name == 'sqlite':
+                # SQLite only uses the index for LIKE on NOCASE columns; an
+                # equivalent range over the binary collation does use it
+                return stmt.where(cls.nome_normalizado >= termo, cls.nome_normalizado < termo + '\U0010ffff')
+            return stmt.where(cls.nome_normalizado.startswith(termo, autoescape=True))
+
+        if modo == cls.BUSCA_APROXIMADA:
+            # Similarity is computed in Python over the catalog keys (one row
+            # per distinct food), then the matches are looked up by equality
+            keys = db.session.scalars(db.select(cls.nome_normalizado)).all()
+            candidatos = difflib.get_close_matches(
+                termo, keys, n=cls.FUZZY_MAX_MATCHES, cutoff=cls.FUZZY_CUTOFF
+            )
+            return stmt.where(cls.nome_normalizado.in_(candidatos))
+
+        return stmt.where(cls.nome_normalizado == termo)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'nome': self.nome
+        }
+
+    def __repr__(self):
+        """String representation of the food."""
+        return f'<Alimento id={self.id} nome="{self.nome}">'
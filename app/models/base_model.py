@@ -1,3 +1,5 @@
+import base64
+import json
 from datetime import datetime
 from app import db
 class BaseModel(db.Model):    
@@ -19,7 +21,7 @@ class BaseModel(db.Model):
         db.session.delete(self)
         db.session.commit()
     
-    def update(self, **kwargs)
+    def update(self, **kwargs):
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
@@ -27,18 +29,57 @@ class BaseModel(db.Model):
         return self
     
     def to_dict(self):
-        created_at_str = None
-        if self.created_at is not None:
-            try:
-                created_at_str = self.created_at.isoformat()
-            except AttributeError:
-                created_at_str = str(self.created_at)
-        
         return {
             'id': self.id,
-            'created_at': created_at_str
+            'created_at': self.format_datetime(self.created_at)
         }
     
+    @staticmethod
+    def format_datetime(value):
+        """Format a datetime as ISO 8601 (None stays None)."""
+        if value is None:
+            return None
+        try:
+            return value.isoformat()
+        except AttributeError:
+            return str(value)
+    
+    @classmethod
+    def patch(cls, id, values, version=None, where=()):
+        """
+        Update one row with a single UPDATE ... RETURNING, bumping its version
+        (models with a version column).
+
+        Nothing is read before the write: existence, the expected version
+        and any extra criteria are part of the WHERE clause. Only a failed
+        update reads the row's current version to tell the cases apart.
+
+        Args:
+            id: Row ID
+            values: Dictionary of column -> new value
+            version: Expected version (If-Match), None for an unconditional update
+            where: Extra criteria the row must satisfy
+
+        Returns:
+            tuple: (updated row mapping or None, current version or None);
+            (None, None) means the row does not exist
+        """
+        table = cls.__table__
+        criteria = [table.c.id == id, *where]
+        if version is not None:
+            criteria.append(table.c.version == version)
+        stmt = db.update(table).where(*criteria).values(**values, version=table.c.version + 1)
+
+        if db.session.get_bind().dialect.update_returning:
+            row = db.session.execute(stmt.returning(*table.c)).mappings().first()
+        else:
+            updated = db.session.execute(stmt).rowcount
+            row = db.session.execute(db.select(table).where(table.c.id == id)).mappings().first() if updated else None
+
+        if row is not None:
+            return row, None
+        return None, db.session.scalar(db.select(table.c.version).where(table.c.id == id))
+
     @classmethod
     def get_by_id(cls, id):
         return cls.query.get(id)
@@ -47,6 +88,65 @@ class BaseModel(db.Model):
     def get_all(cls):
         return cls.query.all()
     
+    @classmethod
+    def encode_cursor(cls, last_id):
+        """Build the opaque cursor that points just after the given id."""
+        raw = json.dumps({'id': last_id}).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+    
+    @classmethod
+    def decode_cursor(cls, cursor):
+        """
+        Decode an opaque cursor back into the last seen id.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            last_id = int(data['id'])
+        except (TypeError, KeyError, ValueError, UnicodeError, AttributeError):
+            raise ValueError('Cursor inválido')
+        return last_id
+    
+    @classmethod
+    def get_page(cls, limit, cursor=None, query=None):
+        """
+        Fetch one page using keyset pagination on id.
+        
+        Ids are autoincrement, so the order also follows creation order.
+        Only limit + 1 rows are read, whatever the table size. The query
+        may return model instances or plain rows whose first value is the id.
+        
+        Args:
+            limit: Maximum number of rows in the page
+            cursor: Opaque cursor returned by the previous page (optional)
+            query: Base query to paginate (default: cls.query)
+            
+        Returns:
+            tuple: (list of rows, next cursor or None)
+        """
+        if query is None:
+            query = cls.query
+        if cursor:
+            query = query.filter(cls.id > cls.decode_cursor(cursor))
+        
+        rows = query.order_by(cls.id).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        last = rows[-1]
+        last_id = last.id if isinstance(last, cls) else last[0]
+        return rows, cls.encode_cursor(last_id)
+    
+    @classmethod
+    def count_all(cls, query=None):
+        """Count rows with a separate COUNT query."""
+        if query is None:
+            query = cls.query
+        return query.order_by(None).count()
+    
     def __repr__(self):
         """String representation of the model."""
         return f'<{self.__class__.__name__} id={self.id}>'
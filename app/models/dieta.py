@@ -1,3 +1,6 @@
+from itertools import groupby
+
+from sqlalchemy import func
 from app.models.base_model import BaseModel
 from app import db
 class Dieta(BaseModel):    
@@ -7,18 +10,21 @@ class Dieta(BaseModel):
     meta = db.Column(db.String(255), nullable=False)
     descricao = db.Column(db.Text)
     
-    # Relationships - bidirectional
+    # Relationships - bidirectional. Children are removed by delete_many()
+    # with set-based statements, never loaded one by one (passive_deletes)
     refeicoes = db.relationship(
         'Refeicao',
         backref='dieta',
         lazy='dynamic',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
     )
     exercicios = db.relationship(
         'Exercicio',
         backref='dieta',
         lazy='dynamic',
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
     )
     
     def __init__(self, meta, descricao=None, **kwargs):
@@ -59,6 +65,249 @@ class Dieta(BaseModel):
         
         return data
     
+    def delete(self):
+        """Delete the diet and its children (see delete_many)."""
+        self.delete_many([self.id])
+    
+    @classmethod
+    def delete_many(cls, ids):
+        """
+        Delete diets with their meals, the meals' food links, exercises and
+        counters, using one DELETE per table in a single transaction.
+        
+        Children are removed explicitly (SQLite does not enforce the ON
+        DELETE CASCADE of the foreign keys) and never loaded into the
+        session, so the cost does not grow with ORM objects per child.
+        
+        Args:
+            ids: Diet IDs
+            
+        Returns:
+            dict: Deleted 'dieta_ids', 'refeicao_ids' and 'exercicio_ids'
+        """
+        from app.models.refeicao import Refeicao
+        from app.models.exercicio import Exercicio
+        from app.models.refeicao_alimento import RefeicaoAlimento
+        from app.models.dieta_contador import DietaContador
+        
+        ids = sorted(set(ids))
+        deleted = {'dieta_ids': [], 'refeicao_ids': [], 'exercicio_ids': []}
+        if not ids:
+            return deleted
+        
+        def delete_returning(model, *criteria):
+            stmt = db.delete(model).where(*criteria).execution_options(synchronize_session=False)
+            if db.session.get_bind().dialect.delete_returning:
+                return list(db.session.scalars(stmt.returning(model.id)))
+            returned = list(db.session.scalars(db.select(model.id).where(*criteria)))
+            db.session.execute(stmt)
+            return returned
+        
+        try:
+            refeicoes = db.select(Refeicao.id).where(Refeicao.dieta_id.in_(ids))
+            db.session.execute(
+                db.delete(RefeicaoAlimento)
+                .where(RefeicaoAlimento.refeicao_id.in_(refeicoes))
+                .execution_options(synchronize_session=False)
+            )
+            deleted['refeicao_ids'] = delete_returning(Refeicao, Refeicao.dieta_id.in_(ids))
+            deleted['exercicio_ids'] = delete_returning(Exercicio, Exercicio.dieta_id.in_(ids))
+            db.session.execute(
+                db.delete(DietaContador)
+                .where(DietaContador.dieta_id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            deleted['dieta_ids'] = sorted(delete_returning(cls, cls.id.in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return deleted
+    
+    @classmethod
+    def get_all_with_counts(cls):
+        """
+        Fetch all diets together with their child counts in a single query.
+        
+        Returns:
+            list: Rows of the diet columns followed by refeicoes_count, exercicios_count
+        """
+        return cls.query_with_counts().order_by(cls.id).all()
+    
+    @classmethod
+    def query_with_counts(cls):
+        """
+        Build the query selecting diet rows together with their child counts.
+        
+        Selects plain columns (see dieta_list_serializer), not ORM objects.
+        Uses the denormalized counters table when DIETA_DENORMALIZED_COUNTS
+        is enabled, otherwise joins grouped COUNT subqueries.
+        """
+        from app.models.dieta_contador import DietaContador
+        from app.serializers import dieta_list_serializer
+        
+        if DietaContador.enabled():
+            query = dieta_list_serializer.query(
+                func.coalesce(DietaContador.refeicoes_count, 0),
+                func.coalesce(DietaContador.exercicios_count, 0)
+            ).outerjoin(DietaContador, DietaContador.dieta_id == cls.id)
+            return query
+        
+        from app.models.refeicao import Refeicao
+        from app.models.exercicio import Exercicio
+        
+        refeicoes = db.session.query(
+            Refeicao.dieta_id.label('dieta_id'),
+            func.count(Refeicao.id).label('total')
+        ).group_by(Refeicao.dieta_id).subquery()
+        exercicios = db.session.query(
+            Exercicio.dieta_id.label('dieta_id'),
+            func.count(Exercicio.id).label('total')
+        ).group_by(Exercicio.dieta_id).subquery()
+        
+        query = dieta_list_serializer.query(
+            func.coalesce(refeicoes.c.total, 0),
+            func.coalesce(exercicios.c.total, 0)
+        ).outerjoin(
+            refeicoes, refeicoes.c.dieta_id == cls.id
+        ).outerjoin(
+            exercicios, exercicios.c.dieta_id == cls.id
+        )
+        return query
+    
+    @classmethod
+    def get_detail(cls, id):
+        """
+        Load a diet with its meals and exercises as plain dictionaries.
+        
+        Runs two statements (diet LEFT JOIN meals LEFT JOIN their food
+        links, then exercises) on the Core tables and serializes straight
+        from the result rows, so no ORM objects are created. The output
+        matches to_dict(include_relations=True).
+        
+        Args:
+            id: Diet ID
+            
+        Returns:
+            dict: Diet data with 'refeicoes' and 'exercicios', or None if not found
+        """
+        from app.models.refeicao import Refeicao
+        from app.models.exercicio import Exercicio
+        from app.models.refeicao_alimento import RefeicaoAlimento
+        from app.serializers import dieta_serializer, refeicao_serializer, exercicio_serializer
+        
+        # Diet columns first, then the meal columns, then one food name per
+        # row: a meal spans as many rows as it has foods, in position order
+        split = len(dieta_serializer.columns)
+        end = split + len(refeicao_serializer.columns)
+        rows = db.session.execute(
+            db.select(*dieta_serializer.columns, *refeicao_serializer.columns, RefeicaoAlimento.nome)
+            .select_from(
+                cls.__table__
+                .outerjoin(Refeicao.__table__, Refeicao.dieta_id == cls.id)
+                .outerjoin(RefeicaoAlimento.__table__, RefeicaoAlimento.refeicao_id == Refeicao.id)
+            )
+            .where(cls.id == id)
+            .order_by(Refeicao.id, RefeicaoAlimento.posicao)
+        ).all()
+        if not rows:
+            return None
+        
+        data = dieta_serializer.from_row(rows[0][:split])
+        data['refeicoes'] = []
+        for refeicao_id, group in groupby(rows, key=lambda row: row[split]):
+            if refeicao_id is None:
+                continue
+            group = list(group)
+            nomes = [row[end] for row in group if row[end] is not None]
+            data['refeicoes'].append(refeicao_serializer.from_row_with_names(group[0][split:end], nomes))
+        data['exercicios'] = exercicio_serializer.from_rows(db.session.execute(
+            db.select(*exercicio_serializer.columns)
+            .where(Exercicio.dieta_id == id)
+            .order_by(Exercicio.id)
+        ))
+        return data
+    
+    @classmethod
+    def get_summaries(cls, ids):
+        """
+        Compute the totals of many diets with grouped aggregate queries.
+        
+        Four statements whatever the number of diets (existence, meals per
+        type, food frequency, exercise totals); only the aggregated rows are
+        transferred, never the meals or exercises themselves.
+        
+        Args:
+            ids: Diet IDs
+            
+        Returns:
+            dict: Diet ID -> summary dictionary, for the diets that exist
+        """
+        from app.models.refeicao import Refeicao
+        from app.models.exercicio import Exercicio
+        from app.models.alimento import Alimento
+        from app.models.refeicao_alimento import RefeicaoAlimento
+        
+        ids = list(ids)
+        if not ids:
+            return {}
+        
+        summaries = {
+            id: {
+                'dieta_id': id,
+                'refeicoes': {'total': 0, 'quantidade_total': 0, 'por_tipo': []},
+                'alimentos': [],
+                'exercicios': {'total': 0, 'repeticoes_totais': 0, 'pausa_total': 0}
+            }
+            for id in db.session.scalars(db.select(cls.id).where(cls.id.in_(ids)).order_by(cls.id))
+        }
+        if not summaries:
+            return summaries
+        
+        # Meal quantity and count per type
+        for dieta_id, tipo, quantidade, total in db.session.execute(
+            db.select(
+                Refeicao.dieta_id, Refeicao.tipo_refeicao,
+                func.coalesce(func.sum(Refeicao.quantidade), 0), func.count()
+            )
+            .where(Refeicao.dieta_id.in_(summaries))
+            .group_by(Refeicao.dieta_id, Refeicao.tipo_refeicao)
+            .order_by(Refeicao.dieta_id, Refeicao.tipo_refeicao)
+        ):
+            refeicoes = summaries[dieta_id]['refeicoes']
+            refeicoes['por_tipo'].append({'tipo_refeicao': tipo, 'quantidade': quantidade, 'refeicoes': total})
+            refeicoes['total'] += total
+            refeicoes['quantidade_total'] += quantidade
+        
+        # How many meals of the diet contain each food
+        frequencia = func.count(RefeicaoAlimento.refeicao_id.distinct()).label('frequencia')
+        for dieta_id, nome, total in db.session.execute(
+            db.select(Refeicao.dieta_id, Alimento.nome, frequencia)
+            .select_from(RefeicaoAlimento)
+            .join(Refeicao, Refeicao.id == RefeicaoAlimento.refeicao_id)
+            .join(Alimento, Alimento.id == RefeicaoAlimento.alimento_id)
+            .where(Refeicao.dieta_id.in_(summaries))
+            .group_by(Refeicao.dieta_id, Alimento.id, Alimento.nome)
+            .order_by(Refeicao.dieta_id, frequencia.desc(), Alimento.nome)
+        ):
+            summaries[dieta_id]['alimentos'].append({'nome': nome, 'frequencia': total})
+        
+        # Exercise count, repetitions over all cycles and rest time
+        for dieta_id, total, repeticoes, pausa in db.session.execute(
+            db.select(
+                Exercicio.dieta_id, func.count(),
+                func.coalesce(func.sum(Exercicio.total_repetitions_expr()), 0),
+                func.coalesce(func.sum(Exercicio.total_duration_expr()), 0)
+            )
+            .where(Exercicio.dieta_id.in_(summaries))
+            .group_by(Exercicio.dieta_id)
+        ):
+            summaries[dieta_id]['exercicios'] = {
+                'total': total, 'repeticoes_totais': repeticoes, 'pausa_total': pausa
+            }
+        
+        return summaries
+    
     def add_refeicao(self, refeicao):
         self.refeicoes.append(refeicao)
         db.session.commit()
@@ -0,0 +1,134 @@
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, insert, update
+from app import db
+
+
+class DietaContador(db.Model):
+    __tablename__ = 'dieta_contadores'
+
+    # One row per diet, kept current by the mapper events below
+    dieta_id = db.Column(
+        db.Integer,
+        db.ForeignKey('dietas.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    refeicoes_count = db.Column(db.Integer, nullable=False, default=0)
+    exercicios_count = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def enabled():
+        """Check whether the denormalized counter mode is active."""
+        return has_app_context() and current_app.config.get('DIETA_DENORMALIZED_COUNTS', False)
+
+    @classmethod
+    def adjust(cls, connection, dieta_id, refeicoes=0, exercicios=0):
+        """Apply a delta to the counters of a diet on the given connection."""
+        if dieta_id is None or (refeicoes == 0 and exercicios == 0):
+            return
+        connection.execute(
+            update(cls.__table__)
+            .where(cls.__table__.c.dieta_id == dieta_id)
+            .values(
+                refeicoes_count=cls.__table__.c.refeicoes_count + refeicoes,
+                exercicios_count=cls.__table__.c.exercicios_count + exercicios
+            )
+        )
+
+    @classmethod
+    def adjust_many(cls, connection, dieta_ids, field):
+        """Increment a counter once per occurrence of each diet id (bulk inserts)."""
+        deltas = {}
+        for dieta_id in dieta_ids:
+            if dieta_id is not None:
+                deltas[dieta_id] = deltas.get(dieta_id, 0) + 1
+        for dieta_id, delta in deltas.items():
+            cls.adjust(connection, dieta_id, **{field: delta})
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every counter from the child tables with one INSERT ... SELECT."""
+        from app.models.dieta import Dieta
+        from app.models.refeicao import Refeicao
+        from app.models.exercicio import Exercicio
+
+        refeicoes = (
+            db.select(func.count(Refeicao.id))
+            .where(Refeicao.dieta_id == Dieta.id)
+            .scalar_subquery()
+        )
+        exercicios = (
+            db.select(func.count(Exercicio.id))
+            .where(Exercicio.dieta_id == Dieta.id)
+            .scalar_subquery()
+        )
+
+        db.session.execute(db.delete(cls))
+        db.session.execute(
+            insert(cls).from_select(
+                ['dieta_id', 'refeicoes_count', 'exercicios_count'],
+                db.select(Dieta.id, refeicoes, exercicios)
+            )
+        )
+        db.session.commit()
+
+    def __repr__(self):
+        """String representation of the counters."""
+        return (f'<DietaContador dieta_id={self.dieta_id} '
+                f'refeicoes={self.refeicoes_count} exercicios={self.exercicios_count}>')
+
+
+def _child_counter_events(model, field):
+    """Register insert/delete/re-parent events that keep a child counter current."""
+
+    @event.listens_for(model, 'after_insert')
+    def after_insert(mapper, connection, target):
+        if DietaContador.enabled():
+            DietaContador.adjust(connection, target.dieta_id, **{field: 1})
+
+    @event.listens_for(model, 'after_delete')
+    def after_delete(mapper, connection, target):
+        if DietaContador.enabled():
+            DietaContador.adjust(connection, target.dieta_id, **{field: -1})
+
+    @event.listens_for(model, 'after_update')
+    def after_update(mapper, connection, target):
+        if not DietaContador.enabled():
+            return
+        history = db.inspect(target).attrs.dieta_id.history
+        if not history.has_changes():
+            return
+        for old_id in history.deleted:
+            DietaContador.adjust(connection, old_id, **{field: -1})
+        for new_id in history.added:
+            DietaContador.adjust(connection, new_id, **{field: 1})
+
+
+def register_counter_events():
+    """Attach the counter events to the diet and child models (idempotent)."""
+    from app.models.dieta import Dieta
+    from app.models.refeicao import Refeicao
+    from app.models.exercicio import Exercicio
+
+    if getattr(register_counter_events, '_registered', False):
+        return
+    register_counter_events._registered = True
+
+    @event.listens_for(Dieta, 'after_insert')
+    def dieta_after_insert(mapper, connection, target):
+        if DietaContador.enabled():
+            connection.execute(
+                insert(DietaContador.__table__).values(
+                    dieta_id=target.id, refeicoes_count=0, exercicios_count=0
+                )
+            )
+
+    @event.listens_for(Dieta, 'after_delete')
+    def dieta_after_delete(mapper, connection, target):
+        if DietaContador.enabled():
+            connection.execute(
+                db.delete(DietaContador.__table__)
+                .where(DietaContador.__table__.c.dieta_id == target.id)
+            )
+
+    _child_counter_events(Refeicao, 'refeicoes')
+    _child_counter_events(Exercicio, 'exercicios')
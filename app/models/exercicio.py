@@ -1,9 +1,16 @@
+from sqlalchemy import case
 from app.models.base_model import BaseModel
 from app import db
 
 
 class Exercicio(BaseModel):    
     __tablename__ = 'exercicios'
+    __table_args__ = (
+        # Created by migration 0002 (child lookups, export ranges, type filters)
+        db.Index('ix_exercicios_dieta_id', 'dieta_id'),
+        db.Index('ix_exercicios_created_at', 'created_at'),
+        db.Index('ix_exercicios_tipo_exercicio', 'tipo_exercicio'),
+    )
     
     # Exercise attributes
     tipo_exercicio = db.Column(db.String(100), nullable=False)
@@ -14,6 +21,11 @@ class Exercicio(BaseModel):
     # Foreign key relationship
     dieta_id = db.Column(db.Integer, db.ForeignKey('dietas.id', ondelete='CASCADE'))
     
+    # Row version (migration 0005): bumped by every update, checked by
+    # ORM flushes and by PATCH with If-Match
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
+    
     def __init__(self, tipo_exercicio, quantidade_repeticoes, ciclos, pausa_entre_ciclos, dieta_id=None, **kwargs):
         super(Exercicio, self).__init__(**kwargs)
         self.tipo_exercicio = tipo_exercicio
@@ -61,7 +73,8 @@ class Exercicio(BaseModel):
             'quantidade_repeticoes': self.quantidade_repeticoes,
             'ciclos': self.ciclos,
             'pausa_entre_ciclos': self.pausa_entre_ciclos,
-            'dieta_id': self.dieta_id
+            'dieta_id': self.dieta_id,
+            'version': self.version
         })
         return data
     
@@ -70,6 +83,19 @@ class Exercicio(BaseModel):
             return (self.ciclos - 1) * self.pausa_entre_ciclos
         return 0
     
+    @classmethod
+    def total_duration_expr(cls):
+        """SQL expression of get_total_duration (for aggregates)."""
+        return case(
+            (cls.ciclos > 0, (cls.ciclos - 1) * cls.pausa_entre_ciclos),
+            else_=0
+        )
+    
+    @classmethod
+    def total_repetitions_expr(cls):
+        """SQL expression of the repetitions over all cycles."""
+        return cls.quantidade_repeticoes * cls.ciclos
+    
     @classmethod
     def get_by_dieta(cls, dieta_id):
         return cls.query.filter_by(dieta_id=dieta_id).all()
@@ -1,20 +1,40 @@
-from sqlalchemy import JSON
+from sqlalchemy import inspect
+
 from app.models.base_model import BaseModel
+from app.models.alimento import Alimento
+from app.models.refeicao_alimento import RefeicaoAlimento
 from app import db
 
 
 class Refeicao(BaseModel):
     __tablename__ = 'refeicoes'
+    __table_args__ = (
+        # Created by migration 0002 (child lookups, export ranges, type filters)
+        db.Index('ix_refeicoes_dieta_id', 'dieta_id'),
+        db.Index('ix_refeicoes_created_at', 'created_at'),
+        db.Index('ix_refeicoes_tipo_refeicao', 'tipo_refeicao'),
+    )
     
     # Meal attributes
     tipo_refeicao = db.Column(db.String(100), nullable=False)
     quantidade = db.Column(db.Integer, nullable=False)
-    # Use JSON type for compatibility with both SQLite and PostgreSQL
-    alimentos = db.Column(JSON, nullable=False)
     
     # Foreign key relationship
     dieta_id = db.Column(db.Integer, db.ForeignKey('dietas.id', ondelete='CASCADE'))
     
+    # Row version (migration 0005): bumped by every update, checked by
+    # ORM flushes and by PATCH with If-Match
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    __mapper_args__ = {'version_id_col': version}
+    
+    # Foods, as links to the interned catalog (exposed as a name list by 'alimentos')
+    itens = db.relationship(
+        'RefeicaoAlimento',
+        order_by='RefeicaoAlimento.posicao',
+        cascade='all, delete-orphan',
+        lazy='selectin'
+    )
+    
     # Valid meal types
     TIPOS_VALIDOS = ['café da manhã', 'almoço', 'jantar', 'lanche', 'ceia', 'pré-treino', 'pós-treino']
     
@@ -22,9 +42,33 @@ class Refeicao(BaseModel):
         super(Refeicao, self).__init__(**kwargs)
         self.tipo_refeicao = tipo_refeicao
         self.quantidade = quantidade
-        self.alimentos = alimentos if isinstance(alimentos, list) else [alimentos]
+        self.alimentos = alimentos
         self.dieta_id = dieta_id
     
+    @property
+    def alimentos(self):
+        """Get the food names, in order."""
+        return [item.nome for item in self.itens]
+    
+    @alimentos.setter
+    def alimentos(self, value):
+        """Replace the foods, keeping each name as given and interning new ones in the catalog."""
+        entries = Alimento.entries(value)
+        if inspect(self).persistent and [item.nome for item in self.itens] != [nome for _, nome in entries]:
+            # The links live in another table, so the row itself may not be
+            # updated: bump the version explicitly for If-Match writers
+            self.version = self.version + 1
+        ids = Alimento.intern_ids(nome for _, nome in entries)
+        # Links are keyed by position: reuse the current rows, add or drop the tail
+        itens = list(self.itens)
+        for posicao, (key, nome) in enumerate(entries):
+            if posicao < len(itens):
+                itens[posicao].alimento_id = ids[key]
+                itens[posicao].nome = nome
+            else:
+                itens.append(RefeicaoAlimento(posicao=posicao, alimento_id=ids[key], nome=nome))
+        self.itens = itens[:len(entries)]
+    
     def get_tipo_refeicao(self):
         """Get the meal type (encapsulation)."""
         return self.tipo_refeicao
@@ -47,7 +91,7 @@ class Refeicao(BaseModel):
     
     def set_alimentos(self, value):
         """Set the list of foods (encapsulation)."""
-        self.alimentos = value if isinstance(value, list) else [value]
+        self.alimentos = value
     
     def to_dict(self):
         data = super().to_dict()
@@ -55,20 +99,21 @@ class Refeicao(BaseModel):
             'tipo_refeicao': self.tipo_refeicao,
             'quantidade': self.quantidade,
             'alimentos': self.alimentos,
-            'dieta_id': self.dieta_id
+            'dieta_id': self.dieta_id,
+            'version': self.version
         })
         return data
     
     def add_alimento(self, alimento):
-        if self.alimentos is None:
-            self.alimentos = []
-        if alimento not in self.alimentos:
-            self.alimentos = self.alimentos + [alimento]
+        """Append a food (a single link row; the catalog entry is reused or created)."""
+        if RefeicaoAlimento.attach([self.id], [alimento]):
+            self.version = self.version + 1
             db.session.commit()
     
     def remove_alimento(self, alimento):
-        if self.alimentos and alimento in self.alimentos:
-            self.alimentos = [a for a in self.alimentos if a != alimento]
+        """Remove a food (its link rows; the catalog entry is kept)."""
+        if RefeicaoAlimento.detach([self.id], [alimento]):
+            self.version = self.version + 1
             db.session.commit()
     
     @classmethod
@@ -0,0 +1,189 @@
+from itertools import groupby
+
+from sqlalchemy import func, insert
+from app import db
+from app.models.alimento import Alimento
+
+
+class RefeicaoAlimento(db.Model):
+    __tablename__ = 'refeicao_alimentos'
+    __table_args__ = (
+        # Reverse lookup: meals containing a food, and per-food aggregates
+        db.Index('ix_refeicao_alimentos_alimento_id', 'alimento_id', 'refeicao_id'),
+    )
+
+    # One row per name of the meal, in order; repeated foods get one row each
+    refeicao_id = db.Column(
+        db.Integer,
+        db.ForeignKey('refeicoes.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    posicao = db.Column(db.Integer, primary_key=True)
+    alimento_id = db.Column(db.Integer, db.ForeignKey('alimentos.id'), nullable=False)
+    # Name as submitted for this meal (the catalog keeps one spelling per food)
+    nome = db.Column(db.String(255), nullable=False)
+
+    alimento = db.relationship('Alimento')
+
+    @classmethod
+    def nomes_por_refeicao(cls, refeicao_ids=None):
+        """
+        Load the food names of many meals with one query.
+
+        Args:
+            refeicao_ids: Meal IDs to load (None: every meal)
+
+        Returns:
+            dict: Meal ID -> list of names, in order
+        """
+        stmt = db.select(cls.refeicao_id, cls.nome).order_by(cls.refeicao_id, cls.posicao)
+        if refeicao_ids is not None:
+            refeicao_ids = list(refeicao_ids)
+            if not refeicao_ids:
+                return {}
+            stmt = stmt.where(cls.refeicao_id.in_(refeicao_ids))
+
+        rows = db.session.execute(stmt)
+        return {
+            refeicao_id: [nome for _, nome in group]
+            for refeicao_id, group in groupby(rows, key=lambda row: row[0])
+        }
+
+    @classmethod
+    def attach(cls, refeicao_ids, nomes):
+        """
+        Add foods to many meals at once, skipping the foods a meal already has.
+
+        Set-based: the names are interned together, the current links and
+        last positions are read with one query each, and the new links are
+        written with one multi-row INSERT.
+
+        Args:
+            refeicao_ids: Meal IDs
+            nomes: Food names to add to every meal
+
+        Returns:
+            int: Number of (meal, food) links added
+        """
+        unique = {}
+        for key, nome in Alimento.entries(nomes):
+            unique.setdefault(key, nome)
+        refeicao_ids = list(refeicao_ids)
+        ids = Alimento.intern_ids(unique.values())
+        if not ids or not refeicao_ids:
+            return 0
+
+        existing = set(db.session.execute(
+            db.select(cls.refeicao_id, cls.alimento_id)
+            .where(cls.refeicao_id.in_(refeicao_ids), cls.alimento_id.in_(ids.values()))
+        ).all())
+        return cls._append([
+            (refeicao_id, [
+                (ids[key], nome) for key, nome in unique.items() if (refeicao_id, ids[key]) not in existing
+            ])
+            for refeicao_id in refeicao_ids
+        ])
+
+    @classmethod
+    def attach_pairs(cls, pairs):
+        """
+        Append foods to meals given (refeicao_id, names) pairs (e.g. a bulk create).
+
+        Every name is kept, with its spelling and order, repeated names included.
+
+        Returns:
+            int: Number of links added
+        """
+        pairs = [(refeicao_id, Alimento.entries(nomes)) for refeicao_id, nomes in pairs]
+        ids = Alimento.intern_ids(nome for _, entries in pairs for _, nome in entries)
+        if not ids:
+            return 0
+        return cls._append([
+            (refeicao_id, [(ids[key], nome) for key, nome in entries])
+            for refeicao_id, entries in pairs
+        ])
+
+    @classmethod
+    def _append(cls, links):
+        """
+        Insert links after each meal's last position (one query, one INSERT).
+
+        Args:
+            links: (refeicao_id, list of (alimento_id, name)) pairs
+
+        Returns:
+            int: Number of links added
+        """
+        links = [(refeicao_id, items) for refeicao_id, items in links if items]
+        if not links:
+            return 0
+
+        next_position = dict(db.session.execute(
+            db.select(cls.refeicao_id, func.max(cls.posicao) + 1)
+            .where(cls.refeicao_id.in_({refeicao_id for refeicao_id, _ in links}))
+            .group_by(cls.refeicao_id)
+        ).all())
+
+        rows = []
+        for refeicao_id, items in links:
+            position = next_position.get(refeicao_id, 0)
+            for alimento_id, nome in items:
+                rows.append({'refeicao_id': refeicao_id, 'posicao': position, 'alimento_id': alimento_id, 'nome': nome})
+                position += 1
+            next_position[refeicao_id] = position
+
+        db.session.execute(insert(cls), rows)
+        return len(rows)
+
+    @classmethod
+    def replace(cls, refeicao_id, nomes):
+        """
+        Replace the foods of one meal (one DELETE, then attach_pairs).
+
+        Returns:
+            list: The meal's food names, in order
+        """
+        db.session.execute(
+            db.delete(cls).where(cls.refeicao_id == refeicao_id).execution_options(synchronize_session=False)
+        )
+        cls.attach_pairs([(refeicao_id, nomes)])
+        return [nome for _, nome in Alimento.entries(nomes)]
+
+    @classmethod
+    def detach(cls, refeicao_ids, nomes):
+        """
+        Remove foods from many meals with one DELETE.
+
+        Args:
+            refeicao_ids: Meal IDs
+            nomes: Food names to remove from every meal
+
+        Returns:
+            int: Number of links removed (every repetition of a food)
+        """
+        keys = list(Alimento.unique_names(nomes))
+        refeicao_ids = list(refeicao_ids)
+        if not keys or not refeicao_ids:
+            return 0
+
+        result = db.session.execute(
+            db.delete(cls)
+            .where(cls.refeicao_id.in_(refeicao_ids))
+            .where(cls.alimento_id.in_(
+                db.select(Alimento.id).where(Alimento.nome_normalizado.in_(keys))
+            ))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    @classmethod
+    def refeicao_ids_matching(cls, termo, modo=Alimento.BUSCA_EXATA):
+        """Build a SELECT of the meal ids containing a food matching the search term."""
+        return (
+            db.select(cls.refeicao_id)
+            .where(cls.alimento_id.in_(Alimento.matching(termo, modo)))
+        )
+
+    def __repr__(self):
+        """String representation of the meal/food link."""
+        return f'<RefeicaoAlimento refeicao_id={self.refeicao_id} posicao={self.posicao} nome="{self.nome}">'
@@ -0,0 +1,103 @@
+"""
+Pool Module
+Contains the instrumented connection pool and its metrics.
+
+InstrumentedQueuePool is a QueuePool that records how many checkouts it
+served, how long callers waited for a connection (queueing when every
+pooled and overflow connection is in use) and how many waits timed out.
+"""
+
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters of one connection pool.
+    """
+
+    def __init__(self):
+        """Constructor for PoolMetrics."""
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def record_checkout(self, waited):
+        """Record a served checkout and the seconds it waited."""
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+
+    def record_timeout(self, waited):
+        """Record a checkout that gave up after pool_timeout."""
+        with self._lock:
+            self._timeouts += 1
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+
+    def snapshot(self):
+        """Return the counters as a dictionary."""
+        with self._lock:
+            checkouts, timeouts = self._checkouts, self._timeouts
+            wait_total, wait_max = self._wait_total, self._wait_max
+        attempts = checkouts + timeouts
+        return {
+            'checkouts': checkouts,
+            'timeouts': timeouts,
+            'wait_ms_total': wait_total * 1000,
+            'wait_ms_avg': wait_total * 1000 / attempts if attempts else 0.0,
+            'wait_ms_max': wait_max * 1000
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording checkout counts and wait times.
+    """
+
+    def __init__(self, creator, **kwargs):
+        super().__init__(creator, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def pool_stats(engine):
+    """
+    Describe the state of an engine's pool.
+
+    Returns:
+        dict: Pool class, configured size, connections in use, overflow and,
+        for InstrumentedQueuePool, the checkout/wait counters
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout': pool.timeout(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0)
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,150 @@
+"""
+Replicas Module
+Contains the read-replica routing of the database session.
+
+GET/HEAD requests read from one of the replica engines (round robin);
+every other request, and any flush, uses the primary. After a client's
+own successful write, a cookie pins that client's reads to the primary
+for REPLICA_STICKY_SECONDS so it never reads a replica that has not
+caught up with the write yet.
+
+Replicas are registered as extra Flask-SQLAlchemy binds ('replica_0',
+'replica_1', ...) sharing SQLALCHEMY_ENGINE_OPTIONS; replication itself
+is the database's job. Without replica URLs everything uses the primary.
+"""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND_PREFIX = 'replica_'
+STICKY_COOKIE = 'db_primary_until'
+READ_METHODS = ('GET', 'HEAD')
+
+
+def replica_urls(value):
+    """Split a comma-separated list of replica URLs."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [url.strip() for url in value if url.strip()]
+
+
+def configure_replicas(app):
+    """
+    Register the configured replicas as binds (call before db.init_app).
+
+    Returns:
+        list: Bind keys of the replicas
+    """
+    urls = replica_urls(app.config.get('SQLALCHEMY_REPLICA_URIS'))
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    keys = []
+    for index, url in enumerate(urls):
+        key = f'{REPLICA_BIND_PREFIX}{index}'
+        binds[key] = url
+        keys.append(key)
+    app.config['SQLALCHEMY_BINDS'] = binds
+    return keys
+
+
+class ReplicaRouter:
+    """
+    Picks the engine that serves the reads of each request.
+    """
+
+    def __init__(self, bind_keys, sticky_seconds=5):
+        """
+        Constructor for ReplicaRouter.
+
+        Args:
+            bind_keys: Bind keys of the replica engines
+            sticky_seconds: Seconds a client reads from the primary after a write
+        """
+        self.bind_keys = list(bind_keys)
+        self.sticky_seconds = sticky_seconds
+        self._cycle = itertools.cycle(self.bind_keys)
+        self._lock = threading.Lock()
+
+    def next_key(self):
+        """Return the next replica bind key (None without replicas)."""
+        if not self.bind_keys:
+            return None
+        with self._lock:
+            return next(self._cycle)
+
+    def is_sticky(self, req):
+        """Whether the client wrote within the sticky window."""
+        try:
+            return float(req.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def before_request(self):
+        """Route the reads of safe requests to a replica."""
+        g.db_replica = None
+        if request.method in READ_METHODS and not self.is_sticky(request):
+            g.db_replica = self.next_key()
+
+    def after_request(self, response):
+        """Pin the client to the primary after a successful write."""
+        if request.method not in READ_METHODS and response.status_code < 400 and self.sticky_seconds > 0:
+            until = time.time() + self.sticky_seconds
+            response.set_cookie(STICKY_COOKIE, f'{until:.3f}', max_age=int(self.sticky_seconds) + 1,
+                                httponly=True, samesite='Lax')
+        return response
+
+
+def init_replicas(app, bind_keys):
+    """
+    Attach a ReplicaRouter to the application and hook it into its requests.
+
+    Args:
+        app: Flask application
+        bind_keys: Bind keys returned by configure_replicas()
+    """
+    router = ReplicaRouter(bind_keys, app.config.get('REPLICA_STICKY_SECONDS', 5))
+    app.extensions['replica_router'] = router
+    if router.bind_keys:
+        app.before_request(router.before_request)
+        app.after_request(router.after_request)
+    return router
+
+
+def current_replica():
+    """Bind key of the replica serving the current request's reads, or None."""
+    if not has_app_context():
+        return None
+    return g.get('db_replica')
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, whatever the request routing."""
+    if not has_app_context():
+        yield
+        return
+    previous = g.get('db_replica')
+    g.db_replica = None
+    try:
+        yield
+    finally:
+        g.db_replica = previous
+
+
+class RoutingSession(Session):
+    """
+    Session sending reads to the request's replica and writes to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            key = current_replica()
+            if key is not None:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -1,9 +1,25 @@
-from app.resources.dieta_resource import DietaResource, DietaListResource
-from app.resources.refeicao_resource import RefeicaoResource, RefeicaoListResource
-from app.resources.exercicio_resource import ExercicioResource, ExercicioListResource
+from app.resources.dieta_resource import (
+    DietaResource, DietaListResource, DietaResumoResource, DietaResumoListResource,
+    DietaRefeicoesAttachResource, DietaExerciciosAttachResource
+)
+from app.resources.refeicao_resource import (
+    RefeicaoResource, RefeicaoListResource, RefeicaoBulkResource, RefeicaoExportResource,
+    RefeicaoAlimentosAttachResource, RefeicaoAlimentosDetachResource
+)
+from app.resources.exercicio_resource import (
+    ExercicioResource, ExercicioListResource, ExercicioBulkResource, ExercicioExportResource
+)
+from app.resources.alimento_resource import AlimentoListResource
+from app.resources.cache_resource import CacheStatsResource
+from app.resources.pool_resource import PoolStatsResource
 
 __all__ = [
-    'DietaResource', 'DietaListResource',
-    'RefeicaoResource', 'RefeicaoListResource',
-    'ExercicioResource', 'ExercicioListResource'
+    'DietaResource', 'DietaListResource', 'DietaResumoResource', 'DietaResumoListResource',
+    'DietaRefeicoesAttachResource', 'DietaExerciciosAttachResource',
+    'RefeicaoResource', 'RefeicaoListResource', 'RefeicaoBulkResource', 'RefeicaoExportResource',
+    'RefeicaoAlimentosAttachResource', 'RefeicaoAlimentosDetachResource',
+    'ExercicioResource', 'ExercicioListResource', 'ExercicioBulkResource', 'ExercicioExportResource',
+    'AlimentoListResource',
+    'CacheStatsResource',
+    'PoolStatsResource'
 ]
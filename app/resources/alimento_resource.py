@@ -0,0 +1,19 @@
+from flask import request
+from flask_restful import Resource
+from app.controllers.alimento_controller import AlimentoController
+from app.resources.conditional import etag_response
+class AlimentoListResource(Resource):
+    def __init__(self):
+        """Constructor for AlimentoListResource."""
+        self._controller = AlimentoController()
+    
+    def get(self):
+        alimentos, error = self._controller.get_all(
+            alimento=request.args.get('alimento'),
+            busca=request.args.get('busca')
+        )
+        
+        if error:
+            return {'error': error}, 400
+        
+        return etag_response({'data': alimentos, 'count': len(alimentos)})
@@ -0,0 +1,19 @@
+"""
+Cache Resource Module
+Contains the Flask-RESTful resource exposing the controller cache counters.
+"""
+
+from flask_restful import Resource
+from app.cache import get_cache
+
+
+class CacheStatsResource(Resource):
+    """
+    Resource for the read cache statistics.
+    
+    Endpoints:
+        - GET /api/cache/stats - Hit/miss counters of the controller cache
+    """
+    
+    def get(self):
+        return {'data': get_cache().stats()}, 200
@@ -0,0 +1,83 @@
+"""
+Conditional Response Module
+Contains the ETag handling shared by the list and detail resources, and
+the If-Match parsing of the PATCH endpoints.
+"""
+
+import hashlib
+
+from flask import request, Response
+from app.serializers import dumps_sorted
+
+
+def compute_etag(body):
+    """
+    Compute a strong ETag for a JSON-serializable response body.
+    
+    Args:
+        body: Response body (dict or list)
+        
+    Returns:
+        str: Hex digest used as the (unquoted) ETag value
+    """
+    return hashlib.sha1(dumps_sorted(body)).hexdigest()
+
+
+def version_etag(version):
+    """
+    Build the ETag of a versioned row ('v3'), the validator PATCH accepts in If-Match.
+    
+    Args:
+        version: Row version ('version' field of the resource)
+        
+    Returns:
+        str: Unquoted ETag value
+    """
+    return f'v{version}'
+
+
+def etag_response(body, status=200, etag=None):
+    """
+    Return the body with an ETag header, or 304 Not Modified when the client
+    already holds the same representation (If-None-Match).
+    
+    Args:
+        body: Response body (dict or list)
+        status: HTTP status code for the full response
+        etag: Unquoted ETag value, None to hash the body
+        
+    Returns:
+        Flask-RESTful response tuple or an empty 304 Response
+    """
+    if etag is None:
+        etag = compute_etag(body)
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    return body, status, {'ETag': f'"{etag}"'}
+
+
+def parse_if_match():
+    """
+    Read the expected row version from the If-Match header of a PATCH.
+    
+    The value is the ETag of the detail GET ('"v3"', see version_etag) or
+    the 'version' field of the resource ('"3"', 'W/"3"' or '3'); a missing
+    header or '*' skips the check.
+    
+    Returns:
+        tuple: (expected version or None, error message or None)
+    """
+    raw = request.headers.get('If-Match', '').strip()
+    if not raw or raw == '*':
+        return None, None
+    if raw.startswith('W/'):
+        raw = raw[2:]
+    value = raw.strip('"')
+    try:
+        return int(value[1:] if value.startswith('v') else value), None
+    except ValueError:
+        return None, 'If-Match deve conter o ETag ou a versão do registro (campo version)'
@@ -6,6 +6,22 @@ Contains Flask-RESTful resources for diet API endpoints.
 from flask import request
 from flask_restful import Resource
 from app.controllers.dieta_controller import DietaController
+from app.resources.pagination import parse_page_args
+from app.resources.conditional import etag_response
+
+
+def parse_ids():
+    """
+    Parse the comma-separated 'ids' query argument.
+    
+    Returns:
+        tuple: (list of IDs or None, error message or None)
+    """
+    raw = request.args.get('ids', '')
+    try:
+        return [int(part) for part in raw.split(',') if part.strip()], None
+    except ValueError:
+        return None, 'ids deve ser uma lista de números inteiros separados por vírgula'
 
 
 class DietaListResource(Resource):
@@ -14,8 +30,19 @@ class DietaListResource(Resource):
         self._controller = DietaController()
     
     def get(self):
+        page_args, error = parse_page_args()
+        if error:
+            return {'error': error}, 400
+        
+        if page_args:
+            page, error = self._controller.get_page(**page_args)
+            if error:
+                return {'error': error}, 400
+            page['count'] = len(page['data'])
+            return etag_response(page)
+        
         dietas = self._controller.get_all()
-        return {'data': dietas, 'count': len(dietas)}, 200
+        return etag_response({'data': dietas, 'count': len(dietas)})
     
     def post(self):
         data = request.get_json()
@@ -29,6 +56,18 @@ class DietaListResource(Resource):
             return {'error': error}, 400
         
         return {'data': dieta.to_dict(), 'message': 'Dieta criada com sucesso'}, 201
+    
+    def delete(self):
+        ids, error = parse_ids()
+        if error:
+            return {'error': error}, 400
+        
+        result, error = self._controller.delete_many(ids)
+        
+        if error:
+            return {'error': error}, 400
+        
+        return {'data': result, 'message': 'Dietas excluídas com sucesso'}, 200
 
 
 class DietaResource(Resource):    
@@ -42,7 +81,7 @@ class DietaResource(Resource):
         if error:
             return {'error': error}, 404
         
-        return {'data': dieta}, 200
+        return etag_response({'data': dieta})
     
     def put(self, id):
         data = request.get_json()
@@ -68,3 +107,78 @@ class DietaResource(Resource):
             return {'error': error}, 400
         
         return {'message': 'Dieta excluída com sucesso'}, 200
+
+
+class DietaResumoResource(Resource):
+    def __init__(self):
+        """Constructor for DietaResumoResource."""
+        self._controller = DietaController()
+    
+    def get(self, id):
+        resumo, error = self._controller.get_summary(id)
+        
+        if error:
+            return {'error': error}, 404
+        
+        return etag_response({'data': resumo})
+
+
+class DietaResumoListResource(Resource):
+    def __init__(self):
+        """Constructor for DietaResumoListResource."""
+        self._controller = DietaController()
+    
+    def get(self):
+        ids, error = parse_ids()
+        if error:
+            return {'error': error}, 400
+        
+        result, error = self._controller.get_summaries(ids)
+        
+        if error:
+            return {'error': error}, 400
+        
+        result['count'] = len(result['data'])
+        return etag_response(result)
+
+
+class DietaRefeicoesAttachResource(Resource):
+    def __init__(self):
+        """Constructor for DietaRefeicoesAttachResource."""
+        self._controller = DietaController()
+    
+    def post(self, id):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        result, error = self._controller.attach_refeicoes(id, data)
+        
+        if error:
+            if 'não encontrada' in error:
+                return {'error': error}, 404
+            return {'error': error}, 400
+        
+        return {'data': result, 'message': 'Refeições associadas à dieta'}, 200
+
+
+class DietaExerciciosAttachResource(Resource):
+    def __init__(self):
+        """Constructor for DietaExerciciosAttachResource."""
+        self._controller = DietaController()
+    
+    def post(self, id):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        result, error = self._controller.attach_exercicios(id, data)
+        
+        if error:
+            if 'não encontrada' in error:
+                return {'error': error}, 404
+            return {'error': error}, 400
+        
+        return {'data': result, 'message': 'Exercícios associados à dieta'}, 200
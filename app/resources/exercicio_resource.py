@@ -6,6 +6,10 @@ Contains Flask-RESTful resources for exercise API endpoints.
 from flask import request
 from flask_restful import Resource
 from app.controllers.exercicio_controller import ExercicioController
+from app.controllers.patch import VERSION_CONFLICT
+from app.resources.pagination import parse_page_args
+from app.resources.conditional import etag_response, parse_if_match, version_etag
+from app.resources.export import parse_export_args, stream_export
 
 
 class ExercicioListResource(Resource):
@@ -27,18 +31,30 @@ class ExercicioListResource(Resource):
         
         Query params:
             - dieta_id: Filter by diet ID (optional)
+            - limit, cursor, with_count: Keyset pagination (optional)
         
         Returns:
             tuple: (list of exercises, HTTP status code)
         """
         dieta_id = request.args.get('dieta_id', type=int)
         
+        page_args, error = parse_page_args()
+        if error:
+            return {'error': error}, 400
+        
+        if page_args:
+            page, error = self._controller.get_page(dieta_id=dieta_id, **page_args)
+            if error:
+                return {'error': error}, 400
+            page['count'] = len(page['data'])
+            return etag_response(page)
+        
         if dieta_id:
             exercicios = self._controller.get_by_dieta(dieta_id)
         else:
             exercicios = self._controller.get_all()
         
-        return {'data': exercicios, 'count': len(exercicios)}, 200
+        return etag_response({'data': exercicios, 'count': len(exercicios)})
     
     def post(self):
         """
@@ -89,7 +105,8 @@ class ExercicioResource(Resource):
         if error:
             return {'error': error}, 404
         
-        return {'data': exercicio}, 200
+        # Versioned validator: the same value is accepted by PATCH in If-Match
+        return etag_response({'data': exercicio}, etag=version_etag(exercicio['version']))
     
     def put(self, id):
         data = request.get_json()
@@ -106,6 +123,28 @@ class ExercicioResource(Resource):
         
         return {'data': exercicio, 'message': 'Exercício atualizado com sucesso'}, 200
     
+    def patch(self, id):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        version, error = parse_if_match()
+        if error:
+            return {'error': error}, 400
+        
+        exercicio, error = self._controller.patch(id, data, version)
+        
+        if error:
+            if 'não encontrado' in error:
+                return {'error': error}, 404
+            if error.startswith(VERSION_CONFLICT):
+                return {'error': error}, 412
+            return {'error': error}, 400
+        
+        headers = {'ETag': f'"{version_etag(exercicio["version"])}"'}
+        return {'data': exercicio, 'message': 'Exercício atualizado com sucesso'}, 200, headers
+    
     def delete(self, id):
         success, error = self._controller.delete(id)
         
@@ -115,3 +154,46 @@ class ExercicioResource(Resource):
             return {'error': error}, 400
         
         return {'message': 'Exercício excluído com sucesso'}, 200
+
+
+class ExercicioBulkResource(Resource):
+    def __init__(self):
+        """Constructor for ExercicioBulkResource."""
+        self._controller = ExercicioController()
+    
+    def post(self):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        result, error = self._controller.create_bulk(data)
+        
+        if error:
+            return {'error': error}, 400
+        
+        if not result['created']:
+            return {'error': 'Nenhum item válido', 'errors': result['errors']}, 400
+        
+        # 207 Multi-Status when only part of the batch was created
+        status = 207 if result['errors'] else 201
+        message = f"{len(result['created'])} exercícios criados com sucesso"
+        return {'data': result, 'message': message}, status
+
+
+class ExercicioExportResource(Resource):
+    def __init__(self):
+        """Constructor for ExercicioExportResource."""
+        self._controller = ExercicioController()
+    
+    def get(self):
+        args, error = parse_export_args()
+        if error:
+            return {'error': error}, 400
+        
+        fields, items = self._controller.export(
+            dieta_id=args['dieta_id'],
+            created_from=args['created_from'],
+            created_to=args['created_to']
+        )
+        return stream_export(fields, items, args['format'], args['gzip'], filename='exercicios')
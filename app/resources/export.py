@@ -0,0 +1,121 @@
+"""
+Export Module
+Contains the streaming NDJSON/CSV response shared by the export resources.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from flask import request, Response, stream_with_context
+from app.serializers import dumps
+
+# Rows encoded per chunk written to the response
+CHUNK_ROWS = 500
+
+MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def parse_export_args():
+    """
+    Read the export options from the query string.
+    
+    Query params:
+        - format: 'ndjson' (default) or 'csv'
+        - dieta_id: Filter by diet ID (optional)
+        - created_from, created_to: ISO 8601 creation range, end exclusive (optional)
+        - gzip: 'true' to compress the stream (optional)
+    
+    Returns:
+        tuple: (dict of export args or None, error message or None)
+    """
+    fmt = request.args.get('format', 'ndjson').lower()
+    if fmt not in MIMETYPES:
+        return None, f'Formato inválido. Formatos válidos: {", ".join(MIMETYPES)}'
+    
+    args = {
+        'format': fmt,
+        'dieta_id': request.args.get('dieta_id', type=int),
+        'gzip': request.args.get('gzip', 'false').lower() == 'true'
+    }
+    for field in ('created_from', 'created_to'):
+        value = request.args.get(field)
+        if value:
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return None, f'{field} deve estar no formato ISO 8601'
+        args[field] = value or None
+    
+    return args, None
+
+
+def _encode_ndjson(fields, items):
+    """Yield NDJSON chunks."""
+    chunk = []
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) >= CHUNK_ROWS:
+            yield b'\n'.join(chunk) + b'\n'
+            chunk = []
+    if chunk:
+        yield b'\n'.join(chunk) + b'\n'
+
+
+def _encode_csv(fields, items):
+    """Yield CSV chunks (list values are written as JSON arrays)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    
+    for count, item in enumerate(items, 1):
+        writer.writerow([
+            json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+            for value in item.values()
+        ])
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _gzip(chunks):
+    """Compress a stream of chunks on the fly."""
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(fields, items, fmt='ndjson', gzip=False, filename='export'):
+    """
+    Build a streamed response for an export.
+    
+    Args:
+        fields: Field names (CSV header)
+        items: Iterator of dictionaries
+        fmt: 'ndjson' or 'csv'
+        gzip: Whether to gzip the body
+        filename: Base name for the Content-Disposition header
+        
+    Returns:
+        Response: Streaming Flask response
+    """
+    encode = _encode_csv if fmt == 'csv' else _encode_ndjson
+    chunks = encode(fields, items)
+    
+    headers = {'Content-Disposition': f'attachment; filename="{filename}.{fmt}"'}
+    if gzip:
+        chunks = _gzip(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    
+    return Response(stream_with_context(chunks), mimetype=MIMETYPES[fmt], headers=headers)
@@ -0,0 +1,41 @@
+"""
+Pagination Module
+Contains the query-string parsing shared by the list resources.
+"""
+
+from flask import request, current_app
+
+
+def parse_page_args():
+    """
+    Read the keyset pagination arguments from the query string.
+    
+    Query params:
+        - limit: Page size (optional, capped by PAGE_SIZE_MAX)
+        - cursor: Opaque cursor from the previous page (optional)
+        - with_count: 'true' to also run the total COUNT query (optional)
+    
+    Returns:
+        tuple: (dict of page args or None when not paginating, error message or None)
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    
+    # No pagination requested: keep the full-list behaviour
+    if limit is None and cursor is None:
+        return None, None
+    
+    if limit is None:
+        limit = current_app.config.get('PAGE_SIZE_DEFAULT', 100)
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return None, 'limit deve ser um número inteiro'
+        if limit <= 0:
+            return None, 'limit deve ser um valor positivo'
+    
+    limit = min(limit, current_app.config.get('PAGE_SIZE_MAX', 1000))
+    with_count = request.args.get('with_count', 'false').lower() == 'true'
+    
+    return {'limit': limit, 'cursor': cursor, 'with_count': with_count}, None
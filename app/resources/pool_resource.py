@@ -0,0 +1,25 @@
+"""
+Pool Resource Module
+Contains the Flask-RESTful resource exposing the connection pool metrics.
+"""
+
+from flask_restful import Resource
+from app import db
+from app.pool import pool_stats
+
+
+class PoolStatsResource(Resource):
+    """
+    Resource for the database connection pool statistics.
+    
+    Endpoints:
+        - GET /api/pool/stats - Size, connections in use, overflow, checkout waits and timeouts
+          (the primary's, plus one entry per read replica under 'replicas')
+    """
+    
+    def get(self):
+        data = pool_stats(db.engine)
+        replicas = {key: pool_stats(engine) for key, engine in db.engines.items() if key is not None}
+        if replicas:
+            data['replicas'] = replicas
+        return {'data': data}, 200
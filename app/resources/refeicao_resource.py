@@ -1,6 +1,11 @@
-from flask import request
+from flask import current_app, request
 from flask_restful import Resource
 from app.controllers.refeicao_controller import RefeicaoController
+from app.controllers.patch import VERSION_CONFLICT
+from app.resources.pagination import parse_page_args
+from app.resources.conditional import etag_response, parse_if_match, version_etag
+from app.resources.export import parse_export_args, stream_export
+from app.write_behind import UNAVAILABLE_ERRORS
 class RefeicaoListResource(Resource):
     def __init__(self):
         """Constructor for RefeicaoListResource."""
@@ -8,13 +13,32 @@ class RefeicaoListResource(Resource):
     
     def get(self):
         dieta_id = request.args.get('dieta_id', type=int)
+        alimento = request.args.get('alimento')
+        busca = request.args.get('busca')
         
-        if dieta_id:
+        page_args, error = parse_page_args()
+        if error:
+            return {'error': error}, 400
+        
+        if page_args:
+            page, error = self._controller.get_page(
+                dieta_id=dieta_id, alimento=alimento, busca=busca, **page_args
+            )
+            if error:
+                return {'error': error}, 400
+            page['count'] = len(page['data'])
+            return etag_response(page)
+        
+        if alimento is not None:
+            refeicoes, error = self._controller.search(alimento, busca, dieta_id)
+            if error:
+                return {'error': error}, 400
+        elif dieta_id:
             refeicoes = self._controller.get_by_dieta(dieta_id)
         else:
             refeicoes = self._controller.get_all()
         
-        return {'data': refeicoes, 'count': len(refeicoes)}, 200
+        return etag_response({'data': refeicoes, 'count': len(refeicoes)})
     
     def post(self):
         data = request.get_json()
@@ -22,12 +46,19 @@ class RefeicaoListResource(Resource):
         if not data:
             return {'error': 'Dados não fornecidos'}, 400
         
-        refeicao, error = self._controller.create(data)
+        if current_app.config.get('WRITE_BEHIND_ENABLED'):
+            # Group commit: the meal is written with the next batch
+            refeicao, error = self._controller.create_queued(data)
+            if error in UNAVAILABLE_ERRORS:
+                return {'error': error}, 503, {'Retry-After': '1'}
+        else:
+            refeicao, error = self._controller.create(data)
+            refeicao = refeicao.to_dict() if refeicao else None
         
         if error:
             return {'error': error}, 400
         
-        return {'data': refeicao.to_dict(), 'message': 'Refeição criada com sucesso'}, 201
+        return {'data': refeicao, 'message': 'Refeição criada com sucesso'}, 201
 
 
 class RefeicaoResource(Resource):    
@@ -41,7 +72,8 @@ class RefeicaoResource(Resource):
         if error:
             return {'error': error}, 404
         
-        return {'data': refeicao}, 200
+        # Versioned validator: the same value is accepted by PATCH in If-Match
+        return etag_response({'data': refeicao}, etag=version_etag(refeicao['version']))
     
     def put(self, id):
         data = request.get_json()
@@ -58,6 +90,28 @@ class RefeicaoResource(Resource):
         
         return {'data': refeicao, 'message': 'Refeição atualizada com sucesso'}, 200
     
+    def patch(self, id):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        version, error = parse_if_match()
+        if error:
+            return {'error': error}, 400
+        
+        refeicao, error = self._controller.patch(id, data, version)
+        
+        if error:
+            if 'não encontrada' in error:
+                return {'error': error}, 404
+            if error.startswith(VERSION_CONFLICT):
+                return {'error': error}, 412
+            return {'error': error}, 400
+        
+        headers = {'ETag': f'"{version_etag(refeicao["version"])}"'}
+        return {'data': refeicao, 'message': 'Refeição atualizada com sucesso'}, 200, headers
+    
     def delete(self, id):
         success, error = self._controller.delete(id)
         
@@ -67,3 +121,84 @@ class RefeicaoResource(Resource):
             return {'error': error}, 400
         
         return {'message': 'Refeição excluída com sucesso'}, 200
+
+
+class RefeicaoBulkResource(Resource):
+    def __init__(self):
+        """Constructor for RefeicaoBulkResource."""
+        self._controller = RefeicaoController()
+    
+    def post(self):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        result, error = self._controller.create_bulk(data)
+        
+        if error:
+            return {'error': error}, 400
+        
+        if not result['created']:
+            return {'error': 'Nenhum item válido', 'errors': result['errors']}, 400
+        
+        # 207 Multi-Status when only part of the batch was created
+        status = 207 if result['errors'] else 201
+        message = f"{len(result['created'])} refeições criadas com sucesso"
+        return {'data': result, 'message': message}, status
+
+
+class RefeicaoExportResource(Resource):
+    def __init__(self):
+        """Constructor for RefeicaoExportResource."""
+        self._controller = RefeicaoController()
+    
+    def get(self):
+        args, error = parse_export_args()
+        if error:
+            return {'error': error}, 400
+        
+        fields, items = self._controller.export(
+            dieta_id=args['dieta_id'],
+            created_from=args['created_from'],
+            created_to=args['created_to']
+        )
+        return stream_export(fields, items, args['format'], args['gzip'], filename='refeicoes')
+
+
+class RefeicaoAlimentosAttachResource(Resource):
+    def __init__(self):
+        """Constructor for RefeicaoAlimentosAttachResource."""
+        self._controller = RefeicaoController()
+    
+    def post(self):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        result, error = self._controller.attach_alimentos(data)
+        
+        if error:
+            return {'error': error}, 400
+        
+        return {'data': result, 'message': f"{result['affected']} alimentos adicionados"}, 200
+
+
+class RefeicaoAlimentosDetachResource(Resource):
+    def __init__(self):
+        """Constructor for RefeicaoAlimentosDetachResource."""
+        self._controller = RefeicaoController()
+    
+    def post(self):
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'Dados não fornecidos'}, 400
+        
+        result, error = self._controller.detach_alimentos(data)
+        
+        if error:
+            return {'error': error}, 400
+        
+        return {'data': result, 'message': f"{result['affected']} alimentos removidos"}, 200
@@ -0,0 +1,217 @@
+"""
+Serializers Module
+Contains the column-driven serializers used on the list and detail paths,
+and the JSON representation plugged into Flask-RESTful.
+
+Each serializer precomputes, once per model, the ordered columns to select
+and which of them hold datetimes, then turns raw result rows into
+dictionaries without building ORM objects or walking to_dict chains.
+"""
+
+import json
+
+from flask import current_app, make_response
+from flask_restful.representations.json import output_json as stdlib_output_json
+from sqlalchemy import DateTime
+
+from app import db
+from app.models.base_model import BaseModel
+from app.models.dieta import Dieta
+from app.models.refeicao import Refeicao
+from app.models.exercicio import Exercicio
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class ModelSerializer:
+    """
+    Serializer for one model, driven by a fixed column list.
+    Produces the same keys, in the same order, as the model's to_dict.
+    """
+    
+    def __init__(self, model, fields, extra=()):
+        """
+        Constructor for ModelSerializer.
+        
+        Args:
+            model: Model class whose table columns are serialized
+            fields: Column names, in output order
+            extra: Names of additional values selected after the columns
+        """
+        table = model.__table__
+        self._model = model
+        self._columns = tuple(table.c[name] for name in fields)
+        self._names = tuple(fields) + tuple(extra)
+        self._datetime_positions = tuple(
+            i for i, column in enumerate(self._columns) if isinstance(column.type, DateTime)
+        )
+    
+    @property
+    def columns(self):
+        """Get the columns to select, in output order."""
+        return self._columns
+    
+    @property
+    def names(self):
+        """Get the output keys."""
+        return self._names
+    
+    def from_row(self, row):
+        """Serialize one result row (columns in self.columns order, then extras)."""
+        if self._datetime_positions:
+            row = list(row)
+            fmt = BaseModel.format_datetime
+            for i in self._datetime_positions:
+                row[i] = fmt(row[i])
+        return dict(zip(self._names, row))
+    
+    def from_rows(self, rows):
+        """Serialize many result rows."""
+        from_row = self.from_row
+        return [from_row(row) for row in rows]
+    
+    def from_object(self, obj):
+        """Serialize an ORM object (no extras)."""
+        return self.from_row([getattr(obj, column.key) for column in self._columns])
+    
+    def from_mapping(self, mapping):
+        """Serialize a row mapping keyed by column name (e.g. UPDATE ... RETURNING)."""
+        return self.from_row([mapping[column.key] for column in self._columns])
+    
+    def query(self, *extra):
+        """Build a query returning plain rows of the columns (plus extra expressions)."""
+        return db.session.query(*self._columns, *extra)
+
+
+class RefeicaoSerializer(ModelSerializer):
+    """
+    Serializer for meals. The food names live in the refeicao_alimentos
+    link table, so they are loaded with one extra query per set of rows
+    (never one per meal), or passed in when the caller already selected
+    them, and placed where to_dict puts them.
+    """
+    
+    def __init__(self, fields):
+        """
+        Constructor for RefeicaoSerializer.
+        
+        Args:
+            fields: Output keys in order, including 'alimentos'
+        """
+        self._position = fields.index('alimentos')
+        super().__init__(Refeicao, tuple(f for f in fields if f != 'alimentos'))
+        self._names = tuple(fields)
+    
+    def from_row(self, row):
+        """
+        Serialize a single result row.
+        
+        Runs its own food-name query, so it is meant for one meal only:
+        never map it over a result; use from_rows or iter_rows, which load
+        the names of all the rows with one query.
+        """
+        return self.from_rows([row])[0]
+    
+    def from_rows(self, rows, all_rows=False):
+        """
+        Serialize many result rows.
+        
+        Args:
+            rows: Result rows of self.columns
+            all_rows: True when rows cover every meal, so the names are read
+                without an IN list
+        """
+        from app.models.refeicao_alimento import RefeicaoAlimento
+        
+        base_from_row = super().from_row
+        position = self._position
+        data = []
+        for row in rows:
+            row = list(row)
+            row.insert(position, None)
+            data.append(base_from_row(row))
+        
+        nomes = RefeicaoAlimento.nomes_por_refeicao(None if all_rows else [item['id'] for item in data])
+        for item in data:
+            item['alimentos'] = nomes.get(item['id'], [])
+        return data
+    
+    def from_row_with_names(self, row, alimentos):
+        """
+        Serialize a result row of self.columns without querying the food names.
+        
+        Args:
+            row: Result row of self.columns
+            alimentos: Food names of the meal, in order
+        """
+        row = list(row)
+        row.insert(self._position, alimentos)
+        return ModelSerializer.from_row(self, row)
+    
+    def from_mapping(self, mapping, alimentos):
+        """
+        Serialize a row mapping without querying the food names.
+        
+        Args:
+            mapping: Row mapping keyed by column name
+            alimentos: Food names of the meal, in order
+        """
+        return self.from_row_with_names([mapping[column.key] for column in self._columns], alimentos)
+    
+    def iter_rows(self, result):
+        """Serialize a streamed result one partition at a time (yield_per)."""
+        for partition in result.partitions():
+            yield from self.from_rows(partition)
+
+
+DIETA_FIELDS = ('id', 'created_at', 'meta', 'descricao')
+REFEICAO_FIELDS = ('id', 'created_at', 'tipo_refeicao', 'quantidade', 'alimentos', 'dieta_id', 'version')
+EXERCICIO_FIELDS = ('id', 'created_at', 'tipo_exercicio', 'quantidade_repeticoes', 'ciclos', 'pausa_entre_ciclos',
+                    'dieta_id', 'version')
+
+dieta_serializer = ModelSerializer(Dieta, DIETA_FIELDS)
+dieta_list_serializer = ModelSerializer(Dieta, DIETA_FIELDS, extra=('refeicoes_count', 'exercicios_count'))
+refeicao_serializer = RefeicaoSerializer(REFEICAO_FIELDS)
+exercicio_serializer = ModelSerializer(Exercicio, EXERCICIO_FIELDS)
+
+
+def dumps(data):
+    """Encode data as compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def dumps_sorted(data):
+    """Encode data as canonical JSON bytes (sorted keys), e.g. for ETags."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def output_json(data, code, headers=None):
+    """
+    Flask-RESTful JSON representation using orjson when it is installed
+    and enabled (FAST_JSON), falling back to the stdlib encoder.
+    """
+    if orjson is None or not current_app.config.get('FAST_JSON', True):
+        return stdlib_output_json(data, code, headers)
+    
+    try:
+        dumped = orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    except TypeError:
+        # Values orjson does not support (e.g. non-string keys)
+        return stdlib_output_json(data, code, headers)
+    
+    resp = make_response(dumped, code)
+    resp.headers.extend(headers or {})
+    return resp
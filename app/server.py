@@ -0,0 +1,157 @@
+"""
+Server Module
+Contains the production serving mode: the API on a pre-fork Gunicorn
+server with a preloaded application.
+
+Gunicorn is an optional dependency (POSIX only); the development mode of
+run_api.py keeps using the Werkzeug server.
+"""
+
+import os
+
+from app import db
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # optional dependency
+    BaseApplication = None
+
+
+def default_workers():
+    """Gunicorn's recommended worker count: 2 x CPUs + 1."""
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+def server_options_from_env():
+    """
+    Read the production server settings from the environment.
+
+    Env vars:
+        - WEB_WORKERS: Worker processes (default 2 x CPUs + 1)
+        - WEB_THREADS: Threads per worker (default 1; >1 uses the gthread worker)
+        - WEB_TIMEOUT: Seconds before a silent worker is restarted (default 30)
+        - WEB_GRACEFUL_TIMEOUT: Seconds workers get to finish requests on shutdown (default 30)
+        - WEB_PRELOAD: Load the application once in the master (default True)
+    """
+    return {
+        'workers': int(os.environ.get('WEB_WORKERS', default_workers())),
+        'threads': int(os.environ.get('WEB_THREADS', 1)),
+        'timeout': int(os.environ.get('WEB_TIMEOUT', 30)),
+        'graceful_timeout': int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30)),
+        'preload': os.environ.get('WEB_PRELOAD', 'True').lower() == 'true'
+    }
+
+
+def dispose_engine(app, close=True):
+    """
+    Drop the pooled database connections of the application (primary and replicas).
+
+    Args:
+        app: Flask application
+        close: False in a freshly forked worker, so connections inherited
+            from the master are discarded without closing the parent's sockets
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+
+def serve_production(app_factory, host, port, workers, threads=1, timeout=30,
+                     graceful_timeout=30, preload=True):
+    """
+    Run the API on Gunicorn until it receives SIGTERM/SIGINT.
+
+    The application is built once in the master when preload is on (so
+    migrations run once, before any worker starts), and every worker
+    disposes the engine right after the fork so no database connection
+    is shared between processes. On SIGTERM workers stop accepting
+    connections and get graceful_timeout seconds to finish in-flight
+    requests.
+
+    Args:
+        app_factory: Callable returning the Flask application
+        host: Interface to bind
+        port: Port to bind
+        workers: Number of worker processes
+        threads: Threads per worker
+        timeout: Seconds before a silent worker is restarted
+        graceful_timeout: Seconds workers get to finish on shutdown
+        preload: Build the application in the master before forking
+    """
+    if BaseApplication is None:
+        raise RuntimeError("O modo de produção requer o pacote 'gunicorn' (pip install gunicorn)")
+
+    options = {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'timeout': timeout,
+        'graceful_timeout': graceful_timeout,
+        'preload_app': preload,
+        'accesslog': '-',
+    }
+    ProductionServer(app_factory, options).run()
+
+
+class ProductionServer(BaseApplication or object):
+    """
+    Embedded Gunicorn application serving the Flask app.
+    """
+
+    def __init__(self, app_factory, options):
+        """
+        Constructor for ProductionServer.
+
+        Args:
+            app_factory: Callable returning the Flask application
+            options: Gunicorn settings
+        """
+        self._app_factory = app_factory
+        self._options = options
+        self._application = None
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self._options.items():
+            self.cfg.set(key, value)
+        self.cfg.set('post_fork', self._post_fork)
+        self.cfg.set('worker_exit', self._worker_exit)
+
+    def load(self):
+        if self._application is None:
+            self._application = self._app_factory()
+            self._check_cache(self._application)
+            if self.cfg.preload_app:
+                # Connections opened while loading (migrations) belong to
+                # the master; close them before the workers are forked
+                dispose_engine(self._application)
+        return self._application
+
+    def _check_cache(self, application):
+        """
+        Disable the in-process cache when several workers serve the API:
+        each worker would only see its own invalidations and serve stale
+        data written through another one.
+        """
+        from app.cache import NullCache, init_cache
+
+        if self.cfg.workers > 1 and application.config.get('CACHE_BACKEND', 'memory') == 'memory':
+            application.logger.warning(
+                "CACHE_BACKEND='memory' não é compartilhado entre processos; "
+                "cache desativado (use CACHE_BACKEND='redis' com vários workers)"
+            )
+            init_cache(application, NullCache())
+
+    def _post_fork(self, server, worker):
+        """Give each worker its own connection pool."""
+        if self._application is not None:
+            dispose_engine(self._application, close=False)
+
+    def _worker_exit(self, server, worker):
+        """Write the queued creates, then close the worker's connections on a graceful exit."""
+        if self._application is not None:
+            from app.write_behind import shutdown_write_behind
+            
+            shutdown_write_behind(self._application)
+            dispose_engine(self._application)
@@ -4,10 +4,11 @@ Contains validation classes and functions.
 """
 
 from app.validators.validators import (
+    BatchValidator,
     DietaValidator,
     RefeicaoValidator,
     ExercicioValidator,
     ValidationError
 )
 
-__all__ = ['DietaValidator', 'RefeicaoValidator', 'ExercicioValidator', 'ValidationError']
+__all__ = ['BatchValidator', 'DietaValidator', 'RefeicaoValidator', 'ExercicioValidator', 'ValidationError']
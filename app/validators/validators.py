@@ -51,6 +51,19 @@ class BaseValidator:
     Demonstrates inheritance pattern.
     """
     
+    # Error message templates shared by the per-call and batch validators
+    MSG_NOT_EMPTY = '{field} não pode estar vazio'
+    MSG_NOT_NEGATIVE = '{field} não pode ser negativo'
+    MSG_POSITIVE = '{field} deve ser um valor positivo'
+    MSG_LIST_NOT_EMPTY = '{field} não pode estar vazia'
+    MSG_REQUIRED = '{field} é obrigatória'
+    MSG_NUMERIC = '{field} deve ser numérico'
+    MSG_INTEGER = '{field} deve ser um número inteiro'
+    MSG_DIETA_NOT_FOUND = 'Dieta com ID {id} não existe'
+    
+    # Fields accepted by a partial update (none unless a subclass lists them)
+    PATCH_FIELDS = ()
+    
     @staticmethod
     def validate_not_empty(value, field_name):
         """
@@ -64,7 +77,7 @@ class BaseValidator:
             ValidationError: If value is empty
         """
         if value is None or (isinstance(value, str) and not value.strip()):
-            raise ValidationError(f'{field_name} não pode estar vazio', field_name)
+            raise ValidationError(BaseValidator.MSG_NOT_EMPTY.format(field=field_name), field_name)
     
     @staticmethod
     def validate_not_negative(value, field_name):
@@ -79,7 +92,7 @@ class BaseValidator:
             ValidationError: If value is negative
         """
         if value is not None and value < 0:
-            raise ValidationError(f'{field_name} não pode ser negativo', field_name)
+            raise ValidationError(BaseValidator.MSG_NOT_NEGATIVE.format(field=field_name), field_name)
     
     @staticmethod
     def validate_positive(value, field_name):
@@ -94,7 +107,7 @@ class BaseValidator:
             ValidationError: If value is not positive
         """
         if value is None or value <= 0:
-            raise ValidationError(f'{field_name} deve ser um valor positivo', field_name)
+            raise ValidationError(BaseValidator.MSG_POSITIVE.format(field=field_name), field_name)
     
     @staticmethod
     def validate_list_not_empty(value, field_name):
@@ -109,7 +122,222 @@ class BaseValidator:
             ValidationError: If list is empty
         """
         if not value or not isinstance(value, list) or len(value) == 0:
-            raise ValidationError(f'{field_name} não pode estar vazia', field_name)
+            raise ValidationError(BaseValidator.MSG_LIST_NOT_EMPTY.format(field=field_name), field_name)
+    
+    @staticmethod
+    def validate_numeric(value, field_name):
+        """
+        Validate that a value is a number (booleans excluded).
+        
+        Args:
+            value: Value to validate
+            field_name: Name of the field being validated
+            
+        Raises:
+            ValidationError: If value is not numeric
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValidationError(BaseValidator.MSG_NUMERIC.format(field=field_name), field_name)
+    
+    @staticmethod
+    def is_id(value):
+        """Tell whether a value can be used as a row ID (int, booleans excluded)."""
+        return isinstance(value, int) and not isinstance(value, bool)
+    
+    @staticmethod
+    def validate_id(value, field_name):
+        """
+        Validate that a value is an integer ID.
+        
+        Args:
+            value: Value to validate
+            field_name: Name of the field being validated
+            
+        Raises:
+            ValidationError: If value is not an integer
+        """
+        if not BaseValidator.is_id(value):
+            raise ValidationError(BaseValidator.MSG_INTEGER.format(field=field_name), field_name)
+    
+    def validate_partial(self, data):
+        """
+        Validate the fields present in a partial update (PATCH).
+        
+        Only checks that need no database access run here. Validators that
+        support PATCH list the accepted fields in PATCH_FIELDS and check
+        each one in validate_patch_field; with no fields every update is
+        rejected.
+        
+        Args:
+            data: Dictionary with the fields to change
+            
+        Returns:
+            dict: The accepted fields present in data
+            
+        Raises:
+            ValidationError: If a field is invalid or no accepted field is present
+        """
+        if not self.PATCH_FIELDS:
+            raise ValidationError('Atualização parcial não suportada')
+        values = {field: data[field] for field in self.PATCH_FIELDS if field in data}
+        if not values:
+            raise ValidationError(f'Nenhum campo para atualizar. Campos aceitos: {", ".join(self.PATCH_FIELDS)}')
+        for field, value in values.items():
+            if field == 'dieta_id':
+                if value is not None:
+                    self.validate_id(value, 'dieta_id')
+            else:
+                self.validate_patch_field(field, value)
+        return values
+    
+    @staticmethod
+    def find_missing_dietas(dieta_ids):
+        """
+        Check which diets do not exist, using a single IN query.
+        
+        Args:
+            dieta_ids: Iterable of diet IDs (values that are not integer IDs,
+                such as None, are ignored)
+            
+        Returns:
+            set: IDs that have no matching diet
+        """
+        from app import db
+        from app.models.dieta import Dieta
+        ids = {i for i in dieta_ids if BaseValidator.is_id(i)}
+        if not ids:
+            return set()
+        found = db.session.scalars(db.select(Dieta.id).where(Dieta.id.in_(ids)))
+        return ids - set(found)
+
+
+class BatchValidator(BaseValidator):
+    """
+    Schema-driven validator for lists of payloads.
+    
+    The schema is compiled once into plain check functions that return an
+    error message instead of raising. Items are checked column by column,
+    every error of every item is collected, and all foreign-key existence
+    checks are deferred into one set-based query per batch.
+    Inherits from BaseValidator (shares its error messages).
+    """
+    
+    def __init__(self, schema, required_messages=None, rules=None, check_dieta=True):
+        """
+        Constructor for BatchValidator.
+        
+        Args:
+            schema: Sequence of (field, rule names) pairs, checked in order
+            required_messages: Custom messages for the 'required' rule per field
+            rules: Extra named rules as callables value -> message or None
+            check_dieta: Whether dieta_id must reference an existing diet
+        """
+        super().__init__()
+        self._required_messages = required_messages or {}
+        self._rules = rules or {}
+        self._check_dieta = check_dieta
+        self._checks = [(field, self._compile(field, names)) for field, names in schema]
+    
+    def _compile(self, field, names):
+        """Turn a list of rule names into a single check function."""
+        checks = [self._build_rule(field, name) for name in names]
+        
+        def check(value):
+            for rule in checks:
+                message = rule(value)
+                if message is not None:
+                    return message
+            return None
+        
+        return check
+    
+    def _build_rule(self, field, name):
+        """Build the check function for one named rule on one field."""
+        if name in self._rules:
+            return self._rules[name]
+        
+        if name == 'required':
+            message = self._required_messages.get(field, self.MSG_REQUIRED.format(field=field))
+            return lambda value: message if value is None else None
+        
+        if name == 'not_empty':
+            message = self.MSG_NOT_EMPTY.format(field=field)
+            return lambda value: message if value is None or (isinstance(value, str) and not value.strip()) else None
+        
+        if name == 'not_negative':
+            message = self.MSG_NOT_NEGATIVE.format(field=field)
+            numeric = self.MSG_NUMERIC.format(field=field)
+            
+            def not_negative(value):
+                if value is None:
+                    return None
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return numeric
+                return message if value < 0 else None
+            
+            return not_negative
+        
+        if name == 'list_not_empty':
+            message = self.MSG_LIST_NOT_EMPTY.format(field=field)
+            return lambda value: message if not value or not isinstance(value, list) else None
+        
+        raise ValueError(f'Regra de validação desconhecida: {name}')
+    
+    def validate_many(self, items):
+        """
+        Validate a list of payloads without raising.
+        
+        Args:
+            items: List of data dictionaries
+            
+        Returns:
+            tuple: (list of (index, data) for valid items,
+                    list of {'index', 'error', 'field'} sorted by index)
+        """
+        errors = []
+        failed = set()
+        
+        rows = []
+        for index, data in enumerate(items):
+            if isinstance(data, dict):
+                rows.append((index, data))
+            else:
+                errors.append({'index': index, 'error': 'Item deve ser um objeto', 'field': None})
+                failed.add(index)
+        
+        # Column-wise pass: one compiled check per field over every item
+        for field, check in self._checks:
+            for index, data in rows:
+                message = check(data.get(field))
+                if message is not None:
+                    errors.append({'index': index, 'error': message, 'field': field})
+                    failed.add(index)
+        
+        # dieta_id must be an integer (or absent) before it reaches a query
+        message = self.MSG_INTEGER.format(field='dieta_id')
+        for index, data in rows:
+            dieta_id = data.get('dieta_id')
+            if dieta_id is not None and not self.is_id(dieta_id):
+                errors.append({'index': index, 'error': message, 'field': 'dieta_id'})
+                failed.add(index)
+        
+        # Deferred foreign-key check: one IN query for the whole batch
+        if self._check_dieta:
+            missing = self.find_missing_dietas(data.get('dieta_id') for _, data in rows)
+            if missing:
+                for index, data in rows:
+                    dieta_id = data.get('dieta_id')
+                    if self.is_id(dieta_id) and dieta_id in missing:
+                        errors.append({
+                            'index': index,
+                            'error': self.MSG_DIETA_NOT_FOUND.format(id=dieta_id),
+                            'field': 'dieta_id'
+                        })
+                        failed.add(index)
+        
+        errors.sort(key=lambda error: error['index'])
+        valid = [(index, data) for index, data in rows if index not in failed]
+        return valid, errors
 
 
 class DietaValidator(BaseValidator):
@@ -202,9 +430,40 @@ class RefeicaoValidator(BaseValidator):
     # Pre-computed lowercase version for validation
     TIPOS_VALIDOS_LOWER = [t.lower() for t in TIPOS_VALIDOS]
     
+    # Field rules used by the batch validator (same order as validate)
+    SCHEMA = (
+        ('tipo_refeicao', ('not_empty', 'tipo_refeicao')),
+        ('quantidade', ('required', 'not_negative')),
+        ('alimentos', ('list_not_empty',)),
+    )
+    # Fields accepted by a partial update
+    PATCH_FIELDS = ('tipo_refeicao', 'quantidade', 'alimentos', 'dieta_id')
+    
     def __init__(self):
         """Constructor for RefeicaoValidator."""
         super().__init__()
+        self._batch = None
+    
+    def validate_many(self, items):
+        """
+        Validate a list of meals in one pass, collecting every error.
+        
+        Args:
+            items: List of meal data dictionaries
+            
+        Returns:
+            tuple: (list of (index, data) for valid items, list of per-item errors)
+        """
+        if self._batch is None:
+            tipos = frozenset(self.TIPOS_VALIDOS_LOWER)
+            message = f'Tipo de refeição inválido. Tipos válidos: {", ".join(self.TIPOS_VALIDOS)}'
+            self._batch = BatchValidator(
+                self.SCHEMA,
+                rules={
+                    'tipo_refeicao': lambda value: None if isinstance(value, str) and value.lower() in tipos else message
+                }
+            )
+        return self._batch.validate_many(items)
     
     def validate(self, data):
         """
@@ -216,6 +475,25 @@ class RefeicaoValidator(BaseValidator):
         Returns:
             dict: Validated data
             
+        Raises:
+            ValidationError: If validation fails
+        """
+        self.validate_fields(data)
+        
+        # Validate dieta_id if provided
+        dieta_id = data.get('dieta_id')
+        if dieta_id is not None:
+            self.validate_dieta_exists(dieta_id)
+        
+        return data
+    
+    def validate_fields(self, data):
+        """
+        Validate meal fields that do not need the database.
+        
+        Args:
+            data: Dictionary with meal data
+            
         Raises:
             ValidationError: If validation fails
         """
@@ -234,13 +512,21 @@ class RefeicaoValidator(BaseValidator):
         alimentos = data.get('alimentos')
         self.validate_list_not_empty(alimentos, 'alimentos')
         
-        # Validate dieta_id if provided
-        dieta_id = data.get('dieta_id')
-        if dieta_id is not None:
-            self.validate_dieta_exists(dieta_id)
-        
         return data
     
+    def validate_patch_field(self, field, value):
+        """Validate one meal field of a partial update."""
+        if field == 'tipo_refeicao':
+            self.validate_not_empty(value, field)
+            if not isinstance(value, str):
+                raise ValidationError(self.MSG_NOT_EMPTY.format(field=field), field)
+            self.validate_tipo_refeicao(value)
+        elif field == 'quantidade':
+            self.validate_numeric(value, field)
+            self.validate_not_negative(value, field)
+        elif field == 'alimentos':
+            self.validate_list_not_empty(value, field)
+    
     def validate_tipo_refeicao(self, tipo):
         """
         Validate that meal type is valid.
@@ -269,10 +555,11 @@ class RefeicaoValidator(BaseValidator):
             ValidationError: If diet does not exist
         """
         from app.models.dieta import Dieta
+        self.validate_id(dieta_id, 'dieta_id')
         dieta = Dieta.get_by_id(dieta_id)
         if not dieta:
             raise ValidationError(
-                f'Dieta com ID {dieta_id} não existe',
+                self.MSG_DIETA_NOT_FOUND.format(id=dieta_id),
                 'dieta_id'
             )
         return dieta
@@ -284,9 +571,35 @@ class ExercicioValidator(BaseValidator):
     Inherits from BaseValidator.
     """
     
+    # Field rules used by the batch validator (same order as validate)
+    SCHEMA = (
+        ('tipo_exercicio', ('not_empty',)),
+        ('quantidade_repeticoes', ('required', 'not_negative')),
+        ('ciclos', ('required', 'not_negative')),
+        ('pausa_entre_ciclos', ('required', 'not_negative')),
+    )
+    REQUIRED_MESSAGES = {'ciclos': 'ciclos é obrigatório'}
+    # Fields accepted by a partial update
+    PATCH_FIELDS = ('tipo_exercicio', 'quantidade_repeticoes', 'ciclos', 'pausa_entre_ciclos', 'dieta_id')
+    
     def __init__(self):
         """Constructor for ExercicioValidator."""
         super().__init__()
+        self._batch = None
+    
+    def validate_many(self, items):
+        """
+        Validate a list of exercises in one pass, collecting every error.
+        
+        Args:
+            items: List of exercise data dictionaries
+            
+        Returns:
+            tuple: (list of (index, data) for valid items, list of per-item errors)
+        """
+        if self._batch is None:
+            self._batch = BatchValidator(self.SCHEMA, self.REQUIRED_MESSAGES)
+        return self._batch.validate_many(items)
     
     def validate(self, data):
         """
@@ -298,6 +611,25 @@ class ExercicioValidator(BaseValidator):
         Returns:
             dict: Validated data
             
+        Raises:
+            ValidationError: If validation fails
+        """
+        self.validate_fields(data)
+        
+        # Validate dieta_id if provided
+        dieta_id = data.get('dieta_id')
+        if dieta_id is not None:
+            self.validate_dieta_exists(dieta_id)
+        
+        return data
+    
+    def validate_fields(self, data):
+        """
+        Validate exercise fields that do not need the database.
+        
+        Args:
+            data: Dictionary with exercise data
+            
         Raises:
             ValidationError: If validation fails
         """
@@ -322,13 +654,16 @@ class ExercicioValidator(BaseValidator):
             raise ValidationError('pausa_entre_ciclos é obrigatória', 'pausa_entre_ciclos')
         self.validate_not_negative(pausa, 'pausa_entre_ciclos')
         
-        # Validate dieta_id if provided
-        dieta_id = data.get('dieta_id')
-        if dieta_id is not None:
-            self.validate_dieta_exists(dieta_id)
-        
         return data
     
+    def validate_patch_field(self, field, value):
+        """Validate one exercise field of a partial update."""
+        if field == 'tipo_exercicio':
+            self.validate_not_empty(value, field)
+        else:
+            self.validate_numeric(value, field)
+            self.validate_not_negative(value, field)
+    
     def validate_dieta_exists(self, dieta_id):
         """
         Validate that the diet exists.
@@ -341,10 +676,11 @@ class ExercicioValidator(BaseValidator):
             ValidationError: If diet does not exist
         """
         from app.models.dieta import Dieta
+        self.validate_id(dieta_id, 'dieta_id')
         dieta = Dieta.get_by_id(dieta_id)
         if not dieta:
             raise ValidationError(
-                f'Dieta com ID {dieta_id} não existe',
+                self.MSG_DIETA_NOT_FOUND.format(id=dieta_id),
                 'dieta_id'
             )
         return dieta
@@ -0,0 +1,209 @@
+"""
+Write-Behind Module
+Contains the group-commit queue used for high-rate creates.
+
+Requests put their payload on a bounded in-process queue and wait on a
+future. A background flusher takes up to max_batch items, or whatever
+arrived within max_delay after the first one, and writes them with one
+flush call (one transaction), then resolves every future with its own
+result. A full queue is refused right away (the API answers 503), and
+close() writes everything still queued before the process exits.
+
+The flusher thread starts on the first submit, so a server that loads
+the application before forking (Gunicorn preload) starts one flusher per
+worker, never in the master.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Errors returned to the request (the API answers 503 for these)
+QUEUE_FULL = 'Fila de gravação cheia, tente novamente'
+QUEUE_CLOSED = 'Fila de gravação encerrada'
+QUEUE_TIMEOUT = 'Tempo limite da gravação em lote excedido'
+UNAVAILABLE_ERRORS = (QUEUE_FULL, QUEUE_CLOSED, QUEUE_TIMEOUT)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue drained in batches by a background flusher.
+    """
+
+    def __init__(self, app, flush, max_batch=500, max_delay=0.01, max_size=10000, timeout=30.0):
+        """
+        Constructor for WriteBehindQueue.
+
+        Args:
+            app: Flask application (the flusher runs inside its app context)
+            flush: Function(list of payloads) -> list of (result, error), same order
+            max_batch: Maximum payloads written per transaction
+            max_delay: Seconds the flusher waits for more payloads after the first
+            max_size: Payloads the queue holds before refusing new ones
+            timeout: Seconds a request waits for its result
+        """
+        self._app = app
+        self._flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+
+    def submit(self, payload):
+        """
+        Queue a payload.
+
+        Returns:
+            tuple: (Future resolving to (result, error) or None, error message or None)
+        """
+        if self._closed:
+            return None, QUEUE_CLOSED
+        self._ensure_started()
+        future = Future()
+        try:
+            self._queue.put_nowait((payload, future))
+        except queue.Full:
+            return None, QUEUE_FULL
+        return future, None
+
+    def wait(self, future):
+        """
+        Wait for a submitted payload; return its (result, error).
+        
+        On timeout the payload is withdrawn, so a client retrying after the
+        503 cannot end up with a duplicate. A batch already being written
+        cannot be withdrawn: its result is returned instead.
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                return None, QUEUE_TIMEOUT
+            return future.result()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Flusher loop: collect a batch, write it, resolve its futures."""
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+        # Shutting down: write whatever is still queued
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.append(item)
+        for start in range(0, len(pending), self.max_batch):
+            self._write(pending[start:start + self.max_batch])
+
+    def _write(self, batch):
+        # Drop payloads whose request gave up waiting; the others can no
+        # longer be cancelled from here on
+        batch = [(payload, future) for payload, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        payloads = [payload for payload, _ in batch]
+        try:
+            with self._app.app_context():
+                results = self._flush(payloads)
+        except Exception as e:  # the flusher must survive a failed batch
+            logger.exception('Falha na gravação em lote')
+            results = [(None, str(e))] * len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        self._batches += 1
+        self._items += len(batch)
+
+    def close(self, timeout=30.0):
+        """Stop accepting payloads and write the queued ones."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        # Waits while the queue is full: the flusher is draining it
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error('Fila de gravação não esvaziou a tempo')
+            return
+        thread.join(timeout)
+
+    def stats(self):
+        """Return the queue counters."""
+        return {
+            'queued': self._queue.qsize(),
+            'batches': self._batches,
+            'items': self._items,
+            'avg_batch': self._items / self._batches if self._batches else 0.0
+        }
+
+
+def init_write_behind(app):
+    """
+    Attach the meal create queue to the application (WRITE_BEHIND_ENABLED).
+
+    Args:
+        app: Flask application
+    """
+    from app.controllers.refeicao_controller import RefeicaoController
+
+    controller = RefeicaoController()
+    write_queue = WriteBehindQueue(
+        app,
+        controller.create_batch,
+        max_batch=app.config.get('WRITE_BEHIND_MAX_BATCH', 500),
+        max_delay=app.config.get('WRITE_BEHIND_MAX_DELAY_MS', 10) / 1000,
+        max_size=app.config.get('WRITE_BEHIND_QUEUE_SIZE', 10000),
+        timeout=app.config.get('WRITE_BEHIND_TIMEOUT', 30)
+    )
+    app.extensions['refeicao_write_behind'] = write_queue
+    atexit.register(write_queue.close)
+    return write_queue
+
+
+def shutdown_write_behind(app):
+    """Write the queued payloads of the application, if the queue is enabled."""
+    write_queue = app.extensions.get('refeicao_write_behind')
+    if write_queue is not None:
+        write_queue.close()
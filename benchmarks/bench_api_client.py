@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call latency of the GUI ApiClient against a local server.
+
+Starts the API on a local threaded Werkzeug server (HTTP/1.1 keep-alive)
+backed by a temporary SQLite file, then compares one new connection per
+call (module-level requests.get, the previous ApiClient behaviour) with
+the pooled session of ApiClient.
+
+Usage:
+    python benchmarks/bench_api_client.py [--calls 500]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.config import TestingConfig
+from gui.utils.api_client import ApiClient
+
+
+def start_server(db_path):
+    """Start the API in a background thread and return (server, base_url)."""
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        DEBUG = False
+    
+    app = create_app(BenchConfig)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://127.0.0.1:{server.server_port}/api'
+
+
+def measure(calls, func):
+    """Return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    """Print p50/p95/mean of the latencies."""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f'{label:<28}{statistics.median(ordered):>10.3f}{p95:>10.3f}{statistics.mean(ordered):>10.3f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=500)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        server, base_url = start_server(os.path.join(tmp, 'bench.db'))
+        try:
+            client = ApiClient(base_url)
+            dieta, error = client.create_dieta({'meta': 'Benchmark'})
+            if error:
+                sys.exit(f'Erro ao preparar dados: {error}')
+            url = f"{base_url}/dietas/{dieta['id']}"
+            
+            # Warm up both paths
+            requests.get(url, timeout=10)
+            client.get_dieta(dieta['id'])
+            
+            print(f'{args.calls} chamadas GET /dietas/<id> (ms)')
+            print(f'{"":<28}{"p50":>10}{"p95":>10}{"média":>10}')
+            report('nova conexão por chamada', measure(args.calls, lambda: requests.get(url, timeout=10)))
+            report('ApiClient (sessão)', measure(args.calls, lambda: client.get_dieta(dieta['id'])))
+            client.close()
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: deleting a diet through the ORM cascade vs. set-based deletes.
+
+Seeds diets with many meals (each linked to a few foods) and exercises in
+the SQLite TestingConfig database, then deletes them with the previous
+ORM path (every child loaded into the session and deleted one by one)
+and with Dieta.delete_many (one DELETE per table), reporting wall time
+and SQL statements. The last row deletes several diets in one call, as
+DELETE /api/dietas?ids= does.
+
+Usage:
+    python benchmarks/bench_dieta_delete.py [--children 5000] [--diets 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.dieta import Dieta
+from app.models.refeicao import Refeicao
+from app.models.exercicio import Exercicio
+from app.models.refeicao_alimento import RefeicaoAlimento
+
+BATCH = 1000
+
+
+def seed(children):
+    """Create one diet with the given number of meals and exercises."""
+    dieta = Dieta(meta='Benchmark')
+    dieta.save()
+    for start in range(0, children, BATCH):
+        size = min(BATCH, children - start)
+        ids = db.session.scalars(insert(Refeicao).returning(Refeicao.id), [{
+            'tipo_refeicao': 'almoço',
+            'quantidade': 100 + i,
+            'dieta_id': dieta.id
+        } for i in range(size)]).all()
+        RefeicaoAlimento.attach_pairs((id, ['arroz', 'feijão', 'frango']) for id in ids)
+        db.session.execute(insert(Exercicio), [{
+            'tipo_exercicio': 'flexão',
+            'quantidade_repeticoes': 10,
+            'ciclos': 3,
+            'pausa_entre_ciclos': 60,
+            'dieta_id': dieta.id
+        } for i in range(size)])
+    db.session.commit()
+    return dieta.id
+
+
+def orm_delete(ids):
+    """Previous path: load every child and let the session delete them one by one."""
+    for id in ids:
+        dieta = db.session.get(Dieta, id)
+        for refeicao in dieta.refeicoes:
+            db.session.delete(refeicao)
+        for exercicio in dieta.exercicios:
+            db.session.delete(exercicio)
+        db.session.delete(dieta)
+        db.session.commit()
+
+
+def set_based_delete(ids):
+    """New path: one DELETE per table for all the diets."""
+    Dieta.delete_many(ids)
+
+
+def measure(func, ids):
+    """Return (seconds, statements) for func(ids)."""
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        db.session.expunge_all()
+        start = time.perf_counter()
+        func(ids)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return elapsed, statements[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--children', type=int, default=5000, help='meals and exercises per diet')
+    parser.add_argument('--diets', type=int, default=5, help='diets deleted in the batch run')
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        print(f'Dieta com {args.children} refeições (3 alimentos cada) e {args.children} exercícios')
+        print(f'{"caminho":<32}{"tempo (ms)":>12}{"consultas":>12}')
+        runs = (
+            ('ORM (cascade, 1 dieta)', orm_delete, 1),
+            ('delete_many (1 dieta)', set_based_delete, 1),
+            (f'delete_many ({args.diets} dietas)', set_based_delete, args.diets),
+        )
+        for label, func, diets in runs:
+            ids = [seed(args.children) for _ in range(diets)]
+            elapsed, statements = measure(func, ids)
+            remaining = db.session.scalar(db.select(db.func.count(Refeicao.id)))
+            assert remaining == 0, remaining
+            print(f'{label:<32}{elapsed * 1000:>12.2f}{statements:>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: diet detail through the ORM vs. the row-based detail path.
+
+Seeds one diet with many meals and exercises in the SQLite TestingConfig
+database, then compares Dieta.get_by_id(...).to_dict(include_relations=True)
+with Dieta.get_detail, reporting wall time and SQL statements per call.
+
+Usage:
+    python benchmarks/bench_dieta_detail.py [--children 1000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.dieta import Dieta
+from app.models.refeicao import Refeicao
+from app.models.exercicio import Exercicio
+
+
+def seed(children):
+    """Create one diet with the given number of meals and exercises."""
+    dieta = Dieta(meta='Benchmark')
+    dieta.save()
+    db.session.execute(insert(Refeicao), [{
+        'tipo_refeicao': 'almoço',
+        'quantidade': 100 + i,
+        'alimentos': ['arroz', 'feijão', 'frango'],
+        'dieta_id': dieta.id
+    } for i in range(children)])
+    db.session.execute(insert(Exercicio), [{
+        'tipo_exercicio': 'flexão',
+        'quantidade_repeticoes': 10,
+        'ciclos': 3,
+        'pausa_entre_ciclos': 60,
+        'dieta_id': dieta.id
+    } for i in range(children)])
+    db.session.commit()
+    return dieta.id
+
+
+def orm_detail(id):
+    """Previous path: ORM objects plus lazy 'dynamic' relationships."""
+    return Dieta.get_by_id(id).to_dict(include_relations=True)
+
+
+def row_detail(id):
+    """New path: three Core statements serialized from rows."""
+    return Dieta.get_detail(id)
+
+
+def measure(repeat, func, id):
+    """Return (best seconds, statements per call) for func(id)."""
+    statements = [0]
+    
+    def count(*args):
+        statements[0] += 1
+    
+    event.listen(db.engine, 'before_cursor_execute', count)
+    best = None
+    try:
+        for _ in range(repeat):
+            # Start from an empty identity map each time
+            db.session.expunge_all()
+            start = time.perf_counter()
+            func(id)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return best, statements[0] / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--children', type=int, default=1000, help='meals and exercises per diet')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    app = create_app(TestingConfig)
+    with app.app_context():
+        id = seed(args.children)
+        assert orm_detail(id) == row_detail(id)
+        
+        print(f'Dieta com {args.children} refeições e {args.children} exercícios, melhor de {args.repeat}')
+        print(f'{"caminho":<24}{"tempo (ms)":>12}{"consultas":>12}')
+        for label, func in (('ORM (to_dict)', orm_detail), ('linhas (get_detail)', row_detail)):
+            best, statements = measure(args.repeat, func, id)
+            print(f'{label:<24}{best * 1000:>12.2f}{statements:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
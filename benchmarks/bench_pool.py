@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Load test: request queueing behind a capped connection pool.
+
+Serves the API on a local threaded Werkzeug server (one thread per
+request) backed by a temporary SQLite file, with the instrumented pool
+capped at each given size and no overflow. Concurrent clients then call
+the batched diet summary for a fixed time. With more clients than pooled
+connections, requests queue for a connection: the report shows the
+throughput, latency and the pool's own checkout wait and timeout counters
+(/api/pool/stats) for each pool size.
+
+Usage:
+    python benchmarks/bench_pool.py [--pool-sizes 1,2,4,8] [--clients 16]
+                                    [--duration 5] [--pool-timeout 5]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from werkzeug.serving import make_server
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models import Dieta
+from app.pool import InstrumentedQueuePool
+
+
+def make_config(db_path, pool_size, pool_timeout):
+    """Build a configuration with a capped instrumented pool."""
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': pool_size,
+            'max_overflow': 0,
+            'pool_timeout': pool_timeout
+        }
+        CACHE_BACKEND = 'none'
+        DEBUG = False
+    return BenchConfig
+
+
+def seed(app, diets):
+    """Create diets with meals and exercises through the bulk endpoints."""
+    client = app.test_client()
+    for i in range(diets):
+        dieta_id = client.post('/api/dietas', json={'meta': f'Dieta {i}'}).get_json()['data']['id']
+        client.post('/api/refeicoes/bulk', json=[
+            {'tipo_refeicao': 'almoço', 'quantidade': 300, 'alimentos': ['arroz', 'feijão', f'item {i % 20}'],
+             'dieta_id': dieta_id}
+            for _ in range(10)
+        ])
+        client.post('/api/exercicios/bulk', json=[
+            {'tipo_exercicio': 'flexão', 'quantidade_repeticoes': 10, 'ciclos': 3,
+             'pausa_entre_ciclos': 60, 'dieta_id': dieta_id}
+            for _ in range(5)
+        ])
+
+
+def load(url, clients, duration):
+    """Drive the URL with concurrent clients; return (latencies in ms, errors)."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        local, failed = [], 0
+        with requests.Session() as session:
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    ok = session.get(url, timeout=30).status_code == 200
+                except requests.RequestException:
+                    ok = False
+                local.append((time.perf_counter() - start) * 1000)
+                failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pool-sizes', default='1,2,4,8', help='pool sizes, comma separated')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--pool-timeout', type=float, default=5.0, help='seconds to wait for a connection')
+    parser.add_argument('--diets', type=int, default=100, help='diets seeded')
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        app = create_app(make_config(db_path, 1, args.pool_timeout))
+        seed(app, args.diets)
+        with app.app_context():
+            ids = ','.join(str(id) for id in db.session.scalars(db.select(Dieta.id).limit(50)))
+            db.engine.dispose()
+
+        print(f'GET /api/dietas/resumo (50 dietas): {args.clients} clientes, {args.duration:.0f}s por execução, '
+              f'sem overflow, pool_timeout={args.pool_timeout:.0f}s')
+        print(f"{'pool':>6}{'req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+              f"{'espera média':>14}{'espera máx':>12}{'timeouts':>10}{'erros':>7}")
+
+        for pool_size in [int(size) for size in args.pool_sizes.split(',')]:
+            app = create_app(make_config(db_path, pool_size, args.pool_timeout))
+            server = make_server('127.0.0.1', 0, app, threaded=True)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            base_url = f'http://127.0.0.1:{server.server_port}/api'
+            try:
+                latencies, errors = load(f'{base_url}/dietas/resumo?ids={ids}', args.clients, args.duration)
+                stats = requests.get(f'{base_url}/pool/stats').json()['data']
+            finally:
+                server.shutdown()
+                with app.app_context():
+                    db.engine.dispose()
+
+            ordered = sorted(latencies)
+            p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+            print(f'{pool_size:>6}{len(latencies) / args.duration:>9.1f}{statistics.median(ordered or [0]):>10.2f}'
+                  f"{p95:>10.2f}{stats['wait_ms_avg']:>12.2f}ms{stats['wait_ms_max']:>10.2f}ms"
+                  f"{stats['timeouts']:>10}{errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
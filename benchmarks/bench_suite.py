@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: API, model and validator hot paths, with regression checks.
+
+`run` seeds the database with a configurable volume (diets x meals x
+exercises), then times each scenario: the API endpoints through the Flask
+test client (diet list and detail, meal/exercise lists filtered by diet
+and by food, create, update, partial update and delete), Dieta.to_dict /
+Refeicao.to_dict and the validators called directly. Every call is timed
+on its own and its SQL statements are counted; per-call setup (e.g. the
+row a DELETE removes) is neither timed nor counted. Results are written
+to JSON with p50/p95/p99 latency and queries per call.
+
+`compare` reads two result files and flags scenarios whose p50 or p95
+grew by more than --threshold (and by more than --min-ms), or that run
+more queries than before; it exits with status 1 when there is a
+regression, so it can gate CI.
+
+The default database is a temporary SQLite file. For PostgreSQL pass
+--database-url with a dedicated database: the suite only adds rows to it.
+The read cache is off by default so every call reaches the database.
+
+Usage:
+    python benchmarks/bench_suite.py run [--diets 50] [--meals 20] [--exercises 10]
+                                         [--repeat 200] [--database-url URL]
+                                         [--cache none] [--only dietas]
+                                         [--output resultados.json]
+    python benchmarks/bench_suite.py compare base.json novo.json [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy
+from sqlalchemy import event, insert
+
+from app import create_app, db
+from app.config import Config
+from app.models.dieta import Dieta
+from app.models.dieta_contador import DietaContador
+from app.models.refeicao import Refeicao
+from app.models.exercicio import Exercicio
+from app.models.refeicao_alimento import RefeicaoAlimento
+from app.validators.validators import DietaValidator, RefeicaoValidator, ExercicioValidator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BATCH = 1000
+ALIMENTOS = ('arroz', 'feijão', 'frango', 'salada', 'ovo', 'aveia', 'banana', 'iogurte')
+
+
+def build_config(args):
+    """Configuration class for the measured application."""
+    class BenchConfig(Config):
+        TESTING = True
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        SQLALCHEMY_REPLICA_URIS = ''
+        SQL_LOG_REQUESTS = False
+        CACHE_BACKEND = args.cache
+        DIETA_DENORMALIZED_COUNTS = args.counts
+        WRITE_BEHIND_ENABLED = False
+    return BenchConfig
+
+
+def seed(diets, meals, exercises):
+    """
+    Create the diets with their meals (linked to a few foods each) and exercises.
+
+    Returns:
+        tuple: (diet IDs, meal IDs)
+    """
+    tipos = RefeicaoValidator.TIPOS_VALIDOS
+    dieta_ids = db.session.scalars(insert(Dieta).returning(Dieta.id, sort_by_parameter_order=True), [{
+        'meta': f'Dieta {i}',
+        'descricao': 'Benchmark'
+    } for i in range(diets)]).all()
+
+    rows = [{
+        'tipo_refeicao': tipos[i % len(tipos)],
+        'quantidade': 100 + i % 400,
+        'dieta_id': dieta_id
+    } for dieta_id in dieta_ids for i in range(meals)]
+    refeicao_ids = []
+    for start in range(0, len(rows), BATCH):
+        ids = db.session.scalars(
+            insert(Refeicao).returning(Refeicao.id, sort_by_parameter_order=True), rows[start:start + BATCH]
+        ).all()
+        RefeicaoAlimento.attach_pairs(
+            (id, [ALIMENTOS[id % len(ALIMENTOS)], ALIMENTOS[(id + 3) % len(ALIMENTOS)]]) for id in ids
+        )
+        refeicao_ids.extend(ids)
+
+    rows = [{
+        'tipo_exercicio': 'flexão',
+        'quantidade_repeticoes': 10 + i % 20,
+        'ciclos': 3,
+        'pausa_entre_ciclos': 60,
+        'dieta_id': dieta_id
+    } for dieta_id in dieta_ids for i in range(exercises)]
+    for start in range(0, len(rows), BATCH):
+        db.session.execute(insert(Exercicio), rows[start:start + BATCH])
+    db.session.commit()
+
+    # Bulk inserts bypass the counter events
+    if DietaContador.enabled():
+        DietaContador.rebuild()
+    return dieta_ids, refeicao_ids
+
+
+def refeicao_payload(i, dieta_id):
+    """Meal payload used by the create/update scenarios and the validators."""
+    return {
+        'tipo_refeicao': RefeicaoValidator.TIPOS_VALIDOS[i % len(RefeicaoValidator.TIPOS_VALIDOS)],
+        'quantidade': 100 + i % 400,
+        'alimentos': [ALIMENTOS[i % len(ALIMENTOS)], ALIMENTOS[(i + 1) % len(ALIMENTOS)]],
+        'dieta_id': dieta_id
+    }
+
+
+def exercicio_payload(i, dieta_id):
+    """Exercise payload used by the validators."""
+    return {
+        'tipo_exercicio': 'agachamento',
+        'quantidade_repeticoes': 10 + i % 20,
+        'ciclos': 3,
+        'pausa_entre_ciclos': 60,
+        'dieta_id': dieta_id
+    }
+
+
+def create_disposable_dieta(children):
+    """Create a diet with a few meals and exercises for the delete scenario."""
+    dieta = Dieta(meta='Descartável')
+    dieta.save()
+    if children:
+        ids = db.session.scalars(insert(Refeicao).returning(Refeicao.id), [{
+            'tipo_refeicao': 'lanche',
+            'quantidade': 100 + i,
+            'dieta_id': dieta.id
+        } for i in range(children)]).all()
+        RefeicaoAlimento.attach_pairs((id, ['arroz']) for id in ids)
+        db.session.execute(insert(Exercicio), [exercicio_payload(i, dieta.id) for i in range(children)])
+        if DietaContador.enabled():
+            DietaContador.adjust(db.session.connection(), dieta.id, refeicoes=children, exercicios=children)
+    db.session.commit()
+    return dieta.id
+
+
+class Scenario:
+    """
+    One measured operation.
+
+    kind 'api' calls run outside any app context (the test client pushes
+    its own, as a real request does); 'model' and 'validator' calls run
+    inside the app context their setup used.
+    """
+
+    def __init__(self, name, kind, call, setup=None):
+        """
+        Constructor for Scenario.
+
+        Args:
+            name: Label used in the results
+            kind: 'api', 'model' or 'validator'
+            call: Function(i, prepared) -> None, the timed part
+            setup: Function(i) -> prepared value, untimed (optional)
+        """
+        self.name = name
+        self.kind = kind
+        self.call = call
+        self.setup = setup
+
+
+def expect(response, status):
+    """Fail the run when an API call does not answer the expected status."""
+    if response.status_code != status:
+        raise RuntimeError(f'{response.request.method} {response.request.path}: '
+                           f'{response.status_code} {response.get_data(as_text=True)[:200]}')
+
+
+def build_scenarios(client, dieta_ids, refeicao_ids, delete_children):
+    """Build the scenario list over the seeded rows."""
+    def dieta(i):
+        return dieta_ids[i % len(dieta_ids)]
+
+    def refeicao(i):
+        return refeicao_ids[i % len(refeicao_ids)]
+
+    def load_dieta(i):
+        db.session.expunge_all()
+        return db.session.get(Dieta, dieta(i))
+
+    def load_refeicao(i):
+        db.session.expunge_all()
+        return db.session.get(Refeicao, refeicao(i))
+
+    dieta_validator = DietaValidator()
+    refeicao_validator = RefeicaoValidator()
+    exercicio_validator = ExercicioValidator()
+    lote = [refeicao_payload(i, dieta(i)) for i in range(100)]
+
+    return [
+        # API, reads
+        Scenario('GET /api/dietas', 'api',
+                 lambda i, _: expect(client.get('/api/dietas'), 200)),
+        Scenario('GET /api/dietas?limit=20', 'api',
+                 lambda i, _: expect(client.get('/api/dietas?limit=20'), 200)),
+        Scenario('GET /api/dietas/<id>', 'api',
+                 lambda i, _: expect(client.get(f'/api/dietas/{dieta(i)}'), 200)),
+        Scenario('GET /api/refeicoes?dieta_id=', 'api',
+                 lambda i, _: expect(client.get(f'/api/refeicoes?dieta_id={dieta(i)}'), 200)),
+        Scenario('GET /api/refeicoes?alimento=', 'api',
+                 lambda i, _: expect(client.get(
+                     f'/api/refeicoes?alimento={ALIMENTOS[i % len(ALIMENTOS)]}&dieta_id={dieta(i)}'), 200)),
+        Scenario('GET /api/exercicios?dieta_id=', 'api',
+                 lambda i, _: expect(client.get(f'/api/exercicios?dieta_id={dieta(i)}'), 200)),
+        Scenario('GET /api/refeicoes/<id>', 'api',
+                 lambda i, _: expect(client.get(f'/api/refeicoes/{refeicao(i)}'), 200)),
+        # API, writes
+        Scenario('POST /api/dietas', 'api',
+                 lambda i, _: expect(client.post('/api/dietas', json={'meta': f'Nova {i}'}), 201)),
+        Scenario('POST /api/refeicoes', 'api',
+                 lambda i, _: expect(client.post('/api/refeicoes', json=refeicao_payload(i, dieta(i))), 201)),
+        Scenario('PUT /api/refeicoes/<id>', 'api',
+                 lambda i, _: expect(client.put(f'/api/refeicoes/{refeicao(i)}', json={
+                     'tipo_refeicao': 'jantar', 'quantidade': 200 + i % 100, 'alimentos': ['sopa', 'pão']
+                 }), 200)),
+        Scenario('PATCH /api/refeicoes/<id>', 'api',
+                 lambda i, _: expect(client.patch(f'/api/refeicoes/{refeicao(i)}',
+                                                  json={'quantidade': 300 + i % 100}), 200)),
+        Scenario('DELETE /api/refeicoes/<id>', 'api',
+                 lambda i, id: expect(client.delete(f'/api/refeicoes/{id}'), 200),
+                 setup=lambda i: Refeicao(**refeicao_payload(i, dieta(i))).save().id),
+        Scenario('DELETE /api/dietas/<id>', 'api',
+                 lambda i, id: expect(client.delete(f'/api/dietas/{id}'), 200),
+                 setup=lambda i: create_disposable_dieta(delete_children)),
+        # Models
+        Scenario('Dieta.to_dict', 'model',
+                 lambda i, obj: obj.to_dict(), setup=load_dieta),
+        Scenario('Dieta.to_dict(include_relations)', 'model',
+                 lambda i, obj: obj.to_dict(include_relations=True), setup=load_dieta),
+        Scenario('Refeicao.to_dict', 'model',
+                 lambda i, obj: obj.to_dict(), setup=load_refeicao),
+        # Validators
+        Scenario('DietaValidator.validate', 'validator',
+                 lambda i, _: dieta_validator.validate({'meta': 'Emagrecer', 'descricao': 'Teste'})),
+        Scenario('RefeicaoValidator.validate', 'validator',
+                 lambda i, _: refeicao_validator.validate(refeicao_payload(i, dieta(i)))),
+        Scenario('ExercicioValidator.validate', 'validator',
+                 lambda i, _: exercicio_validator.validate(exercicio_payload(i, dieta(i)))),
+        Scenario('RefeicaoValidator.validate_many (100)', 'validator',
+                 lambda i, _: refeicao_validator.validate_many(lote)),
+    ]
+
+
+class QueryCounter:
+    """Count SQL statements on every engine while armed."""
+
+    def __init__(self, engines):
+        self._engines = list(engines)
+        self.armed = False
+        self.count = 0
+
+    def _before_cursor_execute(self, *args):
+        if self.armed:
+            self.count += 1
+
+    def __enter__(self):
+        for engine in self._engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(round(fraction * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def measure(app, scenario, counter, repeat, warmup):
+    """Time one scenario; return its result entry."""
+    latencies = []
+    queries = 0
+    for i in range(warmup + repeat):
+        with app.app_context():
+            prepared = scenario.setup(i) if scenario.setup else None
+            if scenario.kind != 'api':
+                counter.count, counter.armed = 0, True
+                start = time.perf_counter()
+                scenario.call(i, prepared)
+                elapsed = time.perf_counter() - start
+                counter.armed = False
+        if scenario.kind == 'api':
+            counter.count, counter.armed = 0, True
+            start = time.perf_counter()
+            scenario.call(i, prepared)
+            elapsed = time.perf_counter() - start
+            counter.armed = False
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries += counter.count
+
+    ordered = sorted(latencies)
+    return {
+        'kind': scenario.kind,
+        'calls': repeat,
+        'p50_ms': round(percentile(ordered, 0.50), 4),
+        'p95_ms': round(percentile(ordered, 0.95), 4),
+        'p99_ms': round(percentile(ordered, 0.99), 4),
+        'mean_ms': round(sum(ordered) / len(ordered), 4),
+        'queries': round(queries / repeat, 2)
+    }
+
+
+def git_revision():
+    """Short commit of the working tree, if available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """Seed, measure every scenario and write the results file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.database_url:
+            args.database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = create_app(build_config(args))
+
+        with app.app_context():
+            engines = list(db.engines.values())
+            dialect = db.engine.dialect.name
+            start = time.perf_counter()
+            dieta_ids, refeicao_ids = seed(args.diets, args.meals, args.exercises)
+            seeded = time.perf_counter() - start
+        print(f'Banco {dialect}: {args.diets} dietas x {args.meals} refeições x {args.exercises} exercícios '
+              f'criados em {seeded:.1f}s; {args.repeat} chamadas por cenário')
+        if not refeicao_ids:
+            raise SystemExit('--meals deve ser maior que zero')
+
+        client = app.test_client()
+        scenarios = build_scenarios(client, dieta_ids, refeicao_ids, args.delete_children)
+        if args.only:
+            scenarios = [s for s in scenarios if args.only.lower() in s.name.lower()]
+
+        results = {}
+        print(f"{'cenário':<42}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'consultas':>11}")
+        with QueryCounter(engines) as counter:
+            for scenario in scenarios:
+                entry = measure(app, scenario, counter, args.repeat, args.warmup)
+                results[scenario.name] = entry
+                print(f"{scenario.name:<42}{entry['p50_ms']:>10.3f}{entry['p95_ms']:>10.3f}"
+                      f"{entry['p99_ms']:>10.3f}{entry['queries']:>11.1f}")
+
+        with app.app_context():
+            db.session.remove()
+            for engine in engines:
+                engine.dispose()
+
+    document = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git': git_revision(),
+            'database': dialect,
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'cache': args.cache,
+            'denormalized_counts': args.counts,
+            'volumes': {'diets': args.diets, 'meals_per_diet': args.meals, 'exercises_per_diet': args.exercises},
+            'repeat': args.repeat,
+            'warmup': args.warmup
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(document, file, ensure_ascii=False, indent=2)
+    print(f'Resultados gravados em {args.output}')
+
+
+def compare(args):
+    """Compare two results files; return the exit status (1 on regression)."""
+    with open(args.base, encoding='utf-8') as file:
+        base = json.load(file)
+    with open(args.novo, encoding='utf-8') as file:
+        novo = json.load(file)
+
+    settings = ('database', 'volumes', 'cache', 'denormalized_counts')
+    if any(base['meta'].get(key) != novo['meta'].get(key) for key in settings):
+        print('Aviso: os arquivos usam bancos, volumes ou configurações diferentes')
+
+    def change(old, new):
+        return (new - old) / old if old else 0.0
+
+    regressions = 0
+    print(f"{'cenário':<42}{'p50 base':>10}{'p50 novo':>10}{'Δp50':>8}{'Δp95':>8}{'consultas':>12}  situação")
+    for name, old in base['results'].items():
+        new = novo['results'].get(name)
+        if new is None:
+            print(f'{name:<42}{"ausente no arquivo novo":>48}')
+            continue
+        p50 = change(old['p50_ms'], new['p50_ms'])
+        p95 = change(old['p95_ms'], new['p95_ms'])
+        slower = (
+            (p50 > args.threshold and new['p50_ms'] - old['p50_ms'] > args.min_ms)
+            or (p95 > args.threshold and new['p95_ms'] - old['p95_ms'] > args.min_ms)
+        )
+        more_queries = new['queries'] > old['queries']
+        if slower or more_queries:
+            regressions += 1
+            status = 'REGRESSÃO' + (' (consultas)' if more_queries else '')
+        elif p50 < -args.threshold:
+            status = 'melhora'
+        else:
+            status = 'ok'
+        queries = f"{old['queries']:g}→{new['queries']:g}"
+        print(f"{name:<42}{old['p50_ms']:>10.3f}{new['p50_ms']:>10.3f}{p50:>+8.0%}{p95:>+8.0%}"
+              f"{queries:>12}  {status}")
+    for name in novo['results'].keys() - base['results'].keys():
+        print(f'{name:<42}{"novo cenário":>48}')
+
+    print(f'{regressions} regressão(ões) acima de {args.threshold:.0%}' if regressions else 'Nenhuma regressão')
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='seed the database and measure every scenario')
+    run_parser.add_argument('--diets', type=int, default=50, help='diets seeded')
+    run_parser.add_argument('--meals', type=int, default=20, help='meals per diet')
+    run_parser.add_argument('--exercises', type=int, default=10, help='exercises per diet')
+    run_parser.add_argument('--repeat', type=int, default=200, help='measured calls per scenario')
+    run_parser.add_argument('--warmup', type=int, default=10, help='unmeasured calls per scenario')
+    run_parser.add_argument('--delete-children', type=int, default=10,
+                            help='meals and exercises of each diet removed by the delete scenario')
+    run_parser.add_argument('--database-url', help='database to seed (default: temporary SQLite file)')
+    run_parser.add_argument('--cache', default='none', choices=('none', 'memory', 'redis'),
+                            help='read cache backend (CACHE_BACKEND)')
+    run_parser.add_argument('--counts', action='store_true', help='enable DIETA_DENORMALIZED_COUNTS')
+    run_parser.add_argument('--only', help='run only scenarios whose name contains this text')
+    run_parser.add_argument('--output', default='resultados.json', help='results file')
+
+    compare_parser = commands.add_parser('compare', help='flag regressions between two results files')
+    compare_parser.add_argument('base', help='reference results file')
+    compare_parser.add_argument('novo', help='results file to check')
+    compare_parser.add_argument('--threshold', type=float, default=0.2,
+                                help='relative p50/p95 increase treated as a regression')
+    compare_parser.add_argument('--min-ms', type=float, default=0.05,
+                                help='ignore increases smaller than this many milliseconds')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-call validators vs. the batch validator.
+
+Validates the same list of meal and exercise payloads with
+RefeicaoValidator/ExercicioValidator.validate (one diet lookup per item)
+and with validate_many (one IN query per batch), against the SQLite
+TestingConfig database.
+
+Usage:
+    python benchmarks/bench_validators.py [--items 5000] [--dietas 50] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.dieta import Dieta
+from app.validators.validators import RefeicaoValidator, ExercicioValidator, ValidationError
+
+
+def build_payloads(count, dietas):
+    """Build meal and exercise payloads spread across the given diets."""
+    refeicoes = [{
+        'tipo_refeicao': 'almoço',
+        'quantidade': 100 + i % 400,
+        'alimentos': ['arroz', 'feijão'],
+        'dieta_id': 1 + i % dietas
+    } for i in range(count)]
+    exercicios = [{
+        'tipo_exercicio': 'flexão',
+        'quantidade_repeticoes': 10,
+        'ciclos': 3,
+        'pausa_entre_ciclos': 60,
+        'dieta_id': 1 + i % dietas
+    } for i in range(count)]
+    return refeicoes, exercicios
+
+
+def per_call(validator, items):
+    """Validate items one by one, the way the single-row endpoints do."""
+    errors = 0
+    for data in items:
+        try:
+            validator.validate(data)
+        except ValidationError:
+            errors += 1
+    return errors
+
+
+def batch(validator, items):
+    """Validate items with the batch validator."""
+    _, errors = validator.validate_many(items)
+    return len(errors)
+
+
+def best_of(repeat, func, *args):
+    """Return the best wall time of several runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=5000)
+    parser.add_argument('--dietas', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.session.add_all([Dieta(meta=f'Dieta {i}') for i in range(args.dietas)])
+        db.session.commit()
+        
+        refeicoes, exercicios = build_payloads(args.items, args.dietas)
+        
+        print(f'{args.items} itens, {args.dietas} dietas, melhor de {args.repeat}')
+        print(f'{"validador":<12}{"por chamada (s)":>18}{"lote (s)":>12}{"ganho":>10}')
+        for label, validator, items in (
+            ('refeicao', RefeicaoValidator(), refeicoes),
+            ('exercicio', ExercicioValidator(), exercicios),
+        ):
+            slow = best_of(args.repeat, per_call, validator, items)
+            fast = best_of(args.repeat, batch, validator, items)
+            print(f'{label:<12}{slow:>18.4f}{fast:>12.4f}{slow / fast:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Load test: requests per second of the production server by worker count.
+
+For each worker count, starts `run_api.py --production` on a temporary
+SQLite database seeded with a few diets, drives it with concurrent
+keep-alive clients for a fixed time, then stops it with SIGTERM (the
+graceful shutdown path) and reports throughput and latency.
+
+Requires gunicorn (POSIX only).
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--threads 1]
+                                       [--clients 16] [--duration 10]
+                                       [--path /api/dietas]
+"""
+
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed(base_url, diets):
+    """Create diets with a couple of meals and exercises each."""
+    with requests.Session() as session:
+        for i in range(diets):
+            dieta = session.post(f'{base_url}/dietas', json={'meta': f'Dieta {i}'}).json()['data']
+            session.post(f'{base_url}/refeicoes/bulk', json=[
+                {'tipo_refeicao': 'almoço', 'quantidade': 300, 'alimentos': ['arroz', 'feijão'], 'dieta_id': dieta['id']},
+                {'tipo_refeicao': 'jantar', 'quantidade': 200, 'alimentos': ['sopa'], 'dieta_id': dieta['id']},
+            ])
+            session.post(f'{base_url}/exercicios/bulk', json=[
+                {'tipo_exercicio': 'flexão', 'quantidade_repeticoes': 10, 'ciclos': 3,
+                 'pausa_entre_ciclos': 60, 'dieta_id': dieta['id']},
+            ])
+
+
+def start_server(port, db_path, workers, threads):
+    """Start the production server and wait until it answers."""
+    # Same cache behaviour for every worker count (the in-process cache is
+    # disabled with more than one worker anyway)
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', CACHE_BACKEND='none')
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'run_api.py'), '--production',
+         '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--threads', str(threads)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/api/dietas', params={'limit': 1}, timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('Servidor não respondeu a tempo')
+
+
+def stop_server(process):
+    """Stop the server gracefully (SIGTERM) and return the shutdown time."""
+    start = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    process.wait(timeout=60)
+    return time.perf_counter() - start
+
+
+def load(url, clients, duration):
+    """Drive the URL with concurrent clients; return (requests, errors, latencies in ms)."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        local, failed = [], 0
+        with requests.Session() as session:
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    ok = session.get(url, timeout=10).status_code == 200
+                except requests.RequestException:
+                    ok = False
+                local.append((time.perf_counter() - start) * 1000)
+                failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), errors[0], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default='1,2,4', help='worker counts, comma separated')
+    parser.add_argument('--threads', type=int, default=1, help='threads per worker')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per run')
+    parser.add_argument('--diets', type=int, default=50, help='diets seeded')
+    parser.add_argument('--path', default='/api/dietas', help='endpoint under test')
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(',')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+
+        # Seed once through a single-worker server
+        port = free_port()
+        process = start_server(port, db_path, 1, 1)
+        seed(f'http://127.0.0.1:{port}/api', args.diets)
+        stop_server(process)
+
+        print(f'GET {args.path}: {args.clients} clientes, {args.duration:.0f}s por execução, '
+              f'{args.threads} thread(s) por worker')
+        print(f"{'workers':>8}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'erros':>8}{'parada (s)':>12}")
+        for workers in worker_counts:
+            port = free_port()
+            process = start_server(port, db_path, workers, args.threads)
+            try:
+                total, errors, latencies = load(f'http://127.0.0.1:{port}{args.path}', args.clients, args.duration)
+            finally:
+                shutdown = stop_server(process)
+            ordered = sorted(latencies)
+            p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+            print(f'{workers:>8}{total / args.duration:>10.1f}{statistics.median(ordered or [0]):>10.2f}'
+                  f'{p95:>10.2f}{errors:>8}{shutdown:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
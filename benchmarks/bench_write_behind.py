@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Load test: sustained meal inserts per second, per-row commit vs. group commit.
+
+Starts `run_api.py --production` on a temporary SQLite database twice,
+once with WRITE_BEHIND_ENABLED off (one transaction per POST) and once
+on (creates queued and written in batches by the background flusher),
+drives POST /api/refeicoes with concurrent keep-alive clients for a
+fixed time, and reports inserts per second, latency, 503 answers (full
+queue) and other errors. The row count is checked after the graceful
+shutdown, so it includes whatever the flusher wrote on exit.
+
+Requires gunicorn (POSIX only).
+
+Usage:
+    python benchmarks/bench_write_behind.py [--clients 32] [--duration 10]
+                                            [--threads 32] [--max-delay-ms 10]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from bench_workers import free_port, start_server, stop_server
+
+
+def load(base_url, clients, duration, dieta_id):
+    """Post meals with concurrent clients; return (created, rejected, errors, latencies in ms)."""
+    latencies = []
+    counts = {'created': 0, 'rejected': 0, 'errors': 0}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(number):
+        local = []
+        created = rejected = errors = 0
+        with requests.Session() as session:
+            i = 0
+            while time.monotonic() < stop_at:
+                payload = {'tipo_refeicao': 'lanche', 'quantidade': i + 1,
+                           'alimentos': ['fruta', f'item {number}'], 'dieta_id': dieta_id}
+                start = time.perf_counter()
+                try:
+                    status = session.post(f'{base_url}/refeicoes', json=payload, timeout=30).status_code
+                except requests.RequestException:
+                    status = None
+                local.append((time.perf_counter() - start) * 1000)
+                created += status == 201
+                rejected += status == 503
+                errors += status not in (201, 503)
+                i += 1
+        with lock:
+            latencies.extend(local)
+            counts['created'] += created
+            counts['rejected'] += rejected
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts['created'], counts['rejected'], counts['errors'], latencies
+
+
+def count_rows(db_path):
+    """Count the meals stored in the database file."""
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute('SELECT COUNT(*) FROM refeicoes').fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=32, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per run')
+    parser.add_argument('--threads', type=int, default=32, help='server threads (one worker)')
+    parser.add_argument('--max-batch', type=int, default=500, help='WRITE_BEHIND_MAX_BATCH')
+    parser.add_argument('--max-delay-ms', type=float, default=10, help='WRITE_BEHIND_MAX_DELAY_MS')
+    args = parser.parse_args()
+
+    # One worker: the queue is per process, so this measures the batching itself
+    print(f'POST /api/refeicoes: {args.clients} clientes, {args.duration:.0f}s por execução, '
+          f'1 worker com {args.threads} threads')
+    print(f"{'modo':>14}{'inserções/s':>13}{'p50 (ms)':>10}{'p95 (ms)':>10}{'503':>7}{'erros':>7}{'linhas':>9}")
+    for label, enabled in (('commit/linha', False), ('commit em lote', True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            os.environ.update(
+                WRITE_BEHIND_ENABLED=str(enabled),
+                WRITE_BEHIND_MAX_BATCH=str(args.max_batch),
+                WRITE_BEHIND_MAX_DELAY_MS=str(args.max_delay_ms)
+            )
+            port = free_port()
+            process = start_server(port, db_path, 1, args.threads)
+            base_url = f'http://127.0.0.1:{port}/api'
+            try:
+                dieta_id = requests.post(f'{base_url}/dietas', json={'meta': 'Benchmark'}).json()['data']['id']
+                created, rejected, errors, latencies = load(base_url, args.clients, args.duration, dieta_id)
+            finally:
+                stop_server(process)
+            ordered = sorted(latencies)
+            p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+            print(f'{label:>14}{created / args.duration:>13.1f}{statistics.median(ordered or [0]):>10.2f}'
+                  f'{p95:>10.2f}{rejected:>7}{errors:>7}{count_rows(db_path):>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from gui.utils.api_client import ApiClient
+from gui.utils.async_runner import AsyncRunner
 from gui.views.dieta_view import DietaView
 from gui.views.refeicao_view import RefeicaoView
 from gui.views.exercicio_view import ExercicioView
@@ -18,6 +19,9 @@ class MainWindow:
         self._root.geometry("1000x600")
         self._root.minsize(800, 500)
         
+        # API calls run on worker threads, results come back via root.after
+        self._runner = AsyncRunner(self._root)
+        
         # Setup UI
         self._setup_menu()
         self._setup_main_content()
@@ -48,9 +52,9 @@ class MainWindow:
         self._notebook.pack(fill='both', expand=True, padx=5, pady=5)
         
         # Create tabs
-        self._dieta_view = DietaView(self._notebook, self._api_client)
-        self._refeicao_view = RefeicaoView(self._notebook, self._api_client)
-        self._exercicio_view = ExercicioView(self._notebook, self._api_client)
+        self._dieta_view = DietaView(self._notebook, self._api_client, self._runner)
+        self._refeicao_view = RefeicaoView(self._notebook, self._api_client, self._runner)
+        self._exercicio_view = ExercicioView(self._notebook, self._api_client, self._runner)
         
         # Add tabs to notebook
         self._notebook.add(self._dieta_view, text="Dietas")
@@ -61,11 +65,31 @@ class MainWindow:
         status_frame = ttk.Frame(self._root)
         status_frame.pack(fill='x', side='bottom')
         
+        # Loading indicator, shown while any API call is in flight
+        self._loading_bar = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+        self._loading_label = ttk.Label(status_frame, text="Carregando...")
+        
         self._status_label = ttk.Label(status_frame, text="Verificando conexão...", relief='sunken')
-        self._status_label.pack(fill='x', padx=2, pady=2)
+        self._status_label.pack(side='left', fill='x', expand=True, padx=2, pady=2)
+        
+        self._runner.add_busy_listener(self._on_busy_changed)
+        self._on_busy_changed(self._runner.busy)
+    
+    def _on_busy_changed(self, busy):
+        if busy:
+            self._loading_bar.pack(side='right', padx=2, pady=2)
+            self._loading_label.pack(side='right', padx=2, pady=2)
+            self._loading_bar.start(10)
+        else:
+            self._loading_bar.stop()
+            self._loading_bar.pack_forget()
+            self._loading_label.pack_forget()
     
     def _check_connection(self):
-        connected, error = self._api_client.check_connection()
+        self._runner.submit(self._api_client.check_connection, callback=self._on_connection_checked, key='connection')
+    
+    def _on_connection_checked(self, result):
+        connected, error = result
         
         if connected:
             self._status_label.config(text=f"✓ Conectado à API: {self._api_url}")
@@ -93,6 +117,8 @@ class MainWindow:
     
     def _on_exit(self):
         if messagebox.askyesno("Sair", "Deseja realmente sair?"):
+            self._runner.shutdown()
+            self._api_client.close()
             self._root.quit()
     
     def run(self):
@@ -4,5 +4,7 @@ Contains utility classes for the GUI.
 """
 
 from gui.utils.api_client import ApiClient
+from gui.utils.async_runner import AsyncRunner
+from gui.utils.response_cache import ResponseCache
 
-__all__ = ['ApiClient']
+__all__ = ['ApiClient', 'AsyncRunner', 'ResponseCache']
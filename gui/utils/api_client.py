@@ -4,7 +4,11 @@ Contains the client class for communicating with the REST API.
 """
 
 import requests
-from typing import Optional, Dict, Any, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List, Tuple
+
+from gui.utils.response_cache import ResponseCache
 
 
 class ApiClient:
@@ -14,21 +18,110 @@ class ApiClient:
     Provides methods for GET, POST, PUT, DELETE operations.
     Handles errors and exceptions.
     
+    All requests share one pooled keep-alive session, so connections
+    (and DNS lookups) are reused between calls. GET responses are kept in
+    a ResponseCache and revalidated with If-None-Match; the client's own
+    writes invalidate the affected collections.
+    
     Demonstrates:
         - Encapsulation of HTTP operations
         - Error handling
         - Use of dictionaries and conditions
     """
     
-    def __init__(self, base_url: str = 'http://localhost:5000/api'):
+    # Default (connect, read) timeouts in seconds per HTTP method
+    DEFAULT_TIMEOUTS = {
+        'GET': (3.05, 10),
+        'POST': (3.05, 15),
+        'PUT': (3.05, 15),
+        'DELETE': (3.05, 10),
+    }
+    # Only idempotent methods are retried automatically
+    RETRY_METHODS = frozenset(['GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'])
+    RETRY_STATUS = frozenset([502, 503, 504])
+    CONNECTION_CHECK_TIMEOUT = 5
+    
+    # Collections whose cached responses a write to each collection makes stale
+    # (diet listings carry child counts, and deleting a diet cascades)
+    INVALIDATES = {
+        'dietas': ('dietas', 'refeicoes', 'exercicios'),
+        'refeicoes': ('refeicoes', 'dietas'),
+        'exercicios': ('exercicios', 'dietas'),
+    }
+    
+    def __init__(
+        self,
+        base_url: str = 'http://localhost:5000/api',
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        timeouts: Optional[Dict[str, Any]] = None,
+        cache_ttl: float = 5.0,
+        cache_size: int = 128,
+        cache: Optional[ResponseCache] = None
+    ):
         """
         Constructor for ApiClient.
         
         Args:
             base_url: Base URL of the API (default: http://localhost:5000/api)
+            pool_size: Maximum number of pooled connections per host
+            retries: Retries for idempotent methods on connection errors and 502/503/504
+                (read timeouts are not retried, to avoid multiplying waits)
+            backoff_factor: Exponential backoff factor between retries (seconds)
+            timeouts: Per-method timeouts overriding DEFAULT_TIMEOUTS
+            cache_ttl: Seconds a cached GET is served without revalidation
+            cache_size: Maximum number of cached GET responses
+            cache: Existing ResponseCache to share (overrides cache_ttl/cache_size)
         """
         self._base_url = base_url
-        self._timeout = 10  # Request timeout in seconds
+        self._timeouts = dict(self.DEFAULT_TIMEOUTS)
+        if timeouts:
+            self._timeouts.update(timeouts)
+        self._session = self._create_session(pool_size, retries, backoff_factor)
+        self._cache = cache if cache is not None else ResponseCache(cache_ttl, cache_size)
+    
+    def _create_session(self, pool_size: int, retries: int, backoff_factor: float) -> requests.Session:
+        """
+        Create the pooled session used for every request.
+        
+        Args:
+            pool_size: Maximum number of pooled connections per host
+            retries: Number of retries for idempotent methods
+            backoff_factor: Exponential backoff factor between retries
+            
+        Returns:
+            requests.Session: Configured session
+        """
+        retry = Retry(
+            total=retries,
+            read=0,
+            backoff_factor=backoff_factor,
+            allowed_methods=self.RETRY_METHODS,
+            status_forcelist=self.RETRY_STATUS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    @property
+    def cache(self) -> ResponseCache:
+        """Get the response cache."""
+        return self._cache
+    
+    def close(self):
+        """Close the pooled connections."""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     @property
     def base_url(self) -> str:
@@ -61,23 +154,43 @@ class ApiClient:
         """
         url = f'{self._base_url}/{endpoint}'
         
+        if method not in self._timeouts:
+            return None, f'Método HTTP inválido: {method}'
+        
+        # Serve fresh GETs from the cache, revalidate stale ones by ETag
+        headers = {}
+        cache_key = None
+        cached = None
+        if method == 'GET':
+            cache_key = ResponseCache.make_key(endpoint, params)
+            cached, etag, fresh = self._cache.get(cache_key)
+            if cached is not None and fresh:
+                return cached, None
+            if cached is not None and etag:
+                headers['If-None-Match'] = etag
+        
         try:
-            response = None
+            response = self._session.request(
+                method,
+                url,
+                params=params,
+                json=data if method in ('POST', 'PUT') else None,
+                headers=headers,
+                timeout=self._timeouts[method]
+            )
             
-            # Use conditions to determine request method
-            if method == 'GET':
-                response = requests.get(url, params=params, timeout=self._timeout)
-            elif method == 'POST':
-                response = requests.post(url, json=data, timeout=self._timeout)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, timeout=self._timeout)
-            elif method == 'DELETE':
-                response = requests.delete(url, timeout=self._timeout)
-            else:
-                return None, f'Método HTTP inválido: {method}'
+            if response.status_code == 304 and cached is not None:
+                self._cache.touch(cache_key)
+                return cached, None
             
             # Process response
             if response.status_code >= 200 and response.status_code < 300:
+                if method == 'GET':
+                    result = response.json()
+                    self._cache.put(cache_key, result, response.headers.get('ETag'))
+                    return result, None
+                
+                self._cache.invalidate(self.INVALIDATES.get(endpoint.split('/', 1)[0], ()))
                 try:
                     return response.json(), None
                 except ValueError:
@@ -128,6 +241,37 @@ class ApiClient:
             return None, error
         return result.get('data'), None
     
+    def get_dieta_resumo(self, id: int) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Get the totals of a diet, computed by the API.
+        
+        Args:
+            id: Diet ID
+            
+        Returns:
+            tuple: (summary data or None, error message or None)
+        """
+        result, error = self._make_request('GET', f'dietas/{id}/resumo')
+        if error:
+            return None, error
+        return result.get('data'), None
+    
+    def get_dietas_resumo(self, ids: List[int]) -> Tuple[Optional[list], Optional[str]]:
+        """
+        Get the totals of many diets in one request.
+        
+        Args:
+            ids: Diet IDs
+            
+        Returns:
+            tuple: (list of summaries or None, error message or None)
+        """
+        params = {'ids': ','.join(str(id) for id in ids)}
+        result, error = self._make_request('GET', 'dietas/resumo', params=params)
+        if error:
+            return None, error
+        return result.get('data', []), None
+    
     def create_dieta(self, data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Create a new diet.
@@ -174,19 +318,85 @@ class ApiClient:
             return False, error
         return True, None
     
+    def delete_dietas(self, ids: List[int]) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Delete many diets in one request.
+        
+        Args:
+            ids: Diet IDs
+            
+        Returns:
+            tuple: (dict with 'deleted_ids' and 'missing_ids' or None, error message or None)
+        """
+        params = {'ids': ','.join(str(id) for id in ids)}
+        result, error = self._make_request('DELETE', 'dietas', params=params)
+        if error:
+            return None, error
+        return result.get('data'), None
+    
+    def attach_refeicoes(self, dieta_id: int, refeicao_ids: List[int]) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Move many meals to a diet in one request.
+        
+        Args:
+            dieta_id: Target diet ID
+            refeicao_ids: Meal IDs
+            
+        Returns:
+            tuple: (dict with 'moved' and 'missing_ids' or None, error message or None)
+        """
+        result, error = self._make_request(
+            'POST', f'dietas/{dieta_id}/refeicoes:attach', data={'refeicao_ids': list(refeicao_ids)}
+        )
+        if error:
+            return None, error
+        return result.get('data'), None
+    
+    def attach_exercicios(self, dieta_id: int, exercicio_ids: List[int]) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Move many exercises to a diet in one request.
+        
+        Args:
+            dieta_id: Target diet ID
+            exercicio_ids: Exercise IDs
+            
+        Returns:
+            tuple: (dict with 'moved' and 'missing_ids' or None, error message or None)
+        """
+        result, error = self._make_request(
+            'POST', f'dietas/{dieta_id}/exercicios:attach', data={'exercicio_ids': list(exercicio_ids)}
+        )
+        if error:
+            return None, error
+        return result.get('data'), None
+    
     # ==================== REFEICAO METHODS ====================
     
-    def get_refeicoes(self, dieta_id: Optional[int] = None) -> Tuple[Optional[list], Optional[str]]:
+    def get_refeicoes(
+        self,
+        dieta_id: Optional[int] = None,
+        alimento: Optional[str] = None,
+        busca: Optional[str] = None
+    ) -> Tuple[Optional[list], Optional[str]]:
         """
-        Get all meals, optionally filtered by diet ID.
+        Get all meals, optionally filtered by diet ID and/or food.
         
         Args:
             dieta_id: Optional diet ID to filter by
+            alimento: Optional food name (or prefix) to search for
+            busca: Search mode: 'exata' (default), 'prefixo' or 'aproximada'
             
         Returns:
             tuple: (list of meals or None, error message or None)
         """
-        params = {'dieta_id': dieta_id} if dieta_id else None
+        params = {}
+        if dieta_id:
+            params['dieta_id'] = dieta_id
+        if alimento:
+            params['alimento'] = alimento
+            if busca:
+                params['busca'] = busca
+        params = params or None
         result, error = self._make_request('GET', 'refeicoes', params=params)
         if error:
             return None, error
@@ -340,7 +550,11 @@ class ApiClient:
             tuple: (success boolean, error message or None)
         """
         try:
-            response = requests.get(f'{self._base_url}/dietas', timeout=5)
+            response = self._session.get(
+                f'{self._base_url}/dietas',
+                params={'limit': 1},
+                timeout=self.CONNECTION_CHECK_TIMEOUT
+            )
             return response.status_code == 200, None
         except requests.ConnectionError:
             return False, 'API não disponível'
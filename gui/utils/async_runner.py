@@ -0,0 +1,133 @@
+"""
+Async Runner Module
+Contains the worker pool that keeps API calls off the Tk main thread.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+
+class AsyncRunner:
+    """
+    Runs blocking calls (such as ApiClient requests) on a worker thread pool
+    and hands the results back on the Tk main thread.
+
+    Tk widgets must only be touched from the main thread, so workers put
+    results on a queue that the main loop drains with root.after. Apart
+    from the worker side, every method must be called from the main thread.
+    Calls submitted with the same key supersede each other: only the result
+    of the latest one is delivered, and older ones are cancelled if they
+    have not started yet.
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, root, max_workers: int = 4):
+        """
+        Constructor for AsyncRunner.
+
+        Args:
+            root: Tk root window used to schedule callbacks
+            max_workers: Number of worker threads
+        """
+        self._root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='api')
+        self._results = queue.Queue()
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, Any] = {}
+        # Every submitted call not finished yet, so shutdown can cancel them
+        self._submitted: Set[Any] = set()
+        self._pending = 0
+        self._busy_listeners = []
+        self._closed = False
+
+        self._root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    @property
+    def busy(self) -> bool:
+        """Check whether any call is still running."""
+        return self._pending > 0
+
+    def add_busy_listener(self, listener: Callable[[bool], None]):
+        """Register a callback invoked with True/False when activity starts/stops."""
+        self._busy_listeners.append(listener)
+
+    def submit(self, func: Callable, *args, callback: Optional[Callable] = None, key: Optional[str] = None):
+        """
+        Run func(*args) on a worker thread.
+
+        Args:
+            func: Blocking function to run
+            *args: Arguments for func
+            callback: Called on the main thread with the return value of func
+            key: Calls sharing a key supersede the previous one (optional)
+        """
+        if self._closed:
+            return
+
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.pop(key, None)
+            if previous is not None and previous.cancel():
+                self._set_pending(-1)
+
+        self._set_pending(1)
+        future = self._executor.submit(self._run, func, args, callback, key, generation)
+        self._submitted.add(future)
+        future.add_done_callback(self._submitted.discard)
+        if key is not None:
+            self._futures[key] = future
+
+    def cancel(self, key: str):
+        """Drop the pending result for a key."""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        previous = self._futures.pop(key, None)
+        if previous is not None and previous.cancel():
+            self._set_pending(-1)
+
+    def shutdown(self):
+        """Stop accepting calls and release the worker threads."""
+        self._closed = True
+        # Calls not started yet are dropped (what cancel_futures does on 3.9+)
+        for future in list(self._submitted):
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _run(self, func, args, callback, key, generation):
+        """Worker side: run the call and queue its result."""
+        try:
+            result = func(*args)
+        except Exception as e:
+            # ApiClient methods return (data, error); mirror that shape
+            result = (None, str(e))
+        self._results.put((callback, result, key, generation))
+
+    def _poll(self):
+        """Main-thread side: deliver finished results."""
+        while True:
+            try:
+                callback, result, key, generation = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            self._set_pending(-1)
+            stale = key is not None and self._generations.get(key) != generation
+            if not stale and key is not None:
+                self._futures.pop(key, None)
+
+            if not stale and callback is not None:
+                callback(result)
+
+        if not self._closed:
+            self._root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _set_pending(self, delta: int):
+        """Update the pending counter and notify listeners on transitions."""
+        was_busy = self._pending > 0
+        self._pending += delta
+        if was_busy != self.busy:
+            for listener in self._busy_listeners:
+                listener(self.busy)
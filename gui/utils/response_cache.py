@@ -0,0 +1,85 @@
+"""
+Response Cache Module
+Contains the in-process cache used by ApiClient for GET responses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of GET responses with a freshness TTL.
+
+    Entries younger than the TTL are served without contacting the API.
+    Older entries are kept (until evicted) so their ETag can be sent as
+    If-None-Match; a 304 answer then refreshes them without a payload.
+    Thread-safe, since the GUI calls the API from worker threads.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 128):
+        """
+        Constructor for ResponseCache.
+
+        Args:
+            ttl: Seconds an entry is served without revalidation
+            max_entries: Maximum number of entries before LRU eviction
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[dict] = None) -> Tuple:
+        """Build the cache key for an endpoint and its query parameters."""
+        return (endpoint, tuple(sorted((params or {}).items())))
+
+    def get(self, key) -> Tuple[Optional[Any], Optional[str], bool]:
+        """
+        Look up an entry.
+
+        Returns:
+            tuple: (cached data or None, ETag or None, True if still fresh)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None, False
+            self._entries.move_to_end(key)
+            data, etag, stored_at = entry
+            return data, etag, (time.monotonic() - stored_at) < self._ttl
+
+    def put(self, key, data: Any, etag: Optional[str]):
+        """Store (or refresh) an entry, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[key] = (data, etag, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key):
+        """Mark an entry as fresh again (after a 304 Not Modified)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], time.monotonic())
+                self._entries.move_to_end(key)
+
+    def invalidate(self, collections: Iterable[str]):
+        """Drop every entry whose endpoint belongs to one of the collections."""
+        collections = set(collections)
+        with self._lock:
+            for key in [k for k in self._entries if k[0].split('/', 1)[0] in collections]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
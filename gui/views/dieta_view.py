@@ -2,11 +2,14 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional
 
+from gui.utils.async_runner import AsyncRunner
+
 
 class DietaView(ttk.Frame):
-    def __init__(self, parent, api_client):
+    def __init__(self, parent, api_client, runner: Optional[AsyncRunner] = None):
         super().__init__(parent)
         self._api_client = api_client
+        self._runner = runner or AsyncRunner(self.winfo_toplevel())
         self._selected_id: Optional[int] = None
         
         self._setup_ui()
@@ -96,14 +99,17 @@ class DietaView(ttk.Frame):
         ttk.Button(btn_frame, text="Limpar", command=self._clear_form).pack(side='left', padx=5)
     
     def _load_dietas(self):
-        """Load and display all diets."""
+        """Load and display all diets (in the background)."""
+        self._runner.submit(self._api_client.get_dietas, callback=self._on_dietas_loaded, key='dieta_list')
+    
+    def _on_dietas_loaded(self, result):
+        """Display the diets fetched by _load_dietas."""
+        dietas, error = result
+        
         # Clear existing items
         for item in self._tree.get_children():
             self._tree.delete(item)
         
-        # Fetch diets from API
-        dietas, error = self._api_client.get_dietas()
-        
         if error:
             messagebox.showerror("Erro", f"Erro ao carregar dietas: {error}")
             return
@@ -126,8 +132,12 @@ class DietaView(ttk.Frame):
         item = self._tree.item(selection[0])
         dieta_id = item['values'][0]
         
-        # Fetch diet details
-        dieta, error = self._api_client.get_dieta(dieta_id)
+        # Fetch diet details; a newer selection supersedes this one
+        self._runner.submit(self._api_client.get_dieta, dieta_id, callback=self._on_dieta_loaded, key='dieta_detail')
+    
+    def _on_dieta_loaded(self, result):
+        """Fill the form with the diet fetched by _on_select."""
+        dieta, error = result
         
         if error:
             messagebox.showerror("Erro", f"Erro ao carregar dieta: {error}")
@@ -146,6 +156,7 @@ class DietaView(ttk.Frame):
     
     def _clear_form(self):
         """Clear all form fields."""
+        self._runner.cancel('dieta_detail')
         self._selected_id = None
         self._meta_var.set('')
         self._descricao_text.delete('1.0', tk.END)
@@ -165,16 +176,22 @@ class DietaView(ttk.Frame):
             'descricao': descricao if descricao else None
         }
         
-        # Create or update based on selection
+        # Create or update based on selection, off the Tk thread
         if self._selected_id:
             # Update existing
-            result, error = self._api_client.update_dieta(self._selected_id, data)
+            call = (self._api_client.update_dieta, self._selected_id, data)
             action = "atualizada"
         else:
             # Create new
-            result, error = self._api_client.create_dieta(data)
+            call = (self._api_client.create_dieta, data)
             action = "criada"
         
+        self._runner.submit(*call, callback=lambda result: self._on_dieta_saved(result, action))
+    
+    def _on_dieta_saved(self, result, action):
+        """Report the outcome of _save_dieta and reload the list."""
+        _, error = result
+        
         if error:
             messagebox.showerror("Erro", f"Erro ao salvar dieta: {error}")
             return
@@ -193,7 +210,11 @@ class DietaView(ttk.Frame):
         if not messagebox.askyesno("Confirmar", "Deseja realmente excluir esta dieta?"):
             return
         
-        success, error = self._api_client.delete_dieta(self._selected_id)
+        self._runner.submit(self._api_client.delete_dieta, self._selected_id, callback=self._on_dieta_deleted)
+    
+    def _on_dieta_deleted(self, result):
+        """Report the outcome of _delete_dieta and reload the list."""
+        success, error = result
         
         if not success:
             messagebox.showerror("Erro", f"Erro ao excluir dieta: {error}")
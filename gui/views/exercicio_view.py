@@ -1,10 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional
+
+from gui.utils.async_runner import AsyncRunner
+
+
 class ExercicioView(ttk.Frame):
-    def __init__(self, parent, api_client):
+    def __init__(self, parent, api_client, runner: Optional[AsyncRunner] = None):
         super().__init__(parent)
         self._api_client = api_client
+        self._runner = runner or AsyncRunner(self.winfo_toplevel())
         self._selected_id: Optional[int] = None
         self._dietas_cache = []
         
@@ -114,8 +119,12 @@ class ExercicioView(ttk.Frame):
         ttk.Button(btn_frame, text="Limpar", command=self._clear_form).pack(side='left', padx=5)
     
     def _load_dietas(self):
-        """Load diets for dropdown."""
-        dietas, error = self._api_client.get_dietas()
+        """Load diets for dropdown (in the background)."""
+        self._runner.submit(self._api_client.get_dietas, callback=self._on_dietas_loaded, key='exercicio_dietas')
+    
+    def _on_dietas_loaded(self, result):
+        """Fill the diet dropdown with the diets fetched by _load_dietas."""
+        dietas, error = result
         
         if error:
             self._dietas_cache = []
@@ -127,16 +136,20 @@ class ExercicioView(ttk.Frame):
         self._dieta_combo['values'] = values
     
     def _load_exercicios(self):
-        """Load and display all exercises."""
-        # Clear existing items
-        for item in self._tree.get_children():
-            self._tree.delete(item)
-        
+        """Load and display all exercises (in the background)."""
         # Also refresh dietas
         self._load_dietas()
         
         # Fetch exercises from API
-        exercicios, error = self._api_client.get_exercicios()
+        self._runner.submit(self._api_client.get_exercicios, callback=self._on_exercicios_loaded, key='exercicio_list')
+    
+    def _on_exercicios_loaded(self, result):
+        """Display the exercises fetched by _load_exercicios."""
+        exercicios, error = result
+        
+        # Clear existing items
+        for item in self._tree.get_children():
+            self._tree.delete(item)
         
         if error:
             messagebox.showerror("Erro", f"Erro ao carregar exercícios: {error}")
@@ -162,8 +175,12 @@ class ExercicioView(ttk.Frame):
         item = self._tree.item(selection[0])
         exercicio_id = item['values'][0]
         
-        # Fetch exercise details
-        exercicio, error = self._api_client.get_exercicio(exercicio_id)
+        # Fetch exercise details; a newer selection supersedes this one
+        self._runner.submit(self._api_client.get_exercicio, exercicio_id, callback=self._on_exercicio_loaded, key='exercicio_detail')
+    
+    def _on_exercicio_loaded(self, result):
+        """Fill the form with the exercise fetched by _on_select."""
+        exercicio, error = result
         
         if error:
             messagebox.showerror("Erro", f"Erro ao carregar exercício: {error}")
@@ -194,6 +211,7 @@ class ExercicioView(ttk.Frame):
     
     def _clear_form(self):
         """Clear all form fields."""
+        self._runner.cancel('exercicio_detail')
         self._selected_id = None
         self._tipo_var.set('')
         self._repeticoes_var.set('')
@@ -272,16 +290,22 @@ class ExercicioView(ttk.Frame):
             'dieta_id': dieta_id
         }
         
-        # Create or update based on selection
+        # Create or update based on selection, off the Tk thread
         if self._selected_id:
             # Update existing
-            result, error = self._api_client.update_exercicio(self._selected_id, data)
+            call = (self._api_client.update_exercicio, self._selected_id, data)
             action = "atualizado"
         else:
             # Create new
-            result, error = self._api_client.create_exercicio(data)
+            call = (self._api_client.create_exercicio, data)
             action = "criado"
         
+        self._runner.submit(*call, callback=lambda result: self._on_exercicio_saved(result, action))
+    
+    def _on_exercicio_saved(self, result, action):
+        """Report the outcome of _save_exercicio and reload the list."""
+        _, error = result
+        
         if error:
             messagebox.showerror("Erro", f"Erro ao salvar exercício: {error}")
             return
@@ -300,7 +324,11 @@ class ExercicioView(ttk.Frame):
         if not messagebox.askyesno("Confirmar", "Deseja realmente excluir este exercício?"):
             return
         
-        success, error = self._api_client.delete_exercicio(self._selected_id)
+        self._runner.submit(self._api_client.delete_exercicio, self._selected_id, callback=self._on_exercicio_deleted)
+    
+    def _on_exercicio_deleted(self, result):
+        """Report the outcome of _delete_exercicio and reload the list."""
+        success, error = result
         
         if not success:
             messagebox.showerror("Erro", f"Erro ao excluir exercício: {error}")
@@ -1,6 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional
+
+from gui.utils.async_runner import AsyncRunner
+
+
 class RefeicaoView(ttk.Frame):
     # Valid meal types
     TIPOS_REFEICAO = [
@@ -15,9 +19,10 @@ class RefeicaoView(ttk.Frame):
     # Pre-computed lowercase version for validation
     TIPOS_REFEICAO_LOWER = [t.lower() for t in TIPOS_REFEICAO]
     
-    def __init__(self, parent, api_client):
+    def __init__(self, parent, api_client, runner: Optional[AsyncRunner] = None):
         super().__init__(parent)
         self._api_client = api_client
+        self._runner = runner or AsyncRunner(self.winfo_toplevel())
         self._selected_id: Optional[int] = None
         self._dietas_cache = []
         
@@ -121,8 +126,12 @@ class RefeicaoView(ttk.Frame):
         ttk.Button(btn_frame, text="Limpar", command=self._clear_form).pack(side='left', padx=5)
     
     def _load_dietas(self):
-        """Load diets for dropdown."""
-        dietas, error = self._api_client.get_dietas()
+        """Load diets for dropdown (in the background)."""
+        self._runner.submit(self._api_client.get_dietas, callback=self._on_dietas_loaded, key='refeicao_dietas')
+    
+    def _on_dietas_loaded(self, result):
+        """Fill the diet dropdown with the diets fetched by _load_dietas."""
+        dietas, error = result
         
         if error:
             self._dietas_cache = []
@@ -134,16 +143,20 @@ class RefeicaoView(ttk.Frame):
         self._dieta_combo['values'] = values
     
     def _load_refeicoes(self):
-        """Load and display all meals."""
-        # Clear existing items
-        for item in self._tree.get_children():
-            self._tree.delete(item)
-        
+        """Load and display all meals (in the background)."""
         # Also refresh dietas
         self._load_dietas()
         
         # Fetch meals from API
-        refeicoes, error = self._api_client.get_refeicoes()
+        self._runner.submit(self._api_client.get_refeicoes, callback=self._on_refeicoes_loaded, key='refeicao_list')
+    
+    def _on_refeicoes_loaded(self, result):
+        """Display the meals fetched by _load_refeicoes."""
+        refeicoes, error = result
+        
+        # Clear existing items
+        for item in self._tree.get_children():
+            self._tree.delete(item)
         
         if error:
             messagebox.showerror("Erro", f"Erro ao carregar refeições: {error}")
@@ -173,8 +186,12 @@ class RefeicaoView(ttk.Frame):
         item = self._tree.item(selection[0])
         refeicao_id = item['values'][0]
         
-        # Fetch meal details
-        refeicao, error = self._api_client.get_refeicao(refeicao_id)
+        # Fetch meal details; a newer selection supersedes this one
+        self._runner.submit(self._api_client.get_refeicao, refeicao_id, callback=self._on_refeicao_loaded, key='refeicao_detail')
+    
+    def _on_refeicao_loaded(self, result):
+        """Fill the form with the meal fetched by _on_select."""
+        refeicao, error = result
         
         if error:
             messagebox.showerror("Erro", f"Erro ao carregar refeição: {error}")
@@ -208,6 +225,7 @@ class RefeicaoView(ttk.Frame):
     
     def _clear_form(self):
         """Clear all form fields."""
+        self._runner.cancel('refeicao_detail')
         self._selected_id = None
         self._tipo_var.set('')
         self._quantidade_var.set('')
@@ -265,16 +283,22 @@ class RefeicaoView(ttk.Frame):
             'dieta_id': dieta_id
         }
         
-        # Create or update based on selection
+        # Create or update based on selection, off the Tk thread
         if self._selected_id:
             # Update existing
-            result, error = self._api_client.update_refeicao(self._selected_id, data)
+            call = (self._api_client.update_refeicao, self._selected_id, data)
             action = "atualizada"
         else:
             # Create new
-            result, error = self._api_client.create_refeicao(data)
+            call = (self._api_client.create_refeicao, data)
             action = "criada"
         
+        self._runner.submit(*call, callback=lambda result: self._on_refeicao_saved(result, action))
+    
+    def _on_refeicao_saved(self, result, action):
+        """Report the outcome of _save_refeicao and reload the list."""
+        _, error = result
+        
         if error:
             messagebox.showerror("Erro", f"Erro ao salvar refeição: {error}")
             return
@@ -293,7 +317,11 @@ class RefeicaoView(ttk.Frame):
         if not messagebox.askyesno("Confirmar", "Deseja realmente excluir esta refeição?"):
             return
         
-        success, error = self._api_client.delete_refeicao(self._selected_id)
+        self._runner.submit(self._api_client.delete_refeicao, self._selected_id, callback=self._on_refeicao_deleted)
+    
+    def _on_refeicao_deleted(self, result):
+        """Report the outcome of _delete_refeicao and reload the list."""
+        success, error = result
         
         if not success:
             messagebox.showerror("Erro", f"Erro ao excluir refeição: {error}")
@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 from app import create_app
+from app.config import config
 
-# Create the application
-app = create_app()
 
-if __name__ == '__main__':
-    # Get configuration from environment
-    host = os.environ.get('FLASK_HOST', '0.0.0.0')
-    port = int(os.environ.get('FLASK_PORT', 5000))
+def parse_args():
+    """Read the serving options (flags override the environment)."""
+    from app.server import server_options_from_env
+    
+    env = server_options_from_env()
+    parser = argparse.ArgumentParser(description='API REST do Sistema de Gerenciamento de Dietas')
+    parser.add_argument('--production', action='store_true',
+                        default=os.environ.get('API_SERVER', 'development').lower() == 'production',
+                        help='servidor WSGI de produção (Gunicorn) em vez do servidor de desenvolvimento')
+    parser.add_argument('--host', default=os.environ.get('FLASK_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('FLASK_PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=env['workers'], help='processos (produção)')
+    parser.add_argument('--threads', type=int, default=env['threads'], help='threads por processo (produção)')
+    parser.add_argument('--timeout', type=int, default=env['timeout'])
+    parser.add_argument('--graceful-timeout', type=int, default=env['graceful_timeout'])
+    parser.add_argument('--no-preload', dest='preload', action='store_false', default=env['preload'])
+    return parser.parse_args()
+
+
+def run_development(host, port):
+    """Run the Werkzeug development server (single process, reloader in debug)."""
+    app = create_app()
     debug = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
     
     server_url = f"http://{host}:{port}"
@@ -34,3 +52,32 @@ if __name__ == '__main__':
     
     # Run the application
     app.run(host=host, port=port, debug=debug)
+
+
+def run_production(args):
+    """Run the pre-fork Gunicorn server with the production configuration."""
+    from app.server import serve_production
+    
+    print(f"Servidor de produção em http://{args.host}:{args.port} "
+          f"({args.workers} processos x {args.threads} threads)")
+    serve_production(
+        lambda: create_app(config['production']),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        threads=args.threads,
+        timeout=args.timeout,
+        graceful_timeout=args.graceful_timeout,
+        preload=args.preload
+    )
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.production:
+        run_production(args)
+    else:
+        run_development(args.host, args.port)
+else:
+    # Imported by a WSGI server (run_api:app) or the flask CLI
+    app = create_app()
@@ -0,0 +1,82 @@
+"""
+Shared fixtures: applications on a fresh in-memory database, a recorder
+of the SQL statements they run and helpers to seed diets through the API.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.config import TestingConfig
+
+
+@pytest.fixture
+def make_app():
+    """Return a factory of applications with TestingConfig plus overrides."""
+    def factory(**overrides):
+        return create_app(type('Config', (TestingConfig,), overrides))
+    return factory
+
+
+@pytest.fixture
+def app(make_app):
+    """Application with the default test configuration."""
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    """Test client of the default application."""
+    return app.test_client()
+
+
+@pytest.fixture
+def record_statements():
+    """
+    Return a context manager recording the statements run on an
+    application's engine, as (SQL, parameters) pairs.
+    """
+    @contextmanager
+    def recorder(app):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return recorder
+
+
+@pytest.fixture
+def seed_dietas():
+    """
+    Return a function creating diets through the API, each with the given
+    number of meals (two foods each) and exercises; it returns the diet IDs.
+    """
+    def seed(client, count, refeicoes=1, exercicios=1):
+        ids = []
+        for n in range(count):
+            dieta_id = client.post('/api/dietas', json={'meta': f'Dieta {n}'}).get_json()['data']['id']
+            for i in range(refeicoes):
+                response = client.post('/api/refeicoes', json={
+                    'tipo_refeicao': 'almoço', 'quantidade': i + 1,
+                    'alimentos': ['arroz', f'item {i}'], 'dieta_id': dieta_id
+                })
+                assert response.status_code == 201, response.get_json()
+            for i in range(exercicios):
+                response = client.post('/api/exercicios', json={
+                    'tipo_exercicio': 'corrida', 'quantidade_repeticoes': i + 1,
+                    'ciclos': 1, 'pausa_entre_ciclos': 30, 'dieta_id': dieta_id
+                })
+                assert response.status_code == 201, response.get_json()
+            ids.append(dieta_id)
+        return ids
+    return seed
@@ -0,0 +1,41 @@
+"""
+The by-diet lookups of meals and exercises search ix_refeicoes_dieta_id /
+ix_exercicios_dieta_id (migration 0002) instead of scanning the table.
+"""
+
+import re
+
+import pytest
+
+from app import db
+
+
+def query_plans(app, statements, table):
+    """EXPLAIN QUERY PLAN of the recorded statements that read the table."""
+    plans = []
+    with app.app_context():
+        connection = db.session.connection()
+        for sql, parameters in statements:
+            if re.search(rf'\b(FROM|JOIN) {table}\b', sql):
+                rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', parameters).all()
+                plans.append(' | '.join(row[-1] for row in rows))
+    return plans
+
+
+@pytest.mark.parametrize('url, table, index', [
+    ('/api/refeicoes?dieta_id={id}', 'refeicoes', 'ix_refeicoes_dieta_id'),
+    ('/api/exercicios?dieta_id={id}', 'exercicios', 'ix_exercicios_dieta_id'),
+    ('/api/dietas/{id}', 'refeicoes', 'ix_refeicoes_dieta_id'),
+    ('/api/dietas/{id}', 'exercicios', 'ix_exercicios_dieta_id'),
+], ids=['refeicoes', 'exercicios', 'detalhe-refeicoes', 'detalhe-exercicios'])
+def test_lookup_by_dieta_uses_index(app, client, record_statements, seed_dietas, url, table, index):
+    dieta_id = seed_dietas(client, 3, refeicoes=2, exercicios=2)[1]
+
+    with record_statements(app) as statements:
+        response = client.get(url.format(id=dieta_id))
+    assert response.status_code == 200
+
+    plans = query_plans(app, statements, table)
+    assert plans, f'no statement read {table}'
+    for plan in plans:
+        assert re.search(rf'USING (COVERING )?INDEX {index} \(dieta_id=\?\)', plan), plan
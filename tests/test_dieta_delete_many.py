@@ -0,0 +1,63 @@
+"""
+Dieta.delete_many removes diets with their meals, food links, exercises
+and counters using a fixed number of statements, however many IDs it gets.
+"""
+
+import pytest
+
+from app import db
+from app.models.dieta import Dieta
+from app.models.dieta_contador import DietaContador
+from app.models.exercicio import Exercicio
+from app.models.refeicao import Refeicao
+from app.models.refeicao_alimento import RefeicaoAlimento
+
+MISSING_ID = 9999
+
+
+def delete_statements(make_app, record_statements, seed_dietas, count):
+    """Number of statements run by delete_many for `count` diets (plus a missing ID)."""
+    app = make_app()
+    ids = seed_dietas(app.test_client(), count, refeicoes=2, exercicios=2)
+    with record_statements(app) as statements, app.app_context():
+        Dieta.delete_many(ids + [MISSING_ID])
+    return len(statements)
+
+
+def test_statement_count_is_constant(make_app, record_statements, seed_dietas):
+    counts = [delete_statements(make_app, record_statements, seed_dietas, n) for n in (1, 5, 20)]
+    assert len(set(counts)) == 1, counts
+
+
+@pytest.mark.parametrize('denormalized', [False, True], ids=['computed', 'denormalized'])
+def test_children_are_removed(make_app, seed_dietas, denormalized):
+    app = make_app(DIETA_DENORMALIZED_COUNTS=denormalized)
+    client = app.test_client()
+    kept_id, *ids = seed_dietas(client, 3, refeicoes=2, exercicios=2)
+
+    with app.app_context():
+        deleted = Dieta.delete_many(ids)
+        refeicao_ids = db.session.scalars(db.select(Refeicao.id).where(Refeicao.dieta_id == kept_id)).all()
+
+        assert deleted['dieta_ids'] == ids
+        assert len(deleted['refeicao_ids']) == 4 and len(deleted['exercicio_ids']) == 4
+        assert db.session.scalars(db.select(Dieta.id)).all() == [kept_id]
+        assert db.session.scalars(db.select(Refeicao.dieta_id).distinct()).all() == [kept_id]
+        assert db.session.scalars(db.select(Exercicio.dieta_id).distinct()).all() == [kept_id]
+        assert sorted(db.session.scalars(db.select(RefeicaoAlimento.refeicao_id).distinct())) == sorted(refeicao_ids)
+        counters = db.session.scalars(db.select(DietaContador.dieta_id)).all()
+        assert counters == ([kept_id] if denormalized else [])
+
+
+def test_missing_ids_are_reported(client, seed_dietas):
+    ids = seed_dietas(client, 2)
+
+    with client.application.app_context():
+        assert Dieta.delete_many([ids[0], MISSING_ID])['dieta_ids'] == [ids[0]]
+
+    response = client.delete(f'/api/dietas?ids={ids[0]},{ids[1]},{MISSING_ID}')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['deleted_ids'] == [ids[1]]
+    assert data['missing_ids'] == [ids[0], MISSING_ID]
+    assert (data['refeicoes_excluidas'], data['exercicios_excluidos']) == (1, 1)
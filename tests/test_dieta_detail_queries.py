@@ -0,0 +1,33 @@
+"""
+GET /api/dietas/<id> runs two statements (diet with its meals and their
+foods, then exercises), whatever the number of meals and foods.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('refeicoes', [0, 1, 10])
+def test_detail_runs_two_statements(app, client, record_statements, seed_dietas, refeicoes):
+    dieta_id, = seed_dietas(client, 1, refeicoes=refeicoes, exercicios=2)
+
+    with record_statements(app) as statements:
+        response = client.get(f'/api/dietas/{dieta_id}')
+
+    assert response.status_code == 200
+    assert len(statements) == 2, [sql for sql, _ in statements]
+    data = response.get_json()['data']
+    assert [item['alimentos'] for item in data['refeicoes']] == [['arroz', f'item {i}'] for i in range(refeicoes)]
+    assert len(data['exercicios']) == 2
+
+
+def test_detail_keeps_food_spelling_order_and_repetitions(client):
+    dieta_id = client.post('/api/dietas', json={'meta': 'Dieta'}).get_json()['data']['id']
+    for alimentos in (['Frango', 'arroz', 'frango'], ['Pão de queijo']):
+        client.post('/api/refeicoes', json={
+            'tipo_refeicao': 'almoço', 'quantidade': 1, 'alimentos': alimentos, 'dieta_id': dieta_id
+        })
+
+    data = client.get(f'/api/dietas/{dieta_id}').get_json()['data']
+
+    assert [item['alimentos'] for item in data['refeicoes']] == [['Frango', 'arroz', 'frango'], ['Pão de queijo']]
+    assert data['refeicoes'] == [client.get(f"/api/refeicoes/{item['id']}").get_json()['data'] for item in data['refeicoes']]
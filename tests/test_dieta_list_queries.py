@@ -0,0 +1,43 @@
+"""
+GET /api/dietas runs a single statement, whatever the number of diets,
+with the child counts computed (grouped subqueries) or read from the
+denormalized counters.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize('denormalized', [False, True], ids=['computed', 'denormalized'])
+@pytest.mark.parametrize('count', [1, 10])
+def test_list_runs_one_statement(make_app, record_statements, seed_dietas, denormalized, count):
+    app = make_app(DIETA_DENORMALIZED_COUNTS=denormalized)
+    client = app.test_client()
+    ids = seed_dietas(client, count, refeicoes=2, exercicios=1)
+
+    with record_statements(app) as statements:
+        response = client.get('/api/dietas')
+
+    assert response.status_code == 200
+    assert len(statements) == 1, [sql for sql, _ in statements]
+    # The same count is reported by the instrumentation (Server-Timing)
+    assert 'desc="1 consultas"' in response.headers['Server-Timing']
+
+    data = {item['id']: item for item in response.get_json()['data']}
+    assert sorted(data) == ids
+    assert all(item['refeicoes_count'] == 2 and item['exercicios_count'] == 1 for item in data.values())
+
+
+@pytest.mark.parametrize('denormalized', [False, True], ids=['computed', 'denormalized'])
+def test_list_counts_follow_deletes(make_app, seed_dietas, denormalized):
+    app = make_app(DIETA_DENORMALIZED_COUNTS=denormalized)
+    client = app.test_client()
+    dieta_id, = seed_dietas(client, 1, refeicoes=2, exercicios=2)
+    empty_id = client.post('/api/dietas', json={'meta': 'Vazia'}).get_json()['data']['id']
+
+    refeicao_id = client.get(f'/api/refeicoes?dieta_id={dieta_id}').get_json()['data'][0]['id']
+    assert client.delete(f'/api/refeicoes/{refeicao_id}').status_code == 200
+
+    data = {item['id']: item for item in client.get('/api/dietas').get_json()['data']}
+
+    assert (data[dieta_id]['refeicoes_count'], data[dieta_id]['exercicios_count']) == (1, 2)
+    assert (data[empty_id]['refeicoes_count'], data[empty_id]['exercicios_count']) == (0, 0)